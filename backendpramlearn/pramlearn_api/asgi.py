@@ -8,7 +8,7 @@ django.setup()
 
 # Import setelah Django setup
 from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
+from pramlearnapp.middleware import JWTAuthMiddlewareStack
 from pramlearnapp.routing import websocket_urlpatterns
 
 # Create ASGI application
@@ -16,7 +16,7 @@ django_asgi_app = get_asgi_application()
 
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
-    "websocket": AuthMiddlewareStack(
+    "websocket": JWTAuthMiddlewareStack(
         URLRouter(websocket_urlpatterns)
     ),
 })
\ No newline at end of file
@@ -72,6 +72,63 @@ if os.getenv("REDIS_URL"):
 else:
     CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
 
+# Cache: Redis jika REDIS_URL ada, fallback ke LocMem
+CACHE_DEFAULT_TIMEOUT = int(os.getenv("CACHE_DEFAULT_TIMEOUT", "300"))
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+            "KEY_PREFIX": "pramlearn",
+            "TIMEOUT": CACHE_DEFAULT_TIMEOUT,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "pramlearn-cache",
+            "TIMEOUT": CACHE_DEFAULT_TIMEOUT,
+            "OPTIONS": {"MAX_ENTRIES": 5000},
+        }
+    }
+
+# Batas umur (detik) snapshot dashboard teacher sebelum dihitung ulang
+TEACHER_DASHBOARD_MAX_STALENESS = int(os.getenv("TEACHER_DASHBOARD_MAX_STALENESS", "300"))
+
+# Presence: TTL status online (detik) dan interval flush last_activity ke database
+PRESENCE_TTL = int(os.getenv("PRESENCE_TTL", "300"))
+PRESENCE_FLUSH_INTERVAL = int(os.getenv("PRESENCE_FLUSH_INTERVAL", "60"))
+PRESENCE_OFFLINE_GRACE = int(os.getenv("PRESENCE_OFFLINE_GRACE", "15"))
+
+# Report PDF per grade: jumlah worker render dan batas tunggu render (detik)
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "2"))
+REPORT_RENDER_TIMEOUT = int(os.getenv("REPORT_RENDER_TIMEOUT", "30"))
+
+# Artifact report PDF disimpan di storage privat, bukan MEDIA_ROOT atau
+# container media publik; hanya dilayani lewat view yang memeriksa akses.
+# REPORT_AZURE_CONTAINER: container Azure privat (harus sudah ada); tanpa
+# nilai ini artifact disimpan di REPORT_STORAGE_ROOT pada disk server.
+REPORT_STORAGE_ROOT = os.getenv(
+    "REPORT_STORAGE_ROOT", os.path.join(BASE_DIR, "private", "reports")
+)
+REPORT_AZURE_CONTAINER = os.getenv("REPORT_AZURE_CONTAINER", "")
+
+# Lama cache (detik) user hasil autentikasi token WebSocket
+WS_USER_CACHE_TIMEOUT = int(os.getenv("WS_USER_CACHE_TIMEOUT", "60"))
+
+# Interval minimum (detik) antar broadcast indikator mengetik per user di chat kelompok
+GROUP_CHAT_TYPING_THROTTLE = float(os.getenv("GROUP_CHAT_TYPING_THROTTLE", "2"))
+
+# Write-behind pesan chat kelompok dari WebSocket: interval flush (detik) dan ukuran batch
+GROUP_CHAT_FLUSH_INTERVAL = float(os.getenv("GROUP_CHAT_FLUSH_INTERVAL", "0.25"))
+GROUP_CHAT_FLUSH_SIZE = int(os.getenv("GROUP_CHAT_FLUSH_SIZE", "100"))
+
+# Log aktivitas siswa: interval flush buffer (detik), ukuran batch bulk_create, dan umur retensi (hari)
+ACTIVITY_LOG_FLUSH_INTERVAL = float(os.getenv("ACTIVITY_LOG_FLUSH_INTERVAL", "2"))
+ACTIVITY_LOG_BATCH_SIZE = int(os.getenv("ACTIVITY_LOG_BATCH_SIZE", "200"))
+ACTIVITY_RETENTION_DAYS = int(os.getenv("ACTIVITY_RETENTION_DAYS", "365"))
+
 # Azure Storage (optional, aktifkan jika ingin pakai Azure Storage untuk static/media)
 AZURE_STORAGE_CONNECTION_STRING = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
 
@@ -83,6 +140,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "pramlearnapp.middleware.PrimaryStickyMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -108,21 +166,57 @@ TEMPLATES = [
 WSGI_APPLICATION = "pramlearn_api.wsgi.application"
 ASGI_APPLICATION = "pramlearn_api.asgi.application"
 
+# Koneksi database: DB_CONN_MAX_AGE > 0 membuat koneksi persisten (dipakai ulang
+# database_sync_to_async di consumer WebSocket) dengan health check sebelum dipakai
+# ulang. DB_POOLER=pgbouncer jika koneksi lewat PgBouncer mode transaction.
+DB_CONN_MAX_AGE = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+DB_CONN_HEALTH_CHECKS = os.getenv("DB_CONN_HEALTH_CHECKS", "True") == "True"
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "10"))
+DB_POOLER = os.getenv("DB_POOLER", "").lower()
+
+
+def database_config(config):
+    config["CONN_MAX_AGE"] = DB_CONN_MAX_AGE
+    config["CONN_HEALTH_CHECKS"] = DB_CONN_HEALTH_CHECKS
+    if config["ENGINE"] == "django.db.backends.postgresql":
+        config.setdefault("OPTIONS", {})["connect_timeout"] = DB_CONNECT_TIMEOUT
+        if DB_POOLER == "pgbouncer":
+            # Mode transaction: server-side cursor (.iterator()) tidak bertahan antar transaksi
+            config["DISABLE_SERVER_SIDE_CURSORS"] = True
+    return config
+
+
 # Database
 if os.getenv("DATABASE_URL"):
-    DATABASES = {"default": dj_database_url.parse(os.getenv("DATABASE_URL"))}
+    DATABASES = {
+        "default": database_config(dj_database_url.parse(os.getenv("DATABASE_URL")))
+    }
 else:
     DATABASES = {
-        "default": {
-            "ENGINE": "django.db.backends.postgresql",
-            "NAME": "pramlearn_db",
-            "USER": "postgres",
-            "PASSWORD": "",
-            "HOST": "localhost",
-            "PORT": "5432",
-        }
+        "default": database_config(
+            {
+                "ENGINE": "django.db.backends.postgresql",
+                "NAME": "pramlearn_db",
+                "USER": "postgres",
+                "PASSWORD": "",
+                "HOST": "localhost",
+                "PORT": "5432",
+            }
+        )
     }
 
+# Read replica opsional untuk view analytics/report (lihat pramlearnapp.db_router)
+if os.getenv("DATABASE_REPLICA_URL"):
+    DATABASES["replica"] = database_config(
+        dj_database_url.parse(os.getenv("DATABASE_REPLICA_URL"))
+    )
+    # Saat test, replica memakai database test yang sama dengan default
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+DATABASE_ROUTERS = ["pramlearnapp.db_router.ReplicaRouter"]
+
+# Lama (detik) baca user tetap ke primary setelah user tersebut menulis
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -21,6 +21,7 @@ from pramlearnapp.views import (
     UserViewSet,
     RegisterView,
     LoginView,
+    DatabaseStatusView,
     ClassViewSet,
     MaterialDetailView,
     SubjectClassViewSet,
@@ -54,6 +55,8 @@ from pramlearnapp.views import (
     MaterialAttendanceListView,
     update_attendance,
     bulk_create_attendance,
+    bulk_update_attendance,
+    attendance_sheet,
     QuizRankingView,
     StudentDashboardView,
     StudentSubjectsView,
@@ -100,6 +103,10 @@ from pramlearnapp.views.teacher.subjects.teacherSubjectsView import TeacherSubje
 from pramlearnapp.views.teacher.subjects.teacherSubjectDetailView import (
     TeacherSubjectDetailView,
 )
+from pramlearnapp.views.teacher.grades.teacherGradebookExportView import (
+    TeacherGradebookExportView,
+    TeacherGradeReportsExportView,
+)
 from pramlearnapp.views.teacher.sessions.teacherSessionsView import TeacherSessionsView
 from pramlearnapp.views.teacher.sessions.teacherSessionDetailView import (
     TeacherSessionDetailView,
@@ -145,7 +152,15 @@ from pramlearnapp.views.student.arcs.studentARCSQuestionnaireView import (
     StudentARCSBySlugView,
     StudentARCSResultsView,
 )
-from pramlearnapp.views.student.groupChatView import StudentGroupChatView
+from pramlearnapp.views.student.groupChatView import (
+    StudentGroupChatView,
+    StudentGroupChatReadView,
+)
+from pramlearnapp.views.student.studentNotificationView import (
+    StudentNotificationListView,
+    StudentNotificationDetailView,
+    StudentNotificationReadView,
+)
 
 
 router = DefaultRouter()
@@ -389,6 +404,31 @@ urlpatterns = [
         StudentGroupChatView.as_view(),
         name="student-group-chat",
     ),
+    path(
+        "api/student/group-chat/<str:material_slug>/read/",
+        StudentGroupChatReadView.as_view(),
+        name="student-group-chat-read",
+    ),
+    path(
+        "api/student/notifications/",
+        StudentNotificationListView.as_view(),
+        name="student-notifications",
+    ),
+    path(
+        "api/student/notifications/mark-all-read/",
+        StudentNotificationReadView.as_view(),
+        name="student-notifications-mark-all-read",
+    ),
+    path(
+        "api/student/notifications/<int:notification_id>/",
+        StudentNotificationDetailView.as_view(),
+        name="student-notification-detail",
+    ),
+    path(
+        "api/student/notifications/<int:notification_id>/read/",
+        StudentNotificationReadView.as_view(),
+        name="student-notification-read",
+    ),
     path(
         "api/teacher/dashboard/",
         TeacherDashboardView.as_view(),
@@ -412,6 +452,26 @@ urlpatterns = [
         TeacherSubjectDetailView.as_view(),
         name="teacher-subject-detail",
     ),
+    path(
+        "api/teacher/classes/<str:class_slug>/export/gradebook/",
+        TeacherGradebookExportView.as_view(),
+        name="teacher-class-gradebook-export",
+    ),
+    path(
+        "api/teacher/classes/<str:class_slug>/export/reports/",
+        TeacherGradeReportsExportView.as_view(),
+        name="teacher-class-reports-export",
+    ),
+    path(
+        "api/teacher/subjects/<str:subject_slug>/export/gradebook/",
+        TeacherGradebookExportView.as_view(),
+        name="teacher-subject-gradebook-export",
+    ),
+    path(
+        "api/teacher/subjects/<str:subject_slug>/export/reports/",
+        TeacherGradeReportsExportView.as_view(),
+        name="teacher-subject-reports-export",
+    ),
     path(
         "api/teacher/sessions/", TeacherSessionsView.as_view(), name="teacher-sessions"
     ),
@@ -566,6 +626,16 @@ urlpatterns = [
         bulk_create_attendance,
         name="bulk-create-attendance",
     ),
+    path(
+        "api/materials/<int:material_id>/attendance/bulk-update/",
+        bulk_update_attendance,
+        name="bulk-update-attendance",
+    ),
+    path(
+        "api/materials/<int:material_id>/attendance/sheet/",
+        attendance_sheet,
+        name="attendance-sheet",
+    ),
     path(
         "api/quiz-ranking/<int:quiz_id>/",
         QuizRankingView.as_view(),
@@ -596,6 +666,11 @@ urlpatterns = [
     ),
     path("api/register/", RegisterView.as_view(), name="register"),
     path("api/login/", LoginView.as_view(), name="login"),
+    path(
+        "api/admin/database-status/",
+        DatabaseStatusView.as_view(),
+        name="admin-database-status",
+    ),
     # add api/ route for the router
     path("api/", include(router.urls)),
 ]
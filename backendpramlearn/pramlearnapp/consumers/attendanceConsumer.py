@@ -29,32 +29,14 @@ class AttendanceConsumer(AsyncWebsocketConsumer):
         print(
             f"❌ WebSocket disconnected from attendance for material {self.material_id}")
 
-    async def receive(self, text_data):
-        try:
-            data = json.loads(text_data)
-            message_type = data.get('type', '')
+    # Socket hanya menerima broadcast; perubahan absensi dikirim lewat REST
+    # dan disiarkan oleh AttendanceService, bukan direlay dari client
 
-            if message_type == 'attendance_update':
-                # Broadcast ke semua client di group
-                await self.channel_layer.group_send(
-                    self.group_name,
-                    {
-                        'type': 'attendance_notification',
-                        'student_id': data.get('student_id'),
-                        'status': data.get('status'),
-                        'student_name': data.get('student_name'),
-                        'timestamp': data.get('timestamp')
-                    }
-                )
-        except json.JSONDecodeError:
-            pass
-
-    async def attendance_notification(self, event):
-        # Send message ke WebSocket
+    async def attendance_batch_notification(self, event):
+        # Satu pesan berisi semua perubahan absensi dari operasi batch
         await self.send(text_data=json.dumps({
-            'type': 'attendance_update',
-            'student_id': event['student_id'],
-            'status': event['status'],
-            'student_name': event['student_name'],
+            'type': 'attendance_batch',
+            'changes': event['changes'],
+            'updated_by': event['updated_by'],
             'timestamp': event['timestamp']
         }))
@@ -1,52 +1,164 @@
+import asyncio
 import json
+import time
+from collections import Counter
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
-from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.core.cache import cache
 from pramlearnapp.models import GroupMember, GroupChat, Material
-from rest_framework_simplejwt.tokens import UntypedToken
-from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-from django.contrib.auth.models import AnonymousUser
-from urllib.parse import parse_qs
 import logging
 from django.utils import timezone
-from channels.layers import get_channel_layer
+from pramlearnapp.services.presence_service import PresenceService
+from pramlearnapp.services.chat_buffer_service import get_chat_buffer
+from pramlearnapp.serializers.student.groupChatSerializer import GroupChatSerializer
+from pramlearnapp.consumers.userStatusConsumer import expire_presence_later
 
 logger = logging.getLogger(__name__)
-User = get_user_model()
+
+
+def chat_leaving_key(group_id, user_id):
+    return f"group-chat:leaving:{group_id}:{user_id}"
+
+
+def chat_sockets_key(group_id, user_id):
+    return f"group-chat:sockets:{group_id}:{user_id}"
+
+
+def chat_socket_opened(group_id, user_id):
+    """Return jumlah socket chat user di kelompok ini yang sedang terbuka"""
+    key = chat_sockets_key(group_id, user_id)
+    timeout = PresenceService.socket_count_timeout()
+    cache.add(key, 0, timeout)
+    try:
+        count = cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout)
+        count = 1
+    cache.touch(key, timeout)
+    return count
+
+
+def refresh_chat_sockets(group_id, user_id):
+    """Perpanjang counter socket chat selama socket masih aktif (ping)"""
+    cache.touch(
+        chat_sockets_key(group_id, user_id), PresenceService.socket_count_timeout()
+    )
+
+
+def chat_socket_closed(group_id, user_id):
+    """Return sisa socket chat user di kelompok ini yang masih terbuka"""
+    key = chat_sockets_key(group_id, user_id)
+    try:
+        remaining = cache.decr(key)
+    except ValueError:
+        return 0
+    if remaining <= 0:
+        cache.delete(key)
+        return 0
+    return remaining
+
+
+def mark_chat_leaving(group_id, user_id, grace):
+    cache.set(chat_leaving_key(group_id, user_id), 1, grace * 2)
+
+
+def cancel_chat_leaving(group_id, user_id):
+    """Return True jika user kembali dalam masa tenggang (status 'left' dibatalkan)"""
+    key = chat_leaving_key(group_id, user_id)
+    leaving = cache.get(key) is not None
+    if leaving:
+        cache.delete(key)
+    return leaving
+
+
+def confirm_chat_left(group_id, user_id):
+    """Return True jika user tidak kembali selama masa tenggang"""
+    if not cancel_chat_leaving(group_id, user_id):
+        return False
+    return cache.get(chat_sockets_key(group_id, user_id)) is None
+
+
+class TypingCoalescer:
+    """
+    Throttle indikator mengetik satu user (leading dan trailing edge).
+
+    Client mengirim is_typing=true di setiap ketukan; yang di-broadcast hanya
+    perubahan status, paling sering sekali per interval. Perubahan pertama
+    langsung dikirim, perubahan berikutnya dalam interval digabung dan status
+    terakhirnya dikirim di akhir interval.
+    """
+
+    def __init__(self, publish, interval):
+        self.publish = publish
+        self.interval = interval
+        self.sent = False
+        self.pending = None
+        self.last_sent_at = None
+        self.task = None
+
+    async def update(self, is_typing):
+        """Return True jika status langsung di-broadcast"""
+        self.pending = bool(is_typing)
+        if self.task:
+            return False
+        wait = 0
+        if self.last_sent_at is not None:
+            wait = self.interval - (time.monotonic() - self.last_sent_at)
+        if wait <= 0:
+            return await self.flush()
+        self.task = asyncio.ensure_future(self.flush_later(wait))
+        return False
+
+    async def flush_later(self, wait):
+        await asyncio.sleep(wait)
+        self.task = None
+        await self.flush()
+
+    async def flush(self):
+        is_typing, self.pending = self.pending, None
+        if is_typing is None or is_typing == self.sent:
+            return False
+        self.sent = is_typing
+        self.last_sent_at = time.monotonic()
+        await self.publish(is_typing)
+        return True
+
+    async def close(self):
+        """Batalkan trailing edge dan hentikan indikator yang masih aktif"""
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        self.pending = False
+        await self.flush()
 
 
 class GroupChatConsumer(AsyncWebsocketConsumer):
+    """
+    WebSocket chat kelompok. Lalu lintas channel layer mengikuti percakapan,
+    bukan ketukan keyboard: indikator mengetik di-throttle per user
+    (TypingCoalescer), dan status 'left' ditunda selama masa tenggang
+    presence sehingga reload/reconnect singkat tidak memicu pasangan
+    'left' + 'joined'. Socket chat per (kelompok, user) dihitung, sehingga
+    'joined'/'left' hanya dikirim untuk socket pertama/terakhir. Setiap consumer mencatat jumlah pesan masuk, keluar,
+    dan group_send (lihat get_stats).
+    """
+
+    # Total counter semua consumer di proses ini
+    totals = Counter()
+
     async def connect(self):
+        self.counters = Counter()
+        self.started_at = time.monotonic()
+        self.typing = TypingCoalescer(
+            self.publish_typing,
+            getattr(settings, "GROUP_CHAT_TYPING_THROTTLE", 2.0),
+        )
         self.material_slug = self.scope["url_route"]["kwargs"]["material_slug"]
+        # User diisi JWTAuthMiddleware dari token pada query string
         self.user = self.scope["user"]
-
-        # Get token from query string
-        query_string = self.scope["query_string"].decode()
-        query_params = parse_qs(query_string)
-        token = query_params.get("token", [None])[0]
-
-        if not token:
-            logger.error("❌ No token provided in WebSocket connection")
-            await self.close()
-            return
-
-        # Validate token and get user
-        try:
-            validated_token = UntypedToken(token)
-            user_id = validated_token.payload.get("user_id")
-            if not user_id:
-                raise InvalidToken("No user_id in token")
-
-            self.user = await self.get_user(user_id)
-            if not self.user:
-                raise InvalidToken("User not found")
-
-        except (InvalidToken, TokenError) as e:
-            logger.error(f"❌ Invalid token: {str(e)}")
-            await self.close()
-            return
-
         if self.user.is_anonymous:
+            logger.error("❌ Invalid or missing token in WebSocket connection")
             await self.close()
             return
 
@@ -63,39 +175,22 @@ class GroupChatConsumer(AsyncWebsocketConsumer):
 
         await self.accept()
 
-        # Notify others that user joined
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                "type": "user_status",
-                "user_id": self.user.id,
-                "username": self.user.username,
-                "status": "joined",
-                "is_online": True,
-            },
+        # Tab lain masih membuka chat ini, atau reconnect dalam masa tenggang:
+        # anggota lain tidak pernah menerima 'left', jadi 'joined' juga tidak
+        # perlu dikirim
+        open_sockets = await database_sync_to_async(chat_socket_opened)(
+            self.group_info["group_id"], self.user.id
         )
-
-        await self.channel_layer.group_send(
-            "user_status_global",
-            {
-                "type": "user_status_update",
-                "user_id": self.user.id,
-                "is_online": True,
-                "last_activity": timezone.now().isoformat(),
-            },
+        returning = await database_sync_to_async(cancel_chat_leaving)(
+            self.group_info["group_id"], self.user.id
         )
+        if open_sockets == 1 and not returning:
+            await self.broadcast_status("joined")
 
-        channel_layer = get_channel_layer()
-        if channel_layer:
-            await channel_layer.group_send(
-                "user_status_global",
-                {
-                    "type": "user_status_update",
-                    "user_id": self.user.id,
-                    "is_online": True,
-                    "last_activity": timezone.now().isoformat(),
-                },
-            )
+        # Status online kelas/kelompok dikelola PresenceService (broadcast
+        # hanya jika status berubah)
+        await database_sync_to_async(PresenceService.socket_opened)(self.user.id)
+        await database_sync_to_async(PresenceService.heartbeat)(self.user.id)
 
         self.connected_at = timezone.now()
 
@@ -103,83 +198,131 @@ class GroupChatConsumer(AsyncWebsocketConsumer):
             f"✅ User {self.user.username} joined group chat {self.group_info['group_id']}"
         )
 
-    @database_sync_to_async
-    def get_user(self, user_id):
-        """Get user by ID"""
-        try:
-            return User.objects.get(id=user_id)
-        except User.DoesNotExist:
-            return None
-
     async def disconnect(self, close_code):
         logger.info(
             f"🔌 User {self.user.username} disconnecting with code: {close_code}"
         )
 
         if hasattr(self, "room_group_name") and hasattr(self, "user"):
-            # Notify others that user left
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    "type": "user_status",
-                    "user_id": self.user.id,
-                    "username": self.user.username,
-                    "status": "left",
-                    "is_online": False,
-                },
-            )
+            await self.typing.close()
 
-            await self.channel_layer.group_send(
-                "user_status_global",
-                {
-                    "type": "user_status_update",
-                    "user_id": self.user.id,
-                    "is_online": False,
-                    "last_activity": timezone.now().isoformat(),
-                },
+            # 'left' dikirim setelah masa tenggang jika user tidak kembali,
+            # dan hanya jika tidak ada socket chat lain milik user yang masih
+            # terbuka di kelompok ini
+            remaining = await database_sync_to_async(chat_socket_closed)(
+                self.group_info["group_id"], self.user.id
             )
-
-            channel_layer = get_channel_layer()
-            if channel_layer:
-                await channel_layer.group_send(
-                    "user_status_global",
-                    {
-                        "type": "user_status_update",
-                        "user_id": self.user.id,
-                        "is_online": False,
-                        "last_activity": timezone.now().isoformat(),
-                    },
+            if not remaining:
+                grace = PresenceService.offline_grace()
+                await database_sync_to_async(mark_chat_leaving)(
+                    self.group_info["group_id"], self.user.id, grace
+                )
+                asyncio.ensure_future(
+                    self.announce_left_later(
+                        self.room_group_name,
+                        self.group_info["group_id"],
+                        self.user.id,
+                        self.user.username,
+                        grace,
+                    )
                 )
 
+            if await database_sync_to_async(PresenceService.release_socket)(
+                self.user.id
+            ):
+                asyncio.ensure_future(expire_presence_later(self.user.id))
+
             # Leave room group
             await self.channel_layer.group_discard(
                 self.room_group_name, self.channel_name
             )
 
+            stats = self.get_stats()
+            GroupChatConsumer.totals.update(self.counters)
+            logger.info(f"📊 Group chat stats for {self.user.username}: {stats}")
+
         logger.info(
             f"✅ User {getattr(self, 'user', 'Unknown').username} left group chat"
         )
 
+    async def announce_left_later(
+        self, room_group_name, group_id, user_id, username, grace
+    ):
+        await asyncio.sleep(grace)
+        try:
+            if await database_sync_to_async(confirm_chat_left)(group_id, user_id):
+                await self.channel_layer.group_send(
+                    room_group_name,
+                    {
+                        "type": "user_status",
+                        "user_id": user_id,
+                        "username": username,
+                        "status": "left",
+                        "is_online": False,
+                    },
+                )
+        except Exception as e:
+            logger.error(f"❌ Error announcing {username} left group chat: {e}")
+
+    async def send(self, *args, **kwargs):
+        self.counters["sent"] += 1
+        await super().send(*args, **kwargs)
+
+    async def group_send(self, event):
+        self.counters["group_send"] += 1
+        await self.channel_layer.group_send(self.room_group_name, event)
+
+    async def broadcast_status(self, status):
+        await self.group_send(
+            {
+                "type": "user_status",
+                "user_id": self.user.id,
+                "username": self.user.username,
+                "status": status,
+                "is_online": status == "joined",
+            }
+        )
+
+    async def publish_typing(self, is_typing):
+        self.counters["typing_broadcast"] += 1
+        await self.group_send(
+            {
+                "type": "typing_indicator",
+                "user_id": self.user.id,
+                "username": self.user.username,
+                "is_typing": is_typing,
+            }
+        )
+
+    def get_stats(self):
+        """Jumlah pesan dan laju per menit sejak connect"""
+        minutes = max((time.monotonic() - self.started_at) / 60, 1 / 60)
+        return {
+            "counts": dict(self.counters),
+            "per_minute": {
+                name: round(count / minutes, 2) for name, count in self.counters.items()
+            },
+        }
+
     async def receive(self, text_data):
         try:
+            self.counters["received"] += 1
             text_data_json = json.loads(text_data)
             message_type = text_data_json.get("type", "")
 
             if message_type == "ping":
                 # Heartbeat untuk maintain connection
                 logger.debug(f"💓 Received ping from {self.user.username}")
+                await database_sync_to_async(refresh_chat_sockets)(
+                    self.group_info["group_id"], self.user.id
+                )
                 await self.send(text_data=json.dumps({"type": "pong"}))
             elif message_type == "typing":
-                # Broadcast typing indicator
-                await self.channel_layer.group_send(
-                    self.room_group_name,
-                    {
-                        "type": "typing_indicator",
-                        "user_id": self.user.id,
-                        "username": self.user.username,
-                        "is_typing": text_data_json.get("is_typing", False),
-                    },
-                )
+                self.counters["typing_received"] += 1
+                await self.typing.update(text_data_json.get("is_typing", False))
+            elif message_type == "chat_message":
+                # Disimpan di task terpisah agar receive tidak menunggu flush
+                asyncio.ensure_future(self.save_chat_message(text_data_json))
         except json.JSONDecodeError as e:
             logger.error(f"❌ JSON decode error from {self.user.username}: {str(e)}")
         except Exception as e:
@@ -187,6 +330,53 @@ class GroupChatConsumer(AsyncWebsocketConsumer):
                 f"❌ Error processing message from {self.user.username}: {str(e)}"
             )
 
+    async def save_chat_message(self, data):
+        """
+        Simpan pesan dari socket lewat write-behind buffer, kirim ack
+        (chat_ack dengan client_id dari client) ke pengirim, lalu broadcast
+        ke kelompok.
+        """
+        client_id = str(data.get("client_id") or "")[:64] or None
+        text = str(data.get("message") or "").strip()
+        if not text:
+            await self.send_chat_error(client_id, "Pesan tidak boleh kosong")
+            return
+
+        self.counters["chat_received"] += 1
+        chat = GroupChat(
+            group_id=self.group_info["group_id"],
+            sender=self.user,
+            message=text,
+            client_id=client_id,
+            created_at=timezone.now(),
+        )
+        try:
+            chat = await get_chat_buffer().add(chat)
+        except Exception as e:
+            logger.error(f"❌ Error saving chat message from {self.user.username}: {e}")
+            await self.send_chat_error(client_id, "Gagal mengirim pesan")
+            return
+
+        chat.sender = self.user
+        message = GroupChatSerializer(chat).data
+        await self.send(
+            text_data=json.dumps(
+                {
+                    "type": "chat_ack",
+                    "client_id": client_id,
+                    "message": {**message, "is_current_user": True},
+                }
+            )
+        )
+        await self.group_send({"type": "chat_message", "message": message})
+
+    async def send_chat_error(self, client_id, error):
+        await self.send(
+            text_data=json.dumps(
+                {"type": "chat_error", "client_id": client_id, "error": error}
+            )
+        )
+
     async def chat_message(self, event):
         """Handle chat message from group send"""
         await self.send(
@@ -1,20 +1,91 @@
 import json
+import logging
+from urllib.parse import parse_qs
 from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.db import database_sync_to_async
+from pramlearnapp.services.notification_service import (
+    NotificationService,
+    notification_groups_for_user,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class NotificationConsumer(AsyncWebsocketConsumer):
+    """
+    WebSocket notifikasi. Socket bergabung ke channel pribadi user, channel
+    kelas yang diikuti, dan channel semua siswa. Saat connect dengan
+    ?after=<id notifikasi terakhir>, notifikasi yang terlewat selama offline
+    dikirim sebagai notification_batch; client bisa meminta halaman
+    berikutnya dengan pesan {"type": "catch_up", "after": <cursor>}.
+    """
+
     async def connect(self):
-        self.user_id = self.scope['url_route']['kwargs']['user_id']
-        self.group_name = f"user_notifications_{self.user_id}"
-        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        self.user_id = self.scope["url_route"]["kwargs"]["user_id"]
+        self.groups_joined = []
+
+        user = self.scope.get("user")
+        if not user or not user.is_authenticated or str(user.id) != str(self.user_id):
+            await self.close(code=4001)
+            return
+
+        self.groups_joined = await database_sync_to_async(notification_groups_for_user)(
+            user
+        )
+        for group_name in self.groups_joined:
+            await self.channel_layer.group_add(group_name, self.channel_name)
         await self.accept()
 
+        after = self.parse_cursor(self.scope.get("query_string", b"").decode())
+        if after is not None:
+            await self.send_catch_up(after)
+
     async def disconnect(self, close_code):
-        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        for group_name in self.groups_joined:
+            await self.channel_layer.group_discard(group_name, self.channel_name)
 
     async def receive(self, text_data):
-        # Optional: handle incoming messages from client if needed
-        pass
+        try:
+            data = json.loads(text_data)
+        except json.JSONDecodeError:
+            return
+        if data.get("type") == "catch_up":
+            try:
+                after = int(data.get("after") or 0)
+            except (TypeError, ValueError):
+                after = 0
+            await self.send_catch_up(after)
+
+    @staticmethod
+    def parse_cursor(query_string):
+        value = parse_qs(query_string).get("after", [None])[0]
+        try:
+            return int(value) if value is not None else None
+        except ValueError:
+            return None
+
+    async def send_catch_up(self, after):
+        try:
+            items, cursor, has_more = await database_sync_to_async(
+                NotificationService.catch_up
+            )(int(self.user_id), after)
+        except Exception as e:
+            logger.error(f"Error loading notifications for user {self.user_id}: {e}")
+            return
+        await self.send(
+            text_data=json.dumps(
+                {
+                    "type": "notification_batch",
+                    "notifications": items,
+                    "cursor": cursor,
+                    "has_more": has_more,
+                }
+            )
+        )
 
     async def send_notification(self, event):
-        await self.send(text_data=json.dumps(event["notification"]))
+        await self.send(
+            text_data=json.dumps(
+                {"type": "notification", "notification": event["notification"]}
+            )
+        )
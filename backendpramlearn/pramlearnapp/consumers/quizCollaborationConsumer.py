@@ -17,10 +17,6 @@ from pramlearnapp.models import (
     GroupQuizResult,
     Material,
 )
-from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.tokens import AccessToken
-from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-from urllib.parse import parse_qs
 from asgiref.sync import async_to_sync
 
 logger = logging.getLogger(__name__)
@@ -38,34 +34,16 @@ class QuizCollaborationConsumer(AsyncWebsocketConsumer):
             f"🔗 Quiz collaboration connection attempt: quiz_id={self.quiz_id}, group_id={self.group_id}"
         )
 
-        try:
-            # Get token from query string
-            query_string = self.scope.get("query_string", b"").decode()
-            query_params = parse_qs(query_string)
-            token = query_params.get("token", [None])[0]
-
-            if not token:
-                logger.warning("❌ No token provided in query parameter")
-                await self.close(code=4001)
-                return
-
-            # Authenticate user with JWT token
-            user = await self.authenticate_user(token)
-            if not user:
-                logger.warning("❌ Invalid token or user not found")
-                await self.close(code=4001)
-                return
-
-            # Set authenticated user in scope
-            self.scope["user"] = user
-            self.user = user
-            logger.info(f"✅ User authenticated: {user.username} (ID: {user.id})")
-
-        except Exception as e:
-            logger.error(f"❌ Authentication error: {str(e)}")
+        # User diisi JWTAuthMiddleware dari token pada query string
+        user = self.scope.get("user")
+        if not user or not user.is_authenticated:
+            logger.warning("❌ Invalid token or user not found")
             await self.close(code=4001)
             return
 
+        self.user = user
+        logger.info(f"✅ User authenticated: {user.username} (ID: {user.id})")
+
         # Verify user is member of the group
         try:
             is_member = await self.is_group_member()
@@ -106,31 +84,6 @@ class QuizCollaborationConsumer(AsyncWebsocketConsumer):
         except Exception as e:
             logger.error(f"❌ Error notifying group members: {str(e)}")
 
-    @database_sync_to_async
-    def authenticate_user(self, token):
-        """Authenticate user with JWT token"""
-        try:
-            # Decode JWT token
-            access_token = AccessToken(token)
-            user_id = access_token["user_id"]
-
-            # Get user from database
-            User = get_user_model()
-            user = User.objects.get(id=user_id)
-
-            logger.info(f"🔑 JWT token decoded successfully for user: {user.username}")
-            return user
-
-        except TokenError as e:
-            logger.error(f"❌ JWT Token error: {str(e)}")
-            return None
-        except User.DoesNotExist:
-            logger.error(f"❌ User with ID {user_id} not found")
-            return None
-        except Exception as e:
-            logger.error(f"❌ Unexpected authentication error: {str(e)}")
-            return None
-
     async def disconnect(self, close_code):
         self.is_connected = False
 
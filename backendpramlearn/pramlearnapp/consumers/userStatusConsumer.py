@@ -1,31 +1,51 @@
+import asyncio
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
-from django.contrib.auth import get_user_model
-from asgiref.sync import sync_to_async
-from django.contrib.auth.models import AnonymousUser
-from pramlearnapp.models import (
-    Quiz,
-    Group,
-    GroupQuiz,
-    GroupQuizSubmission,
-    GroupQuizResult,
-    GroupMember,
+from pramlearnapp.services.presence_service import (
+    PresenceService,
+    presence_groups_for_user,
+    presence_scopes,
 )
-from django.utils import timezone
+
+
+async def expire_presence_later(user_id):
+    """Cek ulang presence setelah masa tenggang, broadcast offline bila perlu"""
+    await asyncio.sleep(PresenceService.offline_grace() + 1)
+    try:
+        await database_sync_to_async(PresenceService.expire_if_gone)(user_id)
+    except Exception as e:
+        print(f"❌ Error expiring presence for user {user_id}: {e}")
 
 
 class UserStatusConsumer(AsyncWebsocketConsumer):
+    """
+    WebSocket presence. Socket hanya bergabung ke channel presence kelas dan
+    kelompok user, sehingga update status hanya diterima oleh user yang
+    berbagi kelas/kelompok. Saat bergabung, client menerima snapshot user
+    online di scope tersebut satu kali. Heartbeat diteruskan ke
+    PresenceService.
+    """
+
     async def connect(self):
         try:
-            self.group_name = "user_status"
+            self.user_id = None
+            self.presence_groups = []
+            # Status terakhir yang dikirim per user, untuk membuang event
+            # duplikat (user yang berbagi kelas dan kelompok sekaligus)
+            self.sent_statuses = {}
 
-            # Join group SEBELUM accept
-            await self.channel_layer.group_add(self.group_name, self.channel_name)
+            user = self.scope.get("user")
+            if not user or not user.is_authenticated:
+                # Identitas hanya dari token (JWTAuthMiddleware), bukan dari client
+                await self.close(code=4001)
+                return
 
-            # Accept connection
-            await self.channel_layer.group_add("user_status_global", self.channel_name)
             await self.accept()
+            await self.identify(user.id)
+            await database_sync_to_async(PresenceService.socket_opened)(user.id)
+            await database_sync_to_async(PresenceService.heartbeat)(user.id)
+
             print(f"✅ UserStatus WebSocket connected: {self.channel_name}")
 
         except Exception as e:
@@ -34,30 +54,59 @@ class UserStatusConsumer(AsyncWebsocketConsumer):
 
     async def disconnect(self, close_code):
         try:
-            await self.channel_layer.group_discard(
-                "user_status_global", self.channel_name
-            )
-            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+            for group_name in self.presence_groups:
+                await self.channel_layer.group_discard(group_name, self.channel_name)
+            # Masa tenggang offline hanya dimulai saat socket terakhir user
+            # (status atau chat, di tab mana pun) ditutup
+            if self.user_id and await database_sync_to_async(
+                PresenceService.release_socket
+            )(self.user_id):
+                asyncio.ensure_future(expire_presence_later(self.user_id))
             print(f"❌ UserStatus WebSocket disconnected: {self.channel_name}")
         except Exception as e:
             print(f"❌ Error in UserStatus disconnect: {e}")
 
+    async def identify(self, user_id):
+        """
+        Gabung ke channel presence kelas dan kelompok milik user, lalu kirim
+        snapshot user yang sedang online di scope tersebut
+        """
+        if self.user_id == user_id:
+            return
+        for group_name in self.presence_groups:
+            await self.channel_layer.group_discard(group_name, self.channel_name)
+
+        self.user_id = user_id
+        scopes = await database_sync_to_async(presence_scopes)(user_id)
+        self.presence_groups = presence_groups_for_user(user_id, scopes)
+        for group_name in self.presence_groups:
+            await self.channel_layer.group_add(group_name, self.channel_name)
+
+        users = await database_sync_to_async(PresenceService.snapshot)(scopes)
+        self.sent_statuses = {
+            u["user_id"]: (u["is_online"], u["last_activity"]) for u in users
+        }
+        await self.send(
+            text_data=json.dumps({"type": "presence_snapshot", "users": users})
+        )
+
     async def receive(self, text_data):
         try:
             data = json.loads(text_data)
             message_type = data.get("type", "")
 
             if message_type == "user_activity_update":
-                # Broadcast ke semua client di group
-                await self.channel_layer.group_send(
-                    self.group_name,
-                    {
-                        "type": "user_status_update",
-                        "user_id": data.get("user_id"),
-                        "is_online": data.get("is_online"),
-                        "last_activity": data.get("last_activity"),
-                    },
-                )
+                if not self.user_id:
+                    return
+
+                if data.get("is_online", True):
+                    await database_sync_to_async(PresenceService.heartbeat)(
+                        self.user_id
+                    )
+                else:
+                    await database_sync_to_async(PresenceService.go_offline)(
+                        self.user_id
+                    )
         except json.JSONDecodeError as e:
             print(f"❌ JSON decode error in UserStatus: {e}")
         except Exception as e:
@@ -65,6 +114,11 @@ class UserStatusConsumer(AsyncWebsocketConsumer):
 
     async def user_status_update(self, event):
         try:
+            status = (event["is_online"], event["last_activity"])
+            if self.sent_statuses.get(event["user_id"]) == status:
+                return
+            self.sent_statuses[event["user_id"]] = status
+
             # Send message ke WebSocket
             await self.send(
                 text_data=json.dumps(
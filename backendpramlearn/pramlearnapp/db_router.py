@@ -0,0 +1,72 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = "replica"
+PRIMARY_PIN_PREFIX = "db-primary-pin"
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def primary_pin_key(user_id):
+    return f"{PRIMARY_PIN_PREFIX}:{user_id}"
+
+
+def pin_primary(user_id):
+    """
+    Arahkan baca user ke primary selama REPLICA_STICKY_SECONDS detik
+    setelah user menulis, agar report tidak menampilkan data sebelum
+    perubahannya sendiri sempat tereplikasi.
+    """
+    if user_id is None or not replica_configured():
+        return
+    cache.set(
+        primary_pin_key(user_id), True, getattr(settings, "REPLICA_STICKY_SECONDS", 10)
+    )
+
+
+def is_pinned_to_primary(user_id):
+    return user_id is not None and bool(cache.get(primary_pin_key(user_id)))
+
+
+@contextmanager
+def use_replica():
+    """Query baca di dalam blok ini diarahkan ke replica (jika dikonfigurasi)"""
+    token = _replica_reads.set(replica_configured())
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Router untuk read replica opsional (DATABASE_REPLICA_URL).
+
+    Semua tulis dan migrasi ke default. Baca ke replica hanya di dalam
+    use_replica() (view analytics/report lewat decorator read_replica) dan
+    tidak di dalam transaksi, supaya baca setelah tulis di transaksi yang
+    sama tetap konsisten.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return REPLICA_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica berisi data yang sama dengan primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -1,6 +1,10 @@
 from pramlearnapp.decorators.student_required import student_required
+from pramlearnapp.decorators.cache_response import cache_response
+from pramlearnapp.decorators.read_replica import read_replica
 
 
 __all__ = [
     "student_required",
+    "cache_response",
+    "read_replica",
 ]
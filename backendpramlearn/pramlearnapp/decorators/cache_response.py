@@ -0,0 +1,49 @@
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+from rest_framework import status
+
+from pramlearnapp.utils.cache import tagged_key
+
+
+def cache_response(timeout=None, tags=None, per_user=True):
+    """
+    Decorator untuk method GET pada APIView agar response di-cache.
+
+    tags: fungsi (request, *args, **kwargs) -> list tag. Response otomatis
+    tidak berlaku lagi saat salah satu tag diinvalidasi oleh signal.
+    Hanya response 200 yang disimpan.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(self, request, *args, **kwargs):
+            path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()
+            user_part = request.user.pk if per_user else "all"
+            key = f"view:{self.__class__.__name__}:{user_part}:{path_hash}"
+            view_tags = tags(request, *args, **kwargs) if tags else []
+            full_key = tagged_key(key, view_tags)
+
+            cached = cache.get(full_key)
+            if cached is not None:
+                return Response(cached, status=status.HTTP_200_OK)
+
+            response = view_func(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(
+                    full_key,
+                    response.data,
+                    (
+                        timeout
+                        if timeout is not None
+                        else getattr(settings, "CACHE_DEFAULT_TIMEOUT", 300)
+                    ),
+                )
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,28 @@
+from functools import wraps
+
+from pramlearnapp.db_router import (
+    is_pinned_to_primary,
+    replica_configured,
+    use_replica,
+)
+
+
+def read_replica(view_func):
+    """
+    Decorator untuk method GET analytics/report pada APIView: query baca
+    diarahkan ke read replica, kecuali user baru saja menulis (sticky
+    primary, lihat pin_primary). Tanpa replica, view berjalan seperti biasa.
+
+    Jangan dipakai pada view yang mengisi cache atau snapshot (dashboard,
+    analytics ber-cache): data replica yang tertinggal akan tersimpan dan
+    disajikan sampai cache kedaluwarsa.
+    """
+
+    @wraps(view_func)
+    def wrapper(self, request, *args, **kwargs):
+        if not replica_configured() or is_pinned_to_primary(request.user.pk):
+            return view_func(self, request, *args, **kwargs)
+        with use_replica():
+            return view_func(self, request, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,141 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from pramlearnapp.models import (
+    AssignmentSubmission,
+    Assignment,
+    ClassStudent,
+    CustomUser,
+    Grade,
+    Group,
+    GroupChat,
+    GroupQuiz,
+    GroupQuizSubmission,
+    Material,
+    NotificationInbox,
+    Quiz,
+    StudentActivity,
+    StudentMaterialActivity,
+    StudentMotivationProfile,
+)
+
+# Pola full table scan per vendor database
+SEQ_SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    # SQLite: "SCAN tabel" tanpa index; "SCAN tabel USING INDEX" tetap memakai index
+    'sqlite': re.compile(r'\bSCAN (\w+)(?! USING (?:COVERING )?INDEX)\b'),
+}
+
+
+def first_id(model, **filters):
+    return model.objects.filter(**filters).order_by('pk').values_list('pk', flat=True).first() or 0
+
+
+def sample_ids():
+    """Id contoh dari database untuk parameter query katalog (0 jika tabel kosong)"""
+    class_id = ClassStudent.objects.order_by('pk').values_list('class_id', flat=True).first()
+    return {
+        'student': first_id(CustomUser, role_id=3),
+        'class_student_ids': list(
+            ClassStudent.objects.filter(class_id=class_id).values_list('student_id', flat=True)[:50]
+        ) or [0],
+        'assignment': first_id(Assignment),
+        'quiz': first_id(Quiz),
+        'material': first_id(Material),
+        'group': first_id(Group),
+        'group_quiz': first_id(GroupQuiz),
+    }
+
+
+# Query representatif dari dashboard, submit, analytics, chat, dan notifikasi
+QUERY_CATALOGUE = [
+    ('student_recent_activities', lambda ids: StudentActivity.objects.filter(
+        student_id=ids['student']).order_by('-timestamp')[:5]),
+    ('class_recent_activities', lambda ids: StudentActivity.objects.filter(
+        student_id__in=ids['class_student_ids']).order_by('-timestamp')[:10]),
+    ('activity_retention', lambda ids: StudentActivity.objects.filter(
+        timestamp__lt=timezone.now() - timedelta(days=365), id__gt=0).order_by('id')[:5000]),
+    ('group_quiz_correct_answers', lambda ids: GroupQuizSubmission.objects.filter(
+        group_quiz_id=ids['group_quiz'], is_correct=True)),
+    ('assignment_final_submissions', lambda ids: AssignmentSubmission.objects.filter(
+        assignment_id=ids['assignment'], is_draft=False)),
+    ('student_assignment_submissions', lambda ids: AssignmentSubmission.objects.filter(
+        student_id=ids['student'], assignment_id=ids['assignment'])),
+    ('student_material_activity', lambda ids: StudentMaterialActivity.objects.filter(
+        student_id=ids['student'], material_id=ids['material'], activity_type='pdf_opened')),
+    ('student_quiz_grades', lambda ids: Grade.objects.filter(
+        student_id=ids['student'], quiz_id=ids['quiz'], type='quiz')),
+    ('student_grades_by_type', lambda ids: Grade.objects.filter(
+        student_id=ids['student'], type='assignment')),
+    ('group_chat_history', lambda ids: GroupChat.objects.filter(
+        group_id=ids['group']).order_by('-created_at')[:50]),
+    ('motivation_level_students', lambda ids: StudentMotivationProfile.objects.filter(
+        motivation_level='High')),
+    ('unread_notifications', lambda ids: NotificationInbox.objects.filter(
+        user_id=ids['student'], read_at__isnull=True)),
+]
+
+
+class Command(BaseCommand):
+    help = 'Jalankan EXPLAIN untuk query utama aplikasi dan tandai yang memakai full table scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--query',
+            action='append',
+            default=[],
+            help='Hanya audit query dengan nama ini (bisa diulang)'
+        )
+        parser.add_argument(
+            '--verbose-plans',
+            action='store_true',
+            help='Tampilkan rencana query lengkap'
+        )
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help='Gagal (exit code != 0) jika ada query yang memakai full table scan'
+        )
+
+    def explain(self, queryset):
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # Di tabel kecil planner memilih seq scan walau index ada;
+                # matikan seq scan agar hanya index yang benar-benar hilang terdeteksi
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            return queryset.explain()
+
+    def handle(self, *args, **options):
+        pattern = SEQ_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            self.stdout.write(self.style.WARNING(
+                f'⚠️ Deteksi full scan belum didukung untuk {connection.vendor}, hanya menampilkan rencana'))
+
+        catalogue = QUERY_CATALOGUE
+        if options['query']:
+            catalogue = [entry for entry in QUERY_CATALOGUE if entry[0] in options['query']]
+            if not catalogue:
+                raise CommandError(f"Query tidak dikenal: {', '.join(options['query'])}")
+
+        ids = sample_ids()
+        flagged = []
+        for name, build in catalogue:
+            plan = self.explain(build(ids))
+            tables = sorted(set(pattern.findall(plan))) if pattern else []
+            if tables:
+                flagged.append(name)
+                self.stdout.write(self.style.WARNING(
+                    f'⚠️ {name}: full scan pada {", ".join(tables)}'))
+            else:
+                self.stdout.write(f'✅ {name}')
+            if options['verbose_plans'] or pattern is None:
+                self.stdout.write(f'{plan}\n')
+
+        summary = f'{len(catalogue) - len(flagged)}/{len(catalogue)} query memakai index'
+        if flagged and options['strict']:
+            raise CommandError(f'{summary}; full scan: {", ".join(flagged)}')
+        self.stdout.write(self.style.SUCCESS(summary) if not flagged else summary)
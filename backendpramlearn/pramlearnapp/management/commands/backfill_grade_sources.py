@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from pramlearnapp.models import Grade
+from pramlearnapp.services.grade_source_service import GradeSourceService
+
+
+class Command(BaseCommand):
+    help = 'Tautkan grade lama ke submission, quiz attempt, atau group quiz sumbernya'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Jumlah grade yang diproses per batch'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Hitung grade yang bisa ditautkan tanpa menyimpan perubahan'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+
+        grades = Grade.objects.filter(
+            assignment_submission__isnull=True,
+            quiz_attempt__isnull=True,
+            group_quiz__isnull=True,
+        ).order_by('id')
+
+        total_checked = 0
+        total_linked = 0
+        last_id = 0
+        while True:
+            batch = list(grades.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            total_checked += len(batch)
+            total_linked += GradeSourceService.link_grades(batch, dry_run=dry_run)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {"Bisa ditautkan" if dry_run else "Ditautkan"} {total_linked} dari '
+            f'{total_checked} grade tanpa sumber'))
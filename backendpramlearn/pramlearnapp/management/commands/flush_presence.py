@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from pramlearnapp.services.presence_service import PresenceService
+
+
+class Command(BaseCommand):
+    help = 'Flush presence cache: simpan last_activity user online dan tandai offline user yang expired'
+
+    def handle(self, *args, **options):
+        updated, expired = PresenceService.flush()
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Presence flushed: {updated} last_activity diperbarui, {expired} user offline'))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from pramlearnapp.models import StudentActivity
+from pramlearnapp.services.activity_log_service import (
+    ActivityLogService,
+    PRUNE_BATCH_SIZE,
+)
+
+
+class Command(BaseCommand):
+    help = 'Hapus log aktivitas siswa yang lebih tua dari batas retensi (opsional diarsipkan dulu)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Umur maksimum aktivitas (hari), default ACTIVITY_RETENTION_DAYS'
+        )
+        parser.add_argument(
+            '--archive',
+            action='store_true',
+            help='Simpan aktivitas yang dihapus sebagai CSV gzip di storage'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=PRUNE_BATCH_SIZE,
+            help='Jumlah baris yang dihapus per batch'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Hitung aktivitas yang akan dihapus tanpa menghapus'
+        )
+
+    def handle(self, *args, **options):
+        cutoff = ActivityLogService.retention_cutoff(options['days'])
+
+        if options['dry_run']:
+            count = StudentActivity.objects.filter(timestamp__lt=cutoff).count()
+            self.stdout.write(
+                f'{count} aktivitas sebelum {cutoff:%Y-%m-%d %H:%M} akan dihapus')
+            return
+
+        deleted, path = ActivityLogService.prune(
+            cutoff, archive=options['archive'], batch_size=options['batch_size'])
+        if path:
+            self.stdout.write(f'📦 Arsip: {path}')
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {deleted} aktivitas sebelum {cutoff:%Y-%m-%d %H:%M} dihapus'))
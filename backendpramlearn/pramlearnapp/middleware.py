@@ -0,0 +1,110 @@
+from urllib.parse import parse_qs
+import logging
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .db_router import pin_primary
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+WS_USER_CACHE_PREFIX = "ws-user"
+
+
+def ws_user_cache_key(user_id):
+    return f"{WS_USER_CACHE_PREFIX}:{user_id}"
+
+
+def token_from_scope(scope):
+    """Token JWT dari query string (?token=...) atau header Authorization"""
+    query_params = parse_qs(scope.get("query_string", b"").decode())
+    token = query_params.get("token", [None])[0]
+    if token:
+        return token
+
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            parts = value.decode().split()
+            if len(parts) == 2 and parts[0] in jwt_settings.AUTH_HEADER_TYPES:
+                return parts[1]
+    return None
+
+
+def get_cached_user(user_id):
+    """
+    User aktif untuk user_id, di-cache sebentar (WS_USER_CACHE_TIMEOUT detik)
+    agar reconnect beruntun tidak selalu membaca tabel user. Cache dihapus
+    oleh signal saat user disimpan atau dihapus.
+    """
+    key = ws_user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = (
+            get_user_model()
+            .objects.select_related("role")
+            .filter(**{jwt_settings.USER_ID_FIELD: user_id})
+            .first()
+        )
+        if user is None:
+            return None
+        cache.set(key, user, getattr(settings, "WS_USER_CACHE_TIMEOUT", 60))
+    return user if user.is_active else None
+
+
+@database_sync_to_async
+def get_user_for_token(raw_token):
+    try:
+        validated_token = JWTAuthentication().get_validated_token(raw_token)
+    except (InvalidToken, TokenError):
+        logger.warning("❌ Invalid or expired WebSocket token")
+        return AnonymousUser()
+
+    user_id = validated_token.get(jwt_settings.USER_ID_CLAIM)
+    user = get_cached_user(user_id) if user_id is not None else None
+    return user or AnonymousUser()
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """
+    Autentikasi WebSocket dengan access token simplejwt: token divalidasi
+    sekali saat connect dan scope["user"] diisi untuk semua consumer
+    (AnonymousUser jika token tidak ada atau tidak valid).
+    """
+
+    async def __call__(self, scope, receive, send):
+        scope = dict(scope)
+        token = token_from_scope(scope)
+        scope["user"] = await get_user_for_token(token) if token else AnonymousUser()
+        return await super().__call__(scope, receive, send)
+
+
+def JWTAuthMiddlewareStack(inner):
+    return JWTAuthMiddleware(inner)
+
+
+class PrimaryStickyMiddleware:
+    """
+    Setelah request tulis (POST/PUT/PATCH/DELETE) dari user yang login,
+    baca user tersebut tetap ke primary selama REPLICA_STICKY_SECONDS
+    (lihat read_replica). request.user sudah diisi autentikasi DRF (JWT)
+    saat response kembali ke middleware ini.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS:
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                pin_primary(user.pk)
+        return response
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.8 on 2026-10-19 14:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pramlearnapp", "0002_groupchat_groupchatread"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TeacherDashboardSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("data", models.JSONField(blank=True, default=dict)),
+                ("overview_dirty", models.BooleanField(default=True)),
+                ("submissions_dirty", models.BooleanField(default=True)),
+                ("quizzes_dirty", models.BooleanField(default=True)),
+                ("activities_dirty", models.BooleanField(default=True)),
+                ("refreshed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "teacher",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="dashboard_snapshot",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.0.8 on 2026-10-19 14:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pramlearnapp", "0003_teacherdashboardsnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GroupChatReadState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("last_read_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="groupchat",
+            index=models.Index(
+                fields=["group", "created_at"], name="pramlearnap_group_i_f0eb90_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="groupchatreadstate",
+            name="group",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="chat_read_states",
+                to="pramlearnapp.group",
+            ),
+        ),
+        migrations.AddField(
+            model_name="groupchatreadstate",
+            name="last_read_message",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="pramlearnapp.groupchat",
+            ),
+        ),
+        migrations.AddField(
+            model_name="groupchatreadstate",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="groupchatreadstate",
+            unique_together={("group", "user")},
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.0.8 on 2026-10-19 14:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pramlearnapp", "0004_groupchat_keyset_readstate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="gradestatistics",
+            name="assignment_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="gradestatistics",
+            name="assignment_sum",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name="gradestatistics",
+            name="band_counts",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="gradestatistics",
+            name="grade_sum",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name="gradestatistics",
+            name="pending_achievements",
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name="gradestatistics",
+            name="perfect_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="gradestatistics",
+            name="quiz_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="gradestatistics",
+            name="quiz_sum",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name="gradestatistics",
+            name="recent_grades",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="gradestatistics",
+            name="subject_totals",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
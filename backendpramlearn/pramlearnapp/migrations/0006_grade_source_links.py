@@ -0,0 +1,47 @@
+# Generated by Django 5.0.8 on 2026-10-19 14:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pramlearnapp", "0005_gradestatistics_snapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="grade",
+            name="assignment_submission",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="grades",
+                to="pramlearnapp.assignmentsubmission",
+            ),
+        ),
+        migrations.AddField(
+            model_name="grade",
+            name="group_quiz",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="grades",
+                to="pramlearnapp.groupquiz",
+            ),
+        ),
+        migrations.AddField(
+            model_name="grade",
+            name="quiz_attempt",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="grades",
+                to="pramlearnapp.studentquizattempt",
+            ),
+        ),
+    ]
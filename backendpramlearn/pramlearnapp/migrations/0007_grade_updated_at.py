@@ -0,0 +1,22 @@
+# Generated by Django 5.0.8 on 2026-10-19 14:45
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pramlearnapp", "0006_grade_source_links"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="grade",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.8 on 2026-10-19 14:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pramlearnapp", "0007_grade_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="groupchat",
+            name="client_id",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="groupchat",
+            constraint=models.UniqueConstraint(
+                fields=("sender", "client_id"), name="unique_group_chat_client_id"
+            ),
+        ),
+    ]
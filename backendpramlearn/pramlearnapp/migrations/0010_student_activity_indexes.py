@@ -0,0 +1,44 @@
+# Generated by Django 5.0.8 on 2026-10-19 14:51
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pramlearnapp", "0009_notification_inbox"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="studentactivity",
+            name="activity_type",
+            field=models.CharField(
+                choices=[
+                    ("material", "Material"),
+                    ("assignment", "Assignment"),
+                    ("quiz", "Quiz"),
+                    ("group_quiz", "Group Quiz"),
+                ],
+                max_length=20,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="studentactivity",
+            name="timestamp",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name="studentactivity",
+            index=models.Index(
+                fields=["student", "-timestamp"], name="pramlearnap_student_f474f3_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="studentactivity",
+            index=models.Index(
+                fields=["timestamp"], name="pramlearnap_timesta_5855c3_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.8 on 2026-10-19 14:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pramlearnapp", "0010_student_activity_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="assignmentsubmission",
+            index=models.Index(
+                fields=["assignment", "is_draft"], name="pramlearnap_assignm_3a940b_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="assignmentsubmission",
+            index=models.Index(
+                fields=["student", "assignment"], name="pramlearnap_student_040ed6_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="grade",
+            index=models.Index(
+                fields=["student", "quiz", "type"],
+                name="pramlearnap_student_195cc1_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="groupquizsubmission",
+            index=models.Index(
+                fields=["group_quiz", "is_correct"],
+                name="pramlearnap_group_q_75e0ab_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="studentmotivationprofile",
+            index=models.Index(
+                fields=["motivation_level"], name="pramlearnap_motivat_6e082f_idx"
+            ),
+        ),
+    ]
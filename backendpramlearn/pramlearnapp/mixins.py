@@ -0,0 +1,64 @@
+from pramlearnapp.pagination import OptionalCursorPagination
+
+
+class ProjectedListMixin:
+    """
+    Mixin untuk ViewSet/ListAPIView: cursor pagination opsional dan
+    proyeksi field lewat ?fields=id,title.
+
+    Field yang tidak diminta dibuang dari serializer (termasuk
+    SerializerMethodField, sehingga query-nya tidak dijalankan). Jika semua
+    field yang diminta adalah kolom model biasa, queryset juga dibatasi
+    dengan .only().
+    """
+    pagination_class = OptionalCursorPagination
+
+    fields_query_param = "fields"
+
+    def get_requested_fields(self):
+        if self.request is None or self.request.method != "GET":
+            return None
+        raw = self.request.query_params.get(self.fields_query_param)
+        if not raw:
+            return None
+        fields = {name.strip() for name in raw.split(",") if name.strip()}
+        return fields or None
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        requested = self.get_requested_fields()
+        if requested:
+            target = getattr(serializer, "child", serializer)
+            for name in set(target.fields) - requested:
+                target.fields.pop(name)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        requested = self.get_requested_fields()
+        if not requested or not hasattr(queryset, "query"):
+            return queryset
+        if queryset.query.select_related or queryset.query.combinator:
+            # .only() tidak bisa digabung dengan select_related/union
+            return queryset
+
+        serializer = self.get_serializer()
+        concrete = {f.attname: f.name for f in queryset.model._meta.concrete_fields}
+        concrete_names = set(concrete) | set(concrete.values())
+        only = set()
+        for name in requested:
+            field = serializer.fields.get(name)
+            if field is None:
+                continue
+            source = field.source or name
+            if source not in concrete_names:
+                # Field turunan/relasi: biarkan queryset apa adanya
+                return queryset
+            only.add(source)
+
+        ordering = getattr(self, "cursor_ordering", None) or "pk"
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        only.update(o.lstrip("-") for o in ordering)
+        only.add("pk")
+        return queryset.only(*only)
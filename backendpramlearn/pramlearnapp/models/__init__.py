@@ -9,6 +9,7 @@ from .group import (
     GroupQuizResult,
     GroupChat,
     GroupChatRead,
+    GroupChatReadState,
 )
 from .quiz import Quiz, Question, StudentQuizAttempt, StudentQuizAnswer
 from .assignment import (
@@ -30,7 +31,9 @@ from .attedance import StudentAttendance
 from .studentActivity import StudentActivity
 from .schedule import Schedule
 from .announcement import Announcement
+from .notification import Notification, NotificationInbox
 from .grade import Grade, GradeStatistics, Achievement
+from .dashboard import TeacherDashboardSnapshot
 from .arcs_questionnaire import (
     ARCSQuestionnaire,
     ARCSQuestion,
@@ -46,6 +49,7 @@ __all__ = [
     "Grade",
     "GradeStatistics",
     "Achievement",
+    "TeacherDashboardSnapshot",
     "Role",
     "CustomUser",
     "StudentMotivationProfile",
@@ -60,6 +64,7 @@ __all__ = [
     "GroupQuizResult",
     "GroupChat",
     "GroupChatRead",
+    "GroupChatReadState",
     "Quiz",
     "Question",
     "Assignment",
@@ -78,5 +83,6 @@ __all__ = [
     "StudentQuizAnswer",
     "StudentActivity",
     "Schedule",
-    "Announcement",
+    "Announcement",    "Notification",
+    "NotificationInbox",
 ]
@@ -83,6 +83,12 @@ class AssignmentSubmission(models.Model):
     end_time = models.DateTimeField(
         null=True, blank=True)  # Tambah field ini
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['assignment', 'is_draft']),
+            models.Index(fields=['student', 'assignment']),
+        ]
+
     def __str__(self):
         return f"{self.assignment.title} - {self.student.username}"
 
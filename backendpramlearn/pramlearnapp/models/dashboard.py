@@ -0,0 +1,28 @@
+from django.db import models
+from .user import CustomUser
+
+
+class TeacherDashboardSnapshot(models.Model):
+    """
+    Snapshot data dashboard teacher. Setiap bagian dashboard ditandai dirty
+    oleh signal dan dihitung ulang secara terpisah saat dashboard dibuka.
+    """
+
+    SECTIONS = ["overview", "submissions", "quizzes", "activities"]
+
+    teacher = models.OneToOneField(
+        CustomUser, on_delete=models.CASCADE, related_name="dashboard_snapshot"
+    )
+    data = models.JSONField(default=dict, blank=True)
+    overview_dirty = models.BooleanField(default=True)
+    submissions_dirty = models.BooleanField(default=True)
+    quizzes_dirty = models.BooleanField(default=True)
+    activities_dirty = models.BooleanField(default=True)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Dashboard - {self.teacher.username}"
+
+    @property
+    def dirty_sections(self):
+        return [s for s in self.SECTIONS if getattr(self, f"{s}_dirty")]
@@ -1,7 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
-from .assignment import Assignment
-from .quiz import Quiz
+from .assignment import Assignment, AssignmentSubmission
+from .quiz import Quiz, StudentQuizAttempt
+from .group import GroupQuiz
 from .material import Material
 
 User = get_user_model()
@@ -27,6 +28,7 @@ class Grade(models.Model):
     grade = models.FloatField()  # 0-100
     max_grade = models.FloatField(default=100)
     date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     teacher_feedback = models.TextField(blank=True, null=True)
 
     # Foreign keys untuk traceability
@@ -52,20 +54,61 @@ class Grade(models.Model):
         related_name='grades'
     )
 
+    # Sumber tepat grade: submission, attempt quiz individu, atau quiz kelompok
+    assignment_submission = models.ForeignKey(
+        AssignmentSubmission,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='grades'
+    )
+    quiz_attempt = models.ForeignKey(
+        StudentQuizAttempt,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='grades'
+    )
+    group_quiz = models.ForeignKey(
+        GroupQuiz,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='grades'
+    )
+
     class Meta:
         # db_table = 'grades'
         ordering = ['-date']
         indexes = [
             models.Index(fields=['student', 'type']),
             models.Index(fields=['student', 'date']),
+            models.Index(fields=['student', 'quiz', 'type']),
         ]
 
     def __str__(self):
         return f"{self.student.username} - {self.title}: {self.grade}"
 
+    @property
+    def has_source(self):
+        return bool(
+            self.assignment_submission_id or self.quiz_attempt_id or self.group_quiz_id
+        )
+
 
 class GradeStatistics(models.Model):
-    """Model untuk cache statistik grade siswa"""
+    """
+    Model untuk cache statistik grade siswa.
+
+    Selain rata-rata, model ini menyimpan akumulator (jumlah dan total per
+    tipe, per subject, per rentang nilai) serta jendela nilai terbaru untuk
+    analisis tren, sehingga grade baru cukup ditambahkan secara inkremental
+    tanpa menghitung ulang semua grade. recent_grades bernilai null berarti
+    snapshot belum pernah dibangun.
+    """
+    TREND_WINDOW = 10
+    GRADE_BANDS = [('A', 90), ('B', 80), ('C', 70), ('D', 60), ('E', None)]
+
     student = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
@@ -78,6 +121,18 @@ class GradeStatistics(models.Model):
     gpa = models.FloatField(default=0.0)  # 4.0 scale
     last_updated = models.DateTimeField(auto_now=True)
 
+    # Akumulator snapshot
+    grade_sum = models.FloatField(default=0.0)
+    quiz_sum = models.FloatField(default=0.0)
+    quiz_count = models.IntegerField(default=0)
+    assignment_sum = models.FloatField(default=0.0)
+    assignment_count = models.IntegerField(default=0)
+    perfect_count = models.IntegerField(default=0)
+    band_counts = models.JSONField(default=dict, blank=True)
+    subject_totals = models.JSONField(default=dict, blank=True)
+    recent_grades = models.JSONField(null=True, blank=True)  # terbaru dulu
+    pending_achievements = models.JSONField(default=list, blank=True)
+
     # class Meta:
     # db_table = 'grade_statistics'
 
@@ -93,36 +148,106 @@ class GradeStatistics(models.Model):
             return 1.0
         return 0.0
 
+    @property
+    def is_built(self):
+        return self.recent_grades is not None
+
+    @classmethod
+    def grade_band(cls, value):
+        for band, minimum in cls.GRADE_BANDS:
+            if minimum is None or value >= minimum:
+                return band
+
+    def reset_snapshot(self):
+        self.total_assessments = 0
+        self.grade_sum = 0.0
+        self.quiz_sum = 0.0
+        self.quiz_count = 0
+        self.assignment_sum = 0.0
+        self.assignment_count = 0
+        self.perfect_count = 0
+        self.band_counts = {band: 0 for band, _ in self.GRADE_BANDS}
+        self.subject_totals = {}
+        self.recent_grades = []
+
+    def accumulate(self, value, grade_type, subject_name):
+        """Tambahkan satu nilai ke akumulator (tanpa menyimpan)"""
+        self.total_assessments += 1
+        self.grade_sum += value
+        if grade_type == 'quiz':
+            self.quiz_sum += value
+            self.quiz_count += 1
+        elif grade_type == 'assignment':
+            self.assignment_sum += value
+            self.assignment_count += 1
+        if value == 100:
+            self.perfect_count += 1
+        band = self.grade_band(value)
+        self.band_counts[band] = self.band_counts.get(band, 0) + 1
+
+        subject = self.subject_totals.setdefault(subject_name, {
+            'sum': 0.0, 'count': 0,
+            'quiz_sum': 0.0, 'quiz_count': 0,
+            'assignment_sum': 0.0, 'assignment_count': 0,
+        })
+        subject['sum'] += value
+        subject['count'] += 1
+        if grade_type in ('quiz', 'assignment'):
+            subject[f'{grade_type}_sum'] += value
+            subject[f'{grade_type}_count'] += 1
+
+    def refresh_averages(self):
+        total = self.total_assessments
+        self.average_grade = self.grade_sum / total if total else 0.0
+        self.quiz_average = (
+            self.quiz_sum / self.quiz_count if self.quiz_count else 0.0
+        )
+        self.assignment_average = (
+            self.assignment_sum / self.assignment_count
+            if self.assignment_count else 0.0
+        )
+        self.gpa = self.calculate_gpa() if total else 0.0
+
     def update_statistics(self):
-        """Update semua statistik dari grades siswa"""
-        grades = Grade.objects.filter(student=self.student)
-
-        if grades.exists():
-            self.total_assessments = grades.count()
-            self.average_grade = grades.aggregate(
-                avg=models.Avg('grade')
-            )['avg'] or 0.0
-
-            quiz_grades = grades.filter(type='quiz')
-            self.quiz_average = quiz_grades.aggregate(
-                avg=models.Avg('grade')
-            )['avg'] or 0.0
-
-            assignment_grades = grades.filter(type='assignment')
-            self.assignment_average = assignment_grades.aggregate(
-                avg=models.Avg('grade')
-            )['avg'] or 0.0
-
-            self.gpa = self.calculate_gpa()
-        else:
-            self.total_assessments = 0
-            self.average_grade = 0.0
-            self.quiz_average = 0.0
-            self.assignment_average = 0.0
-            self.gpa = 0.0
+        """Bangun ulang seluruh snapshot dari grades siswa (satu query)"""
+        self.reset_snapshot()
+        rows = Grade.objects.filter(student=self.student).order_by(
+            '-date', '-id'
+        ).values_list('grade', 'type', 'subject_name')
+        for value, grade_type, subject_name in rows:
+            self.accumulate(value, grade_type, subject_name)
+            if len(self.recent_grades) < self.TREND_WINDOW:
+                self.recent_grades.append(value)
+        self.refresh_averages()
+        self.save()
 
+    def add_grade(self, grade):
+        """Tambahkan grade baru (terbaru) ke snapshot secara inkremental"""
+        if not self.is_built:
+            return self.update_statistics()
+        self.accumulate(grade.grade, grade.type, grade.subject_name)
+        self.recent_grades = (
+            [grade.grade] + self.recent_grades
+        )[:self.TREND_WINDOW]
+        self.refresh_averages()
         self.save()
 
+    def pass_rate(self):
+        """Persentase grade >= 60"""
+        if not self.total_assessments:
+            return 0.0
+        passing = self.total_assessments - self.band_counts.get('E', 0)
+        return round((passing / self.total_assessments) * 100, 1)
+
+    def grade_distribution(self):
+        """Distribusi grade A-E dalam persen"""
+        total = self.total_assessments
+        return {
+            band: round((self.band_counts.get(band, 0) / total) * 100, 1)
+            if total else 0
+            for band, _ in self.GRADE_BANDS
+        }
+
 
 class Achievement(models.Model):
     """Model untuk achievement/badge siswa"""
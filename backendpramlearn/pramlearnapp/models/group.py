@@ -144,6 +144,9 @@ class GroupQuizSubmission(models.Model):
     class Meta:
         # One answer per question per group
         unique_together = ("group_quiz", "question")
+        indexes = [
+            models.Index(fields=["group_quiz", "is_correct"]),
+        ]
 
     def save(self, *args, **kwargs):
         # Auto-calculate if correct
@@ -188,9 +191,20 @@ class GroupChat(models.Model):
     message = models.TextField()
     created_at = models.DateTimeField(default=timezone.now)
     is_read = models.BooleanField(default=False)
+    # Id pesan dari client (pengiriman lewat WebSocket), untuk ack dan
+    # mencegah pesan ganda saat client mengirim ulang
+    client_id = models.CharField(max_length=64, null=True, blank=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["group", "created_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["sender", "client_id"], name="unique_group_chat_client_id"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.sender.username}: {self.message[:50]}..."
@@ -205,3 +219,23 @@ class GroupChatRead(models.Model):
 
     class Meta:
         unique_together = ("chat", "user")
+
+
+class GroupChatReadState(models.Model):
+    """Penanda pesan terakhir yang sudah dibaca user di chat kelompok"""
+
+    group = models.ForeignKey(
+        Group, on_delete=models.CASCADE, related_name="chat_read_states"
+    )
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    last_read_message = models.ForeignKey(
+        GroupChat, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    last_read_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("group", "user")
+
+    def __str__(self):
+        return f"{self.user.username} - {self.group.name}: {self.last_read_message_id}"
@@ -0,0 +1,71 @@
+from django.db import models
+from .user import CustomUser
+from .announcement import Announcement
+
+
+class Notification(models.Model):
+    """
+    Isi notifikasi, disimpan sekali untuk semua penerimanya. Status per
+    penerima disimpan di NotificationInbox.
+    """
+    TYPE_CHOICES = [
+        ('info', 'Info'),
+        ('grade', 'Grade'),
+        ('deadline', 'Deadline'),
+        ('announcement', 'Announcement'),
+    ]
+
+    type = models.CharField(max_length=20, choices=TYPE_CHOICES, default='info')
+    title = models.CharField(max_length=255)
+    message = models.TextField(blank=True)
+    link = models.CharField(max_length=255, blank=True)
+    data = models.JSONField(default=dict, blank=True)
+    announcement = models.ForeignKey(
+        Announcement,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='notifications'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-id']
+
+    def __str__(self):
+        return self.title
+
+
+class NotificationInbox(models.Model):
+    """
+    Baris inbox ringkas per penerima: user, notifikasi, dan waktu dibaca.
+    Id notifikasi yang naik terus dipakai sebagai cursor catch-up.
+    """
+    user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='notification_inbox'
+    )
+    notification = models.ForeignKey(
+        Notification,
+        on_delete=models.CASCADE,
+        related_name='inbox'
+    )
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'notification'], name='unique_notification_inbox'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'read_at']),
+        ]
+
+    @property
+    def is_read(self):
+        return self.read_at is not None
+
+    def __str__(self):
+        return f"{self.user.username} - {self.notification.title}"
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from .user import CustomUser
 
 
@@ -10,6 +11,7 @@ class StudentActivity(models.Model):
         ('material', 'Material'),
         ('assignment', 'Assignment'),
         ('quiz', 'Quiz'),
+        ('group_quiz', 'Group Quiz'),
         # Tambahkan tipe lain jika perlu
     ]
     student = models.ForeignKey(
@@ -18,9 +20,19 @@ class StudentActivity(models.Model):
         max_length=20, choices=ACTIVITY_TYPE_CHOICES)
     title = models.CharField(max_length=255)
     # description = models.TextField(blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # default (bukan auto_now_add) agar entri yang ditulis lewat buffer
+    # tetap menyimpan waktu kejadian, bukan waktu flush
+    timestamp = models.DateTimeField(default=timezone.now)
     # opsional, untuk relasi ke materi/tugas/quiz
     related_object_id = models.IntegerField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Aktivitas terbaru per siswa (dashboard, detail kelas)
+            models.Index(fields=['student', '-timestamp']),
+            # Retensi: hapus/arsipkan entri lama
+            models.Index(fields=['timestamp']),
+        ]
+
     def __str__(self):
         return f"{self.student.username} - {self.activity_type} - {self.title}"
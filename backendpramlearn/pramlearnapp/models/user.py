@@ -47,6 +47,11 @@ class StudentMotivationProfile(models.Model):
         default=None
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['motivation_level']),
+        ]
+
     def __str__(self):
         level = self.motivation_level or "Belum Dianalisis"
         return f"{self.student.username} - {level}"
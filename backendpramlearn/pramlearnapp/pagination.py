@@ -0,0 +1,28 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OptionalCursorPagination(CursorPagination):
+    """
+    Cursor pagination yang hanya aktif jika client mengirim ?cursor= atau
+    ?page_size=. Tanpa parameter tersebut response tetap berupa list biasa
+    sehingga frontend yang ada tidak berubah.
+
+    Urutan cursor diambil dari atribut cursor_ordering pada view
+    (default "pk").
+    """
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = "pk"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "cursor_ordering", None) or self.ordering
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
@@ -42,31 +42,11 @@ class GradeStatisticsSerializer(serializers.ModelSerializer):
 
     def get_pass_rate(self, obj):
         """Calculate pass rate (grades >= 60)"""
-        total_grades = Grade.objects.filter(student=obj.student)
-        if not total_grades.exists():
-            return 0.0
-
-        passing_grades = total_grades.filter(grade__gte=60)
-        return round((passing_grades.count() / total_grades.count()) * 100, 1)
+        return obj.pass_rate()
 
     def get_grade_distribution(self, obj):
         """Calculate grade distribution A, B, C, D, E"""
-        grades = Grade.objects.filter(student=obj.student)
-        total = grades.count()
-
-        if total == 0:
-            return {'A': 0, 'B': 0, 'C': 0, 'D': 0, 'E': 0}
-
-        distribution = {
-            'A': grades.filter(grade__gte=90).count(),
-            'B': grades.filter(grade__gte=80, grade__lt=90).count(),
-            'C': grades.filter(grade__gte=70, grade__lt=80).count(),
-            'D': grades.filter(grade__gte=60, grade__lt=70).count(),
-            'E': grades.filter(grade__lt=60).count(),
-        }
-
-        # Convert to percentages
-        return {k: round((v / total) * 100, 1) for k, v in distribution.items()}
+        return obj.grade_distribution()
 
 
 class AchievementSerializer(serializers.ModelSerializer):
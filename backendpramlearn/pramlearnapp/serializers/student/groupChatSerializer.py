@@ -18,6 +18,7 @@ class GroupChatSerializer(serializers.ModelSerializer):
             "sender_username",
             "sender_id",
             "is_current_user",
+            "client_id",
         ]
 
     def get_is_current_user(self, obj):
@@ -5,6 +5,18 @@ from .group_quality_service import GroupQualityService
 from .arcs_clustering_pdf_service import ARCSClusteringPDFService
 from .gradeService import GradeService
 from .group_formation_pdf_service import GroupFormationPDFService
+from .assignment_analytics_service import AssignmentAnalyticsService
+from .teacher_dashboard_service import TeacherDashboardService
+from .presence_service import PresenceService
+from .attendance_service import AttendanceService
+from .subject_analytics_service import SubjectAnalyticsService
+from .arcs_analytics_service import ARCSAnalyticsService
+from .grade_source_service import GradeSourceService
+from .report_artifact_service import ReportArtifactService
+from .gradebook_export_service import GradebookExportService
+from .chat_buffer_service import ChatWriteBuffer
+from .notification_service import NotificationService
+from .activity_log_service import ActivityLogService
 
 __all__ = [
     "GroupFormationService",
@@ -14,4 +26,16 @@ __all__ = [
     "ARCSClusteringPDFService",
     "GradeService",
     "GroupFormationPDFService",
+    "AssignmentAnalyticsService",
+    "TeacherDashboardService",
+    "PresenceService",
+    "AttendanceService",
+    "SubjectAnalyticsService",
+    "ARCSAnalyticsService",
+    "GradeSourceService",
+    "ReportArtifactService",
+    "GradebookExportService",
+    "ChatWriteBuffer",
+    "NotificationService",
+    "ActivityLogService",
 ]
@@ -0,0 +1,226 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+import atexit
+import csv
+import gzip
+import io
+import logging
+import tempfile
+import threading
+
+from ..models import StudentActivity
+from ..utils.cache import invalidate_tags, student_tag
+from .teacher_dashboard_service import (
+    mark_teacher_dashboards_dirty,
+    teacher_ids_for_students,
+)
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = "archives/student_activity"
+PRUNE_BATCH_SIZE = 5000
+ARCHIVE_FIELDS = [
+    "id",
+    "student_id",
+    "activity_type",
+    "title",
+    "related_object_id",
+    "timestamp",
+]
+
+
+def persist_activities(activities):
+    """
+    Simpan batch StudentActivity dengan satu bulk_create. bulk_create tidak
+    memicu signal, sehingga cache siswa terkait dan section activities
+    dashboard guru ditandai kedaluwarsa di sini.
+    """
+    if not activities:
+        return []
+    StudentActivity.objects.bulk_create(activities)
+    student_ids = {a.student_id for a in activities}
+    invalidate_tags(*[student_tag(student_id) for student_id in student_ids])
+    mark_teacher_dashboards_dirty(teacher_ids_for_students(student_ids), "activities")
+    return activities
+
+
+class ActivityLogBuffer:
+    """
+    Write-behind buffer untuk log aktivitas siswa.
+
+    Entri dikumpulkan di memori dan ditulis oleh satu thread latar dengan
+    bulk_create setiap ACTIVITY_LOG_FLUSH_INTERVAL detik, atau lebih cepat
+    saat jumlahnya mencapai ACTIVITY_LOG_BATCH_SIZE, sehingga submit
+    quiz/assignment tidak menunggu insert log. Sisa entri ditulis saat
+    proses berhenti normal; entri yang belum di-flush hilang jika proses
+    mati mendadak (log aktivitas bersifat best-effort).
+    """
+
+    def __init__(self, interval=None, batch_size=None):
+        self.interval = (
+            interval
+            if interval is not None
+            else getattr(settings, "ACTIVITY_LOG_FLUSH_INTERVAL", 2)
+        )
+        self.batch_size = batch_size or getattr(
+            settings, "ACTIVITY_LOG_BATCH_SIZE", 200
+        )
+        self.pending = []
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+
+    def add(self, activity):
+        with self.lock:
+            self.pending.append(activity)
+            full = len(self.pending) >= self.batch_size
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name="activity-log", daemon=True
+                )
+                self.thread.start()
+        if full:
+            self.wakeup.set()
+
+    def run(self):
+        try:
+            while True:
+                self.wakeup.wait(self.interval)
+                self.wakeup.clear()
+                self.flush()
+        finally:
+            connection.close()
+
+    def flush(self):
+        # Thread ini berumur panjang: buang koneksi yang melewati
+        # CONN_MAX_AGE atau rusak sebelum menulis, seperti awal request
+        close_old_connections()
+        with self.lock:
+            batch, self.pending = self.pending, []
+        for start in range(0, len(batch), self.batch_size):
+            chunk = batch[start : start + self.batch_size]
+            try:
+                persist_activities(chunk)
+            except Exception as e:
+                logger.error(f"Error saving {len(chunk)} student activities: {e}")
+        return len(batch)
+
+
+_buffer = ActivityLogBuffer()
+atexit.register(_buffer.flush)
+
+
+class ActivityLogService:
+    """
+    Pencatatan aktivitas siswa (asinkron) dan retensi log.
+
+    record() mengantrekan entri ke ActivityLogBuffer setelah transaksi
+    commit, jadi aktivitas dari submit yang di-rollback tidak tercatat.
+    Entri yang lebih tua dari ACTIVITY_RETENTION_DAYS dihapus per batch
+    oleh prune(), opsional diarsipkan dulu sebagai CSV (gzip) di storage.
+    """
+
+    buffer = _buffer
+
+    @classmethod
+    def record(
+        cls, student, activity_type, title, related_object_id=None, timestamp=None
+    ):
+        activity = StudentActivity(
+            student_id=getattr(student, "pk", student),
+            activity_type=activity_type,
+            title=title[:255],
+            related_object_id=related_object_id,
+            timestamp=timestamp or timezone.now(),
+        )
+        transaction.on_commit(lambda: cls.buffer.add(activity))
+        return activity
+
+    @classmethod
+    def flush(cls):
+        """Tulis semua entri yang masih di buffer. Return jumlah entri."""
+        return cls.buffer.flush()
+
+    @staticmethod
+    def retention_cutoff(days=None):
+        if days is None:
+            days = getattr(settings, "ACTIVITY_RETENTION_DAYS", 365)
+        return timezone.now() - timedelta(days=days)
+
+    @staticmethod
+    def iter_batches(queryset, fields, batch_size):
+        """Baris queryset per batch dengan keyset pagination pada id"""
+        last_id = 0
+        while True:
+            rows = list(
+                queryset.filter(id__gt=last_id)
+                .order_by("id")
+                .values(*fields)[:batch_size]
+            )
+            if not rows:
+                return
+            last_id = rows[-1]["id"]
+            yield rows
+
+    @classmethod
+    def archive(cls, queryset, cutoff, batch_size=PRUNE_BATCH_SIZE):
+        """
+        Tulis entri queryset sebagai CSV gzip ke default_storage. Return
+        (path, id terakhir yang diarsipkan) atau (None, None) jika kosong.
+        """
+        last_id = None
+        with tempfile.TemporaryFile() as archive_file:
+            with gzip.GzipFile(fileobj=archive_file, mode="wb") as gz:
+                text = io.TextIOWrapper(gz, encoding="utf-8", newline="")
+                writer = csv.writer(text)
+                writer.writerow(ARCHIVE_FIELDS)
+                for rows in cls.iter_batches(queryset, ARCHIVE_FIELDS, batch_size):
+                    for row in rows:
+                        row["timestamp"] = row["timestamp"].isoformat()
+                        writer.writerow([row[field] for field in ARCHIVE_FIELDS])
+                    last_id = rows[-1]["id"]
+                text.flush()
+                text.detach()
+            if last_id is None:
+                return None, None
+            archive_file.seek(0)
+            path = default_storage.save(
+                f"{ARCHIVE_DIR}/student-activity-before-{cutoff:%Y%m%d}.csv.gz",
+                File(archive_file),
+            )
+        return path, last_id
+
+    @classmethod
+    def prune(cls, cutoff, archive=False, batch_size=PRUNE_BATCH_SIZE):
+        """
+        Hapus aktivitas dengan timestamp < cutoff per batch (urut id) agar
+        tidak mengunci tabel lama. Jika archive, semua entri ditulis dulu ke
+        arsip dan hanya entri yang sudah diarsipkan yang dihapus.
+        Return (jumlah dihapus, path arsip).
+        """
+        old = StudentActivity.objects.filter(timestamp__lt=cutoff)
+        path = None
+        if archive:
+            path, last_id = cls.archive(old, cutoff, batch_size)
+            if last_id is None:
+                return 0, None
+            old = old.filter(id__lte=last_id)
+
+        deleted = 0
+        for rows in cls.iter_batches(old, ["id", "student_id"], batch_size):
+            with transaction.atomic():
+                # Satu DELETE per batch tanpa memuat objek dan tanpa signal
+                # per baris; efek signal dijalankan sekali per batch di bawah
+                deleted += StudentActivity.objects.filter(
+                    id__in=[row["id"] for row in rows]
+                )._raw_delete(StudentActivity.objects.db)
+            student_ids = {row["student_id"] for row in rows}
+            invalidate_tags(*[student_tag(student_id) for student_id in student_ids])
+            mark_teacher_dashboards_dirty(
+                teacher_ids_for_students(student_ids), "activities"
+            )
+        return deleted, path
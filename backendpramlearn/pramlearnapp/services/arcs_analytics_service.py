@@ -0,0 +1,173 @@
+from collections import defaultdict
+from django.conf import settings
+from django.db.models import Count
+import logging
+
+import numpy as np
+
+from ..models import ARCSQuestion, ARCSAnswer
+from ..utils.cache import get_or_set_tagged, arcs_questionnaire_tag
+
+logger = logging.getLogger(__name__)
+
+
+def cronbach_alpha(matrix):
+    """
+    Cronbach's alpha untuk matriks jawaban (baris = responden, kolom = item).
+    Return None jika item < 2, responden < 2, atau varians total nol.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    if matrix.ndim != 2 or matrix.shape[0] < 2 or matrix.shape[1] < 2:
+        return None
+    k = matrix.shape[1]
+    item_variances = matrix.var(axis=0, ddof=1)
+    total_variance = matrix.sum(axis=1).var(ddof=1)
+    if total_variance == 0:
+        return None
+    return float(k / (k - 1) * (1 - item_variances.sum() / total_variance))
+
+
+class ARCSAnalyticsService:
+    """
+    Analisis dimensi ARCS untuk satu kuesioner: rata-rata, jumlah jawaban,
+    standar deviasi, rata-rata per pertanyaan, histogram Likert, dan
+    Cronbach's alpha per dimensi.
+
+    Statistik dan histogram berasal dari satu query GROUP BY
+    (pertanyaan, nilai Likert); alpha dihitung dengan NumPy dari matriks
+    jawaban responden x item. Hasil di-cache per kuesioner dan diinvalidasi
+    saat ada response yang selesai atau pertanyaan berubah.
+    """
+
+    def __init__(self, questionnaire):
+        self.questionnaire = questionnaire
+
+    def get_dimension_statistics(self):
+        return get_or_set_tagged(
+            f"arcs-analytics:{self.questionnaire.id}",
+            [arcs_questionnaire_tag(self.questionnaire.id)],
+            self.compute_dimension_statistics,
+            timeout=getattr(settings, "ARCS_ANALYTICS_CACHE_TIMEOUT", 3600),
+        )
+
+    def completed_likert_answers(self):
+        return ARCSAnswer.objects.filter(
+            question__questionnaire=self.questionnaire,
+            response__is_completed=True,
+            likert_value__isnull=False,
+        )
+
+    def compute_dimension_statistics(self):
+        questions = list(
+            ARCSQuestion.objects.filter(questionnaire=self.questionnaire).values(
+                "id", "order", "text", "dimension", "scale_min", "scale_max"
+            )
+        )
+
+        # {question_id: {likert_value: jumlah}}
+        histograms = defaultdict(dict)
+        for row in (
+            self.completed_likert_answers()
+            .values("question_id", "likert_value")
+            .annotate(n=Count("id"))
+        ):
+            histograms[row["question_id"]][row["likert_value"]] = row["n"]
+
+        alphas = self.dimension_alphas(questions)
+
+        dimension_stats = {}
+        for dimension, _ in ARCSQuestion.ARCS_DIMENSIONS:
+            dimension_questions = [q for q in questions if q["dimension"] == dimension]
+            if not dimension_questions:
+                continue
+
+            dimension_histogram = defaultdict(int)
+            for value in range(
+                min(q["scale_min"] for q in dimension_questions),
+                max(q["scale_max"] for q in dimension_questions) + 1,
+            ):
+                dimension_histogram[value] = 0
+
+            question_stats = []
+            for question in dimension_questions:
+                histogram = histograms.get(question["id"], {})
+                values = np.array(list(histogram.keys()), dtype=float)
+                counts = np.array(list(histogram.values()), dtype=float)
+                total = int(counts.sum())
+                for value, n in histogram.items():
+                    dimension_histogram[value] += n
+                question_stats.append(
+                    {
+                        "question_id": question["id"],
+                        "order": question["order"],
+                        "text": question["text"],
+                        "average_score": (
+                            round(float(np.average(values, weights=counts)), 2)
+                            if total
+                            else 0
+                        ),
+                        "total_responses": total,
+                    }
+                )
+
+            values = np.array(list(dimension_histogram.keys()), dtype=float)
+            counts = np.array(list(dimension_histogram.values()), dtype=float)
+            total = int(counts.sum())
+            if total:
+                mean = float(np.average(values, weights=counts))
+                std_dev = float(
+                    np.sqrt(np.average((values - mean) ** 2, weights=counts))
+                )
+            else:
+                mean = std_dev = 0
+
+            alpha = alphas.get(dimension)
+            dimension_stats[dimension] = {
+                "average_score": round(mean, 2),
+                "total_responses": total,
+                "questions_count": len(dimension_questions),
+                "std_dev": round(std_dev, 2),
+                "histogram": {
+                    str(value): n for value, n in sorted(dimension_histogram.items())
+                },
+                "questions": question_stats,
+                "cronbach_alpha": round(alpha, 3) if alpha is not None else None,
+            }
+
+        return dimension_stats
+
+    def dimension_alphas(self, questions):
+        """Cronbach's alpha per dimensi dari responden yang menjawab semua item"""
+        question_ids = [q["id"] for q in questions]
+        if not question_ids:
+            return {}
+        column = {question_id: i for i, question_id in enumerate(question_ids)}
+
+        rows = list(
+            self.completed_likert_answers().values_list(
+                "response_id", "question_id", "likert_value"
+            )
+        )
+        if not rows:
+            return {}
+
+        response_index = {}
+        for response_id, _, _ in rows:
+            response_index.setdefault(response_id, len(response_index))
+
+        # Matriks responden x item, NaN untuk item yang tidak dijawab
+        matrix = np.full((len(response_index), len(question_ids)), np.nan)
+        for response_id, question_id, value in rows:
+            matrix[response_index[response_id], column[question_id]] = value
+
+        alphas = {}
+        for dimension, _ in ARCSQuestion.ARCS_DIMENSIONS:
+            columns = [
+                column[q["id"]] for q in questions if q["dimension"] == dimension
+            ]
+            if len(columns) < 2:
+                continue
+            sub = matrix[:, columns]
+            complete = sub[~np.isnan(sub).any(axis=1)]
+            alphas[dimension] = cronbach_alpha(complete)
+        return alphas
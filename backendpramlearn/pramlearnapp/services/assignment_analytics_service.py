@@ -0,0 +1,470 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Avg, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from datetime import timedelta
+import numpy as np
+import logging
+
+from ..models import (
+    Assignment,
+    AssignmentQuestion,
+    AssignmentSubmission,
+    AssignmentAnswer,
+    ClassStudent,
+)
+
+logger = logging.getLogger(__name__)
+
+PASSING_GRADE = 70
+ANALYTICS_CACHE_PREFIX = "assignment_analytics"
+
+
+def assignment_analytics_cache_key(assignment_id):
+    return f"{ANALYTICS_CACHE_PREFIX}:{assignment_id}"
+
+
+def invalidate_assignment_analytics(assignment_id):
+    """Hapus cache analytics untuk satu assignment"""
+    cache.delete(assignment_analytics_cache_key(assignment_id))
+
+
+class AssignmentAnalyticsService:
+    """
+    Service untuk analytics assignment per material.
+
+    Statistik mentah dihitung dengan agregasi SQL per assignment lalu diolah
+    dengan NumPy. Hasil per assignment disimpan di cache dan dihapus oleh
+    signal setiap ada submission/jawaban/soal yang berubah.
+    """
+
+    def __init__(self, material, class_obj=None):
+        self.material = material
+        self.class_obj = class_obj
+        self.cache_timeout = getattr(
+            settings, "ASSIGNMENT_ANALYTICS_CACHE_TIMEOUT", 60 * 60
+        )
+        self._assignments = None
+        self._student_ids = None
+
+    # ------------------------------------------------------------------
+    # Data dasar
+    # ------------------------------------------------------------------
+
+    @property
+    def assignments(self):
+        if self._assignments is None:
+            self._assignments = list(
+                Assignment.objects.filter(material=self.material).order_by(
+                    "due_date", "id"
+                )
+            )
+        return self._assignments
+
+    @property
+    def student_ids(self):
+        """ID siswa di kelas (kosong jika class_obj tidak diberikan)"""
+        if self._student_ids is None:
+            if self.class_obj is None:
+                self._student_ids = []
+            else:
+                self._student_ids = list(
+                    ClassStudent.objects.filter(class_id=self.class_obj)
+                    .values_list("student_id", flat=True)
+                    .distinct()
+                )
+        return self._student_ids
+
+    def submission_summary(self, assignment_ids):
+        """
+        Statistik submission semua assignment dalam satu query GROUP BY.
+        Return dict {assignment_id: {...}}
+        """
+        recent_since = timezone.now() - timedelta(hours=24)
+        rows = (
+            AssignmentSubmission.objects.filter(
+                assignment_id__in=assignment_ids, is_draft=False
+            )
+            .values("assignment_id")
+            .annotate(
+                total_submissions=Count("id"),
+                graded_submissions=Count("id", filter=Q(grade__isnull=False)),
+                pending_submissions=Count("id", filter=Q(grade__isnull=True)),
+                average_grade=Avg("grade"),
+                recent_submissions=Count(
+                    "id", filter=Q(submission_date__gte=recent_since)
+                ),
+            )
+        )
+        summary = {row["assignment_id"]: row for row in rows}
+
+        question_counts = dict(
+            AssignmentQuestion.objects.filter(assignment_id__in=assignment_ids)
+            .values("assignment_id")
+            .annotate(n=Count("id"))
+            .values_list("assignment_id", "n")
+        )
+
+        result = {}
+        for assignment_id in assignment_ids:
+            row = summary.get(assignment_id, {})
+            result[assignment_id] = {
+                "question_count": question_counts.get(assignment_id, 0),
+                "total_submissions": row.get("total_submissions", 0),
+                "graded_submissions": row.get("graded_submissions", 0),
+                "pending_submissions": row.get("pending_submissions", 0),
+                "average_grade": row.get("average_grade") or 0,
+                "recent_submissions": row.get("recent_submissions", 0),
+            }
+        return result
+
+    # ------------------------------------------------------------------
+    # Analytics per assignment (di-cache)
+    # ------------------------------------------------------------------
+
+    def get_assignment_analytics(self, assignment):
+        """Ambil analytics satu assignment dari cache, hitung ulang jika tidak ada"""
+        key = assignment_analytics_cache_key(assignment.id)
+        data = cache.get(key)
+        if data is None:
+            data = self.compute_assignment_analytics(assignment)
+            cache.set(key, data, self.cache_timeout)
+        return data
+
+    def compute_assignment_analytics(self, assignment):
+        submissions = list(
+            AssignmentSubmission.objects.filter(
+                assignment=assignment, is_draft=False
+            ).values_list("id", "student_id", "grade", "submission_date")
+        )
+
+        student_grades = {}
+        submission_dates = []
+        late_count = 0
+        for _, student_id, grade, submission_date in submissions:
+            student_grades[student_id] = grade
+            if submission_date:
+                submission_dates.append(submission_date)
+                if assignment.due_date and submission_date > assignment.due_date:
+                    late_count += 1
+
+        grades = np.array(
+            [g for g in student_grades.values() if g is not None], dtype=float
+        )
+
+        daily = (
+            AssignmentSubmission.objects.filter(assignment=assignment, is_draft=False)
+            .annotate(day=TruncDate("submission_date"))
+            .values("day")
+            .annotate(count=Count("id"))
+            .order_by("day")
+        )
+
+        return {
+            "assignment_id": assignment.id,
+            "title": assignment.title,
+            "due_date": (
+                assignment.due_date.isoformat() if assignment.due_date else None
+            ),
+            "total_submissions": len(submissions),
+            "late_submissions": late_count,
+            "grade_stats": self._describe(grades),
+            "student_grades": student_grades,
+            "daily_submissions": [
+                {"date": row["day"].isoformat(), "count": row["count"]}
+                for row in daily
+                if row["day"]
+            ],
+            "questions": self._analyze_questions(assignment, submissions),
+        }
+
+    def _analyze_questions(self, assignment, submissions):
+        """Tingkat kesulitan dan daya beda setiap soal"""
+        questions = list(
+            AssignmentQuestion.objects.filter(assignment=assignment).order_by("id")
+        )
+        if not questions:
+            return []
+
+        answer_stats = {
+            row["question_id"]: row
+            for row in AssignmentAnswer.objects.filter(
+                submission__assignment=assignment, submission__is_draft=False
+            )
+            .values("question_id")
+            .annotate(
+                answered=Count("id"),
+                correct=Count("id", filter=Q(is_correct=True)),
+            )
+        }
+
+        choice_distribution = {}
+        for row in (
+            AssignmentAnswer.objects.filter(
+                submission__assignment=assignment,
+                submission__is_draft=False,
+                selected_choice__isnull=False,
+            )
+            .values("question_id", "selected_choice")
+            .annotate(count=Count("id"))
+        ):
+            choice_distribution.setdefault(row["question_id"], {})[
+                row["selected_choice"]
+            ] = row["count"]
+
+        # Matriks benar/salah: baris = submission, kolom = soal
+        submission_index = {sub[0]: i for i, sub in enumerate(submissions)}
+        question_index = {q.id: j for j, q in enumerate(questions)}
+        matrix = np.zeros((len(submission_index), len(question_index)), dtype=float)
+        for submission_id, question_id, is_correct in AssignmentAnswer.objects.filter(
+            submission_id__in=list(submission_index), is_correct=True
+        ).values_list("submission_id", "question_id", "is_correct"):
+            if question_id in question_index:
+                matrix[submission_index[submission_id], question_index[question_id]] = 1
+
+        totals = matrix.sum(axis=1)
+
+        results = []
+        for question in questions:
+            stats = answer_stats.get(question.id, {})
+            answered = stats.get("answered", 0)
+            correct = stats.get("correct", 0)
+            is_objective = bool(question.correct_choice)
+
+            difficulty = None
+            discrimination = None
+            if is_objective and answered > 0:
+                difficulty = correct / answered
+                discrimination = self._point_biserial(
+                    matrix[:, question_index[question.id]], totals
+                )
+
+            results.append(
+                {
+                    "question_id": question.id,
+                    "text": question.text,
+                    "correct_choice": question.correct_choice,
+                    "answered": answered,
+                    "correct": correct,
+                    "difficulty_index": (
+                        round(difficulty, 3) if difficulty is not None else None
+                    ),
+                    "difficulty_level": self._difficulty_level(difficulty),
+                    "discrimination_index": (
+                        round(discrimination, 3)
+                        if discrimination is not None
+                        else None
+                    ),
+                    "choice_distribution": choice_distribution.get(question.id, {}),
+                }
+            )
+        return results
+
+    # ------------------------------------------------------------------
+    # Analytics per material (komposisi dari cache per assignment)
+    # ------------------------------------------------------------------
+
+    def get_performance_trend(self):
+        """Statistik nilai setiap assignment berurutan berdasarkan due date"""
+        trend = []
+        for assignment in self.assignments:
+            data = self.get_assignment_analytics(assignment)
+            trend.append(
+                {
+                    "assignment_id": data["assignment_id"],
+                    "title": data["title"],
+                    "due_date": data["due_date"],
+                    **data["grade_stats"],
+                }
+            )
+
+        averages = np.array(
+            [t["average"] for t in trend if t["count"] > 0], dtype=float
+        )
+        slope = self._slope(averages)
+        return {
+            "assignments": trend,
+            "slope": round(slope, 2) if slope is not None else None,
+            "direction": self._direction(slope),
+        }
+
+    def get_question_analysis(self):
+        """Analisis soal untuk semua assignment"""
+        return [
+            {
+                "assignment_id": assignment.id,
+                "title": assignment.title,
+                "questions": self.get_assignment_analytics(assignment)["questions"],
+            }
+            for assignment in self.assignments
+        ]
+
+    def get_student_performance(self):
+        """Rata-rata, kelengkapan, dan tren nilai setiap siswa di kelas"""
+        per_assignment = [
+            self.get_assignment_analytics(assignment)
+            for assignment in self.assignments
+        ]
+        total_assignments = len(per_assignment)
+
+        student_ids = self.student_ids or sorted(
+            {sid for data in per_assignment for sid in data["student_grades"]}
+        )
+        if not student_ids:
+            return []
+
+        from ..models import CustomUser
+
+        students = {
+            s["id"]: s
+            for s in CustomUser.objects.filter(id__in=student_ids).values(
+                "id", "username", "first_name", "last_name"
+            )
+        }
+
+        # Matriks nilai: baris = siswa, kolom = assignment (NaN = belum dinilai)
+        grade_matrix = np.full((len(student_ids), total_assignments), np.nan)
+        submitted_matrix = np.zeros((len(student_ids), total_assignments), dtype=bool)
+        for j, data in enumerate(per_assignment):
+            student_grades = data["student_grades"]
+            for i, student_id in enumerate(student_ids):
+                if student_id in student_grades:
+                    submitted_matrix[i, j] = True
+                    grade = student_grades[student_id]
+                    if grade is not None:
+                        grade_matrix[i, j] = grade
+
+        results = []
+        for i, student_id in enumerate(student_ids):
+            student = students.get(student_id)
+            if not student:
+                continue
+            row = grade_matrix[i]
+            graded = row[~np.isnan(row)]
+            slope = self._slope(graded)
+            submitted = int(submitted_matrix[i].sum())
+            results.append(
+                {
+                    "student_id": student_id,
+                    "username": student["username"],
+                    "full_name": f"{student['first_name']} {student['last_name']}".strip()
+                    or student["username"],
+                    "submitted": submitted,
+                    "missing": total_assignments - submitted,
+                    "completion_rate": (
+                        round(submitted / total_assignments * 100, 1)
+                        if total_assignments
+                        else 0
+                    ),
+                    "average_grade": (
+                        round(float(graded.mean()), 1) if graded.size else None
+                    ),
+                    "latest_grade": (
+                        round(float(graded[-1]), 1) if graded.size else None
+                    ),
+                    "slope": round(slope, 2) if slope is not None else None,
+                    "trend": self._direction(slope),
+                }
+            )
+
+        results.sort(
+            key=lambda r: (r["average_grade"] is None, -(r["average_grade"] or 0))
+        )
+        return results
+
+    def get_submission_timeline(self):
+        """Jumlah submission per hari dan submission rate kumulatif"""
+        expected = len(self.student_ids)
+        timeline = []
+        for assignment in self.assignments:
+            data = self.get_assignment_analytics(assignment)
+            counts = np.array(
+                [d["count"] for d in data["daily_submissions"]], dtype=int
+            )
+            cumulative = np.cumsum(counts) if counts.size else counts
+            timeline.append(
+                {
+                    "assignment_id": data["assignment_id"],
+                    "title": data["title"],
+                    "due_date": data["due_date"],
+                    "late_submissions": data["late_submissions"],
+                    "series": [
+                        {
+                            "date": day["date"],
+                            "count": int(counts[k]),
+                            "cumulative": int(cumulative[k]),
+                            "submission_rate": (
+                                round(float(cumulative[k]) / expected * 100, 1)
+                                if expected
+                                else 0
+                            ),
+                        }
+                        for k, day in enumerate(data["daily_submissions"])
+                    ],
+                }
+            )
+        return timeline
+
+    # ------------------------------------------------------------------
+    # Helper statistik
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _describe(grades):
+        if grades.size == 0:
+            return {
+                "count": 0,
+                "average": 0,
+                "median": 0,
+                "std_dev": 0,
+                "min": 0,
+                "max": 0,
+                "pass_rate": 0,
+            }
+        return {
+            "count": int(grades.size),
+            "average": round(float(grades.mean()), 1),
+            "median": round(float(np.median(grades)), 1),
+            "std_dev": round(float(grades.std()), 1),
+            "min": round(float(grades.min()), 1),
+            "max": round(float(grades.max()), 1),
+            "pass_rate": round(float((grades >= PASSING_GRADE).mean() * 100), 1),
+        }
+
+    @staticmethod
+    def _point_biserial(item, totals):
+        """Korelasi point-biserial antara soal dan skor total tanpa soal tersebut"""
+        if item.size < 2:
+            return None
+        rest = totals - item
+        if item.std() == 0 or rest.std() == 0:
+            return None
+        return float(np.corrcoef(item, rest)[0, 1])
+
+    @staticmethod
+    def _difficulty_level(difficulty):
+        if difficulty is None:
+            return None
+        if difficulty >= 0.7:
+            return "easy"
+        if difficulty >= 0.3:
+            return "medium"
+        return "hard"
+
+    @staticmethod
+    def _slope(values):
+        if values.size < 2:
+            return None
+        x = np.arange(values.size, dtype=float)
+        return float(np.polyfit(x, values, 1)[0])
+
+    @staticmethod
+    def _direction(slope):
+        if slope is None:
+            return "insufficient_data"
+        if slope > 2:
+            return "up"
+        if slope < -2:
+            return "down"
+        return "stable"
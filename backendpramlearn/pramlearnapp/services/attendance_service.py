@@ -0,0 +1,197 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.utils import timezone
+import logging
+
+from ..models import StudentAttendance, ClassStudent, CustomUser
+from ..utils.cache import invalidate_tags, material_tag, student_tag, subject_tag
+
+logger = logging.getLogger(__name__)
+
+VALID_STATUSES = {choice for choice, _ in StudentAttendance.ATTENDANCE_CHOICES}
+
+
+def display_name(user):
+    if user.first_name or user.last_name:
+        return f"{user.first_name or ''} {user.last_name or ''}".strip()
+    return user.username
+
+
+class AttendanceService:
+    """
+    Operasi absensi per material secara batch: membuat baris yang belum ada
+    dengan satu bulk_create, menerapkan banyak perubahan status dengan satu
+    bulk_update, dan mengirim satu broadcast berisi semua perubahan.
+
+    bulk_create/bulk_update tidak memicu signal, sehingga invalidasi cache
+    dilakukan di sini.
+    """
+
+    def __init__(self, material):
+        self.material = material
+
+    def class_student_ids(self):
+        subject_class = self.material.subject.subject_class
+        if not subject_class:
+            return []
+        return list(
+            ClassStudent.objects.filter(class_id=subject_class.class_id_id)
+            .values_list("student_id", flat=True)
+            .distinct()
+        )
+
+    def ensure_rows(self, student_ids, updated_by=None):
+        """Buat baris absensi 'absent' untuk student yang belum punya"""
+        student_ids = set(student_ids)
+        existing = set(
+            StudentAttendance.objects.filter(
+                material=self.material, student_id__in=student_ids
+            ).values_list("student_id", flat=True)
+        )
+        missing = student_ids - existing
+        if missing:
+            StudentAttendance.objects.bulk_create(
+                [
+                    StudentAttendance(
+                        student_id=student_id,
+                        material=self.material,
+                        status="absent",
+                        updated_by=updated_by,
+                    )
+                    for student_id in missing
+                ],
+                ignore_conflicts=True,
+            )
+            invalidate_tags(
+                subject_tag(self.material.subject_id),
+                *[student_tag(sid) for sid in missing],
+            )
+        return len(missing)
+
+    def create_for_class(self, updated_by=None):
+        """Return (jumlah baris dibuat, jumlah student di kelas)"""
+        student_ids = self.class_student_ids()
+        created = self.ensure_rows(student_ids, updated_by)
+        if created:
+            invalidate_tags(material_tag(self.material.id))
+        return created, len(student_ids)
+
+    def apply_changes(self, changes, updated_by=None):
+        """
+        Terapkan list perubahan [{"student_id": .., "status": ..}] dalam satu
+        transaksi. Return list baris yang statusnya benar-benar berubah.
+        Raise ValueError jika ada status yang tidak valid atau student yang
+        bukan anggota kelas material.
+        """
+        statuses = {}
+        for change in changes:
+            status = change.get("status")
+            if status not in VALID_STATUSES:
+                raise ValueError(f"Invalid status: {status}")
+            statuses[int(change["student_id"])] = status
+
+        if not statuses:
+            return []
+
+        outside = set(statuses) - set(self.class_student_ids())
+        if outside:
+            raise ValueError(
+                f"Students not in this class: {', '.join(map(str, sorted(outside)))}"
+            )
+
+        now = timezone.now()
+        with transaction.atomic():
+            self.ensure_rows(statuses.keys(), updated_by)
+            rows = list(
+                StudentAttendance.objects.select_for_update()
+                .filter(material=self.material, student_id__in=statuses.keys())
+                .select_related("student")
+            )
+
+            changed = []
+            for row in rows:
+                status = statuses[row.student_id]
+                if row.status != status:
+                    row.status = status
+                    row.updated_by = updated_by
+                    row.updated_at = now
+                    changed.append(row)
+
+            if changed:
+                StudentAttendance.objects.bulk_update(
+                    changed, ["status", "updated_by", "updated_at"]
+                )
+
+        if changed:
+            invalidate_tags(
+                material_tag(self.material.id),
+                subject_tag(self.material.subject_id),
+                *[student_tag(row.student_id) for row in changed],
+            )
+            self.broadcast(changed, updated_by, now)
+        return changed
+
+    def broadcast(self, rows, updated_by, timestamp):
+        """Satu pesan WebSocket berisi semua perubahan absensi"""
+        channel_layer = get_channel_layer()
+        if not channel_layer:
+            return
+        try:
+            async_to_sync(channel_layer.group_send)(
+                f"attendance_{self.material.id}",
+                {
+                    "type": "attendance_batch_notification",
+                    "changes": [
+                        {
+                            "student_id": row.student_id,
+                            "status": row.status,
+                            "student_name": display_name(row.student),
+                        }
+                        for row in rows
+                    ],
+                    "updated_by": updated_by.id if updated_by else None,
+                    "timestamp": timestamp.isoformat(),
+                },
+            )
+        except Exception as e:
+            logger.error(f"Error broadcasting attendance batch: {e}")
+
+    def sheet(self):
+        """
+        Daftar hadir seluruh student kelas beserta status absensinya
+        (student tanpa baris absensi dianggap 'absent'), dalam dua query.
+        """
+        students = CustomUser.objects.filter(id__in=self.class_student_ids()).order_by(
+            "first_name", "last_name", "username"
+        )
+        records = {
+            row["student_id"]: row
+            for row in StudentAttendance.objects.filter(material=self.material).values(
+                "student_id", "status", "updated_at", "updated_by_id"
+            )
+        }
+
+        summary = {status: 0 for status, _ in StudentAttendance.ATTENDANCE_CHOICES}
+        rows = []
+        for student in students:
+            record = records.get(student.id)
+            status = record["status"] if record else "absent"
+            summary[status] += 1
+            rows.append(
+                {
+                    "student_id": student.id,
+                    "username": student.username,
+                    "student_name": display_name(student),
+                    "status": status,
+                    "updated_at": record["updated_at"] if record else None,
+                    "updated_by": record["updated_by_id"] if record else None,
+                }
+            )
+
+        return {
+            "material_id": self.material.id,
+            "total_students": len(rows),
+            "summary": summary,
+            "students": rows,
+        }
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from ..models import GroupChat
+
+logger = logging.getLogger(__name__)
+
+
+def persist_chat_messages(messages):
+    """
+    Simpan batch GroupChat (belum tersimpan) dengan satu bulk_create.
+    Pesan yang client_id-nya sudah tersimpan (client mengirim ulang) diganti
+    dengan baris yang ada. Return list baris tersimpan sesuai urutan input.
+    """
+    if not messages:
+        return []
+
+    keys = {(m.sender_id, m.client_id) for m in messages if m.client_id}
+    existing = {}
+    if keys:
+        for chat in GroupChat.objects.filter(
+            sender_id__in={sender_id for sender_id, _ in keys},
+            client_id__in={client_id for _, client_id in keys},
+        ):
+            existing[(chat.sender_id, chat.client_id)] = chat
+
+    saved = {}
+    to_create = []
+    for message in messages:
+        key = (message.sender_id, message.client_id)
+        if message.client_id and (key in existing or key in saved):
+            continue
+        to_create.append(message)
+        if message.client_id:
+            saved[key] = message
+
+    try:
+        with transaction.atomic():
+            GroupChat.objects.bulk_create(to_create)
+    except IntegrityError:
+        # client_id yang sama tersimpan oleh flush lain: simpan satu per satu
+        for message in to_create:
+            try:
+                with transaction.atomic():
+                    message.save()
+            except IntegrityError:
+                saved[(message.sender_id, message.client_id)] = GroupChat.objects.get(
+                    sender_id=message.sender_id, client_id=message.client_id
+                )
+
+    result = []
+    for message in messages:
+        key = (message.sender_id, message.client_id)
+        if message.client_id:
+            result.append(existing.get(key) or saved[key])
+        else:
+            result.append(message)
+    return result
+
+
+class ChatWriteBuffer:
+    """
+    Write-behind buffer untuk pesan chat kelompok dari WebSocket.
+
+    Pesan dikumpulkan dan disimpan dengan satu bulk_create setiap
+    GROUP_CHAT_FLUSH_INTERVAL detik, atau segera saat jumlahnya mencapai
+    GROUP_CHAT_FLUSH_SIZE. add() selesai setelah pesan tersimpan dan
+    mengembalikan barisnya (dengan id), sehingga ack dan broadcast selalu
+    merujuk pesan yang sudah ada di database.
+    """
+
+    def __init__(self, interval=None, max_size=None):
+        self.interval = (
+            interval
+            if interval is not None
+            else getattr(settings, "GROUP_CHAT_FLUSH_INTERVAL", 0.25)
+        )
+        self.max_size = max_size or getattr(settings, "GROUP_CHAT_FLUSH_SIZE", 100)
+        self.pending = []
+        self.flush_task = None
+
+    async def add(self, message):
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((message, future))
+        if len(self.pending) >= self.max_size:
+            await self.flush()
+        elif self.flush_task is None:
+            self.flush_task = asyncio.ensure_future(self.flush_later())
+        return await future
+
+    async def flush_later(self):
+        await asyncio.sleep(self.interval)
+        self.flush_task = None
+        await self.flush()
+
+    async def flush(self):
+        batch, self.pending = self.pending, []
+        if not batch:
+            return
+        try:
+            saved = await database_sync_to_async(persist_chat_messages)(
+                [message for message, _ in batch]
+            )
+        except Exception as e:
+            logger.error(f"Error saving {len(batch)} group chat messages: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), chat in zip(batch, saved):
+            if not future.done():
+                future.set_result(chat)
+
+
+_buffers = {}
+
+
+def get_chat_buffer():
+    """Buffer bersama untuk event loop yang sedang berjalan"""
+    loop = asyncio.get_running_loop()
+    buffer = _buffers.get(loop)
+    if buffer is None:
+        # Buffer milik event loop yang sudah ditutup tidak dipakai lagi
+        for old_loop in [l for l in _buffers if l.is_closed()]:
+            del _buffers[old_loop]
+        buffer = _buffers[loop] = ChatWriteBuffer()
+    return buffer
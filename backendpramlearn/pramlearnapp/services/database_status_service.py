@@ -0,0 +1,72 @@
+from collections import Counter
+from django.conf import settings
+from django.db import connections
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_connections_created = Counter()
+_connections_lock = threading.Lock()
+
+
+def record_connection_created(alias):
+    """Dipanggil signal connection_created: hitung koneksi baru per alias"""
+    with _connections_lock:
+        _connections_created[alias] += 1
+
+
+class DatabaseStatusService:
+    """
+    Metrik koneksi database untuk proses ini.
+
+    connections_created naik setiap kali Django membuka koneksi baru; jika
+    angkanya terus naik seiring trafik WebSocket, koneksi tidak dipakai
+    ulang (cek DB_CONN_MAX_AGE). Untuk PostgreSQL juga dibaca jumlah
+    koneksi server per state dari pg_stat_activity.
+    """
+
+    @staticmethod
+    def server_stats(connection):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COALESCE(state, 'unknown'), COUNT(*) FROM pg_stat_activity "
+                "WHERE datname = current_database() GROUP BY 1"
+            )
+            by_state = dict(cursor.fetchall())
+            cursor.execute("SHOW max_connections")
+            max_connections = int(cursor.fetchone()[0])
+        return {
+            "connections": sum(by_state.values()),
+            "by_state": by_state,
+            "max_connections": max_connections,
+        }
+
+    @classmethod
+    def alias_status(cls, alias):
+        connection = connections[alias]
+        config = connection.settings_dict
+        with _connections_lock:
+            created = _connections_created[alias]
+        status = {
+            "alias": alias,
+            "vendor": connection.vendor,
+            "conn_max_age": config.get("CONN_MAX_AGE"),
+            "conn_health_checks": config.get("CONN_HEALTH_CHECKS"),
+            "server_side_cursors": not config.get("DISABLE_SERVER_SIDE_CURSORS"),
+            "connections_created": created,
+        }
+        if connection.vendor == "postgresql":
+            try:
+                status["server"] = cls.server_stats(connection)
+            except Exception as e:
+                logger.error(f"Error reading database stats for {alias}: {e}")
+                status["server"] = {"error": str(e)}
+        return status
+
+    @classmethod
+    def snapshot(cls):
+        return {
+            "pooler": getattr(settings, "DB_POOLER", "") or None,
+            "databases": [cls.alias_status(alias) for alias in connections],
+        }
@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.db.models import Avg, Count, Q, Max, Min
 from django.utils import timezone
 from datetime import datetime, timedelta
@@ -35,19 +36,128 @@ def is_student(user):
         return False
 
 
+def _average(total, count):
+    return total / count if count else None
+
+
+# Aturan achievement: (type, title, icon, fungsi snapshot -> deskripsi/None)
+ACHIEVEMENT_RULES = [
+    (
+        "perfect_scorer",
+        "Perfect Scorer",
+        "🎯",
+        # 3+ nilai sempurna (100)
+        lambda stats: (
+            f"Meraih {stats.perfect_count} nilai sempurna!"
+            if stats.perfect_count >= 3
+            else None
+        ),
+    ),
+    (
+        "consistent_performer",
+        "Consistent Performer",
+        "📈",
+        # 5 nilai >80 berturut-turut
+        lambda stats: (
+            "5 nilai berturut-turut di atas 80!"
+            if len(stats.recent_grades) >= 5
+            and all(value > 80 for value in stats.recent_grades[:5])
+            else None
+        ),
+    ),
+    (
+        "quiz_master",
+        "Quiz Master",
+        "🧠",
+        # Rata-rata quiz >85
+        lambda stats: (
+            f"Rata-rata quiz {stats.quiz_average:.1f}!"
+            if stats.quiz_count and stats.quiz_average > 85
+            else None
+        ),
+    ),
+    (
+        "assignment_expert",
+        "Assignment Expert",
+        "📝",
+        # Rata-rata assignment >85
+        lambda stats: (
+            f"Rata-rata assignment {stats.assignment_average:.1f}!"
+            if stats.assignment_count and stats.assignment_average > 85
+            else None
+        ),
+    ),
+    (
+        "high_achiever",
+        "High Achiever",
+        "🏆",
+        # Rata-rata keseluruhan >90
+        lambda stats: (
+            f"Rata-rata keseluruhan {stats.average_grade:.1f}!"
+            if stats.total_assessments and stats.average_grade > 90
+            else None
+        ),
+    ),
+    (
+        "dedicated_learner",
+        "Dedicated Learner",
+        "📚",
+        # 20+ assessment selesai
+        lambda stats: (
+            f"{stats.total_assessments} assessment selesai!"
+            if stats.total_assessments >= 20
+            else None
+        ),
+    ),
+]
+
+
 class GradeService:
     """
     Service class untuk business logic grades
+
+    Statistik, tren, breakdown subject, dan kelayakan achievement dibaca dari
+    snapshot GradeStatistics yang diperbarui inkremental oleh signal setiap
+    kali grade baru ditulis (lihat record_grade), bukan dihitung ulang dari
+    semua grade di setiap request.
     """
 
     def __init__(self, student):
         self.student = student
+        self._statistics = None
+
+    def get_statistics(self):
+        """Snapshot statistik siswa; dibangun (sekali) jika belum ada"""
+        if self._statistics is None:
+            stats, _ = GradeStatistics.objects.get_or_create(student=self.student)
+            if not stats.is_built:
+                stats.update_statistics()
+                self.award_achievements(stats)
+            self._statistics = stats
+        return self._statistics
+
+    def record_grade(self, grade, created=True):
+        """
+        Perbarui snapshot setelah grade ditulis dan periksa achievement sekali.
+        Grade baru ditambahkan inkremental; grade yang diubah memicu rebuild.
+        """
+        with transaction.atomic():
+            stats, _ = GradeStatistics.objects.select_for_update().get_or_create(
+                student=self.student
+            )
+            if created:
+                stats.add_grade(grade)
+            else:
+                stats.update_statistics()
+            self.award_achievements(stats)
+        self._statistics = stats
+        return stats
 
     def calculate_performance_trend(self):
         """Calculate performance trend (up/down/stable)"""
-        grades = Grade.objects.filter(student=self.student).order_by("-date")
+        window = self.get_statistics().recent_grades
 
-        if grades.count() < 10:
+        if len(window) < 10:
             return {
                 "trend": "insufficient_data",
                 "percentage": 0,
@@ -55,11 +165,11 @@ class GradeService:
             }
 
         # Ambil 5 nilai terbaru vs 5 sebelumnya
-        recent_grades = list(grades[:5])
-        older_grades = list(grades[5:10])
+        recent_grades = window[:5]
+        older_grades = window[5:10]
 
-        recent_avg = sum(g.grade for g in recent_grades) / len(recent_grades)
-        older_avg = sum(g.grade for g in older_grades) / len(older_grades)
+        recent_avg = sum(recent_grades) / len(recent_grades)
+        older_avg = sum(older_grades) / len(older_grades)
 
         difference = recent_avg - older_avg
         percentage = abs(difference / older_avg * 100) if older_avg > 0 else 0
@@ -80,148 +190,53 @@ class GradeService:
 
     def get_subject_breakdown(self):
         """Get performance breakdown by subject"""
-        grades = Grade.objects.filter(student=self.student)
-
-        # Group by subject
-        subjects = {}
-        for grade in grades:
-            subject = grade.subject_name
-            if subject not in subjects:
-                subjects[subject] = {
-                    "total_grades": [],
-                    "quiz_grades": [],
-                    "assignment_grades": [],
-                }
-
-            subjects[subject]["total_grades"].append(grade.grade)
-            if grade.type == "quiz":
-                subjects[subject]["quiz_grades"].append(grade.grade)
-            elif grade.type == "assignment":
-                subjects[subject]["assignment_grades"].append(grade.grade)
-
-        # Calculate averages
         breakdown = {}
-        for subject, data in subjects.items():
+        for subject, totals in self.get_statistics().subject_totals.items():
+            quiz_avg = _average(totals["quiz_sum"], totals["quiz_count"])
+            assignment_avg = _average(
+                totals["assignment_sum"], totals["assignment_count"]
+            )
             breakdown[subject] = {
-                "average": round(
-                    sum(data["total_grades"]) / len(data["total_grades"]), 1
-                ),
-                "quiz_average": (
-                    round(sum(data["quiz_grades"]) / len(data["quiz_grades"]), 1)
-                    if data["quiz_grades"]
-                    else 0
-                ),
+                "average": round(totals["sum"] / totals["count"], 1),
+                "quiz_average": round(quiz_avg, 1) if quiz_avg is not None else 0,
                 "assignment_average": (
-                    round(
-                        sum(data["assignment_grades"]) / len(data["assignment_grades"]),
-                        1,
-                    )
-                    if data["assignment_grades"]
-                    else 0
+                    round(assignment_avg, 1) if assignment_avg is not None else 0
                 ),
-                "total_assessments": len(data["total_grades"]),
+                "total_assessments": totals["count"],
             }
 
         return breakdown
 
-    def check_and_award_achievements(self):
-        """Check dan berikan achievement baru"""
-        new_achievements = []
-        grades = Grade.objects.filter(student=self.student)
-
-        # Perfect Scorer: 3+ nilai sempurna (100)
-        perfect_scores = grades.filter(grade=100).count()
-        if perfect_scores >= 3:
-            achievement, created = Achievement.objects.get_or_create(
-                student=self.student,
-                type="perfect_scorer",
-                defaults={
-                    "title": "Perfect Scorer",
-                    "description": f"Meraih {perfect_scores} nilai sempurna!",
-                    "icon": "🎯",
-                },
-            )
-            if created:
-                new_achievements.append(achievement)
-
-        # Consistent Performer: 5 nilai >80 berturut-turut
-        recent_grades = list(grades.order_by("-date")[:5])
-        if len(recent_grades) >= 5 and all(g.grade > 80 for g in recent_grades):
-            achievement, created = Achievement.objects.get_or_create(
-                student=self.student,
-                type="consistent_performer",
-                defaults={
-                    "title": "Consistent Performer",
-                    "description": "5 nilai berturut-turut di atas 80!",
-                    "icon": "📈",
-                },
-            )
-            if created:
-                new_achievements.append(achievement)
-
-        # Quiz Master: Rata-rata quiz >85
-        quiz_avg = grades.filter(type="quiz").aggregate(avg=Avg("grade"))["avg"]
-        if quiz_avg and quiz_avg > 85:
-            achievement, created = Achievement.objects.get_or_create(
-                student=self.student,
-                type="quiz_master",
-                defaults={
-                    "title": "Quiz Master",
-                    "description": f"Rata-rata quiz {quiz_avg:.1f}!",
-                    "icon": "🧠",
-                },
-            )
-            if created:
-                new_achievements.append(achievement)
+    def award_achievements(self, stats):
+        """
+        Berikan achievement yang memenuhi syarat berdasarkan snapshot.
+        Achievement baru disimpan di pending_achievements sampai dibaca.
+        """
+        eligible = {}
+        for achievement_type, title, icon, rule in ACHIEVEMENT_RULES:
+            description = rule(stats)
+            if description:
+                eligible[achievement_type] = Achievement(
+                    student=self.student,
+                    type=achievement_type,
+                    title=title,
+                    description=description,
+                    icon=icon,
+                )
+        if not eligible:
+            return []
 
-        # Assignment Expert: Rata-rata assignment >85
-        assignment_avg = grades.filter(type="assignment").aggregate(avg=Avg("grade"))[
-            "avg"
-        ]
-        if assignment_avg and assignment_avg > 85:
-            achievement, created = Achievement.objects.get_or_create(
-                student=self.student,
-                type="assignment_expert",
-                defaults={
-                    "title": "Assignment Expert",
-                    "description": f"Rata-rata assignment {assignment_avg:.1f}!",
-                    "icon": "📝",
-                },
-            )
-            if created:
-                new_achievements.append(achievement)
-
-        # High Achiever: Overall average >90
-        overall_avg = grades.aggregate(avg=Avg("grade"))["avg"]
-        if overall_avg and overall_avg > 90:
-            achievement, created = Achievement.objects.get_or_create(
-                student=self.student,
-                type="high_achiever",
-                defaults={
-                    "title": "High Achiever",
-                    "description": f"Rata-rata keseluruhan {overall_avg:.1f}!",
-                    "icon": "🏆",
-                },
-            )
-            if created:
-                new_achievements.append(achievement)
-
-        # Dedicated Learner: 20+ assessments completed
-        total_assessments = grades.count()
-        if total_assessments >= 20:
-            achievement, created = Achievement.objects.get_or_create(
-                student=self.student,
-                type="dedicated_learner",
-                defaults={
-                    "title": "Dedicated Learner",
-                    "description": f"{total_assessments} assessment selesai!",
-                    "icon": "📚",
-                },
-            )
-            if created:
-                new_achievements.append(achievement)
+        owned = set(
+            Achievement.objects.filter(
+                student=self.student, type__in=eligible.keys()
+            ).values_list("type", flat=True)
+        )
+        new_achievements = [a for t, a in eligible.items() if t not in owned]
+        if not new_achievements:
+            return []
 
-        return [
+        Achievement.objects.bulk_create(new_achievements, ignore_conflicts=True)
+        awarded = [
             {
                 "type": a.type,
                 "title": a.title,
@@ -230,16 +245,37 @@ class GradeService:
             }
             for a in new_achievements
         ]
+        stats.pending_achievements = list(stats.pending_achievements) + awarded
+        stats.save(update_fields=["pending_achievements"])
+        return awarded
+
+    def check_and_award_achievements(self):
+        """
+        Ambil achievement baru yang belum ditampilkan ke siswa.
+        Pemeriksaan syarat sudah dilakukan saat grade ditulis. Baris statistik
+        dikunci selama dibaca dan dikosongkan, sehingga request bersamaan atau
+        award_achievements() yang sedang berjalan tidak membuat achievement
+        tampil dua kali atau hilang.
+        """
+        stats = self.get_statistics()
+        with transaction.atomic():
+            new_achievements = (
+                GradeStatistics.objects.select_for_update()
+                .filter(student=self.student)
+                .values_list("pending_achievements", flat=True)
+                .first()
+            )
+            if new_achievements:
+                GradeStatistics.objects.filter(pk=stats.pk).update(
+                    pending_achievements=[]
+                )
+        stats.pending_achievements = []
+        return new_achievements or []
 
     def get_comprehensive_analytics(self):
         """Get comprehensive analytics data"""
         grades = Grade.objects.filter(student=self.student)
-
-        # Update statistics
-        grade_stats, created = GradeStatistics.objects.get_or_create(
-            student=self.student
-        )
-        grade_stats.update_statistics()
+        grade_stats = self.get_statistics()
 
         # Get all analytics
         performance_trend = self.calculate_performance_trend()
@@ -358,25 +394,12 @@ def create_grade_from_submission(submission):
                 date=timezone.now(),
                 assignment=assignment,
                 material=assignment.material,
+                assignment_submission=submission,
             )
             logger.info(
                 f"✅ Grade created successfully: ID={grade.id}, Grade={grade.grade}"
             )
 
-            # Update statistics
-            try:
-                from ..models import GradeStatistics
-
-                grade_stats, created = GradeStatistics.objects.get_or_create(
-                    student=submission.student
-                )
-                grade_stats.update_statistics()
-                logger.info(
-                    f"✅ Statistics updated for student {submission.student.username}"
-                )
-            except Exception as stats_error:
-                logger.error(f"❌ Error updating statistics: {stats_error}")
-
             return grade
 
         except Exception as grade_error:
@@ -419,14 +442,9 @@ def create_grade_from_quiz_attempt(quiz_attempt):
             grade=grade_value,
             quiz=quiz,
             material=quiz.material,
+            quiz_attempt=quiz_attempt,
         )
 
-        # Update statistics
-        grade_stats, created = GradeStatistics.objects.get_or_create(
-            student=quiz_attempt.student
-        )
-        grade_stats.update_statistics()
-
         return grade
 
     except Exception as e:
@@ -533,23 +551,12 @@ def create_grade_from_group_quiz(group_quiz, student):
                 date=timezone.now(),
                 quiz=quiz,
                 material=quiz.material,
+                group_quiz=group_quiz,
             )
             logger.info(
                 f"✅ Grade created successfully: ID={grade.id}, Grade={grade.grade}"
             )
 
-            # Update statistics
-            try:
-                from ..models import GradeStatistics
-
-                grade_stats, created = GradeStatistics.objects.get_or_create(
-                    student=student
-                )
-                grade_stats.update_statistics()
-                logger.info(f"✅ Statistics updated for student {student.username}")
-            except Exception as stats_error:
-                logger.error(f"❌ Error updating statistics: {stats_error}")
-
             return grade
 
         except Exception as grade_error:
@@ -0,0 +1,117 @@
+import logging
+
+from django.db.models import F
+
+from ..models import Grade, AssignmentSubmission, StudentQuizAttempt, GroupQuiz
+
+logger = logging.getLogger(__name__)
+
+SOURCE_FIELDS = ["assignment_submission", "quiz_attempt", "group_quiz"]
+
+
+def is_group_grade(grade):
+    # create_grade_from_group_quiz memberi akhiran "(Group)" pada judul
+    return bool(grade.title) and grade.title.endswith(" (Group)")
+
+
+class GradeSourceService:
+    """
+    Menautkan Grade ke sumber tepatnya (AssignmentSubmission,
+    StudentQuizAttempt, atau GroupQuiz) lewat FK, sehingga review grade tidak
+    perlu menebak sumber dari judul assignment/quiz.
+
+    Sumber dicari dari FK assignment/quiz pada grade dan student-nya, satu
+    query per tabel sumber untuk satu batch grade. Grade baru sudah ditautkan
+    saat dibuat; grade lama ditautkan oleh command backfill_grade_sources
+    atau saat pertama kali direview.
+    """
+
+    @classmethod
+    def find_sources(cls, grades):
+        """Return {grade_id: {field_id: id sumber}} untuk grade yang ditemukan"""
+        assignment_grades = []
+        quiz_grades = []
+        group_grades = []
+        for grade in grades:
+            if grade.has_source:
+                continue
+            if grade.type == "assignment" and grade.assignment_id:
+                assignment_grades.append(grade)
+            elif grade.type == "quiz" and grade.quiz_id:
+                (group_grades if is_group_grade(grade) else quiz_grades).append(grade)
+
+        sources = {}
+
+        if assignment_grades:
+            # Submission final terbaru per (student, assignment)
+            submissions = {}
+            for submission_id, student_id, assignment_id in (
+                AssignmentSubmission.objects.filter(
+                    student_id__in={g.student_id for g in assignment_grades},
+                    assignment_id__in={g.assignment_id for g in assignment_grades},
+                    is_draft=False,
+                )
+                .order_by("submission_date", "id")
+                .values_list("id", "student_id", "assignment_id")
+            ):
+                submissions[(student_id, assignment_id)] = submission_id
+            for grade in assignment_grades:
+                submission_id = submissions.get((grade.student_id, grade.assignment_id))
+                if submission_id:
+                    sources[grade.id] = {"assignment_submission_id": submission_id}
+
+        if quiz_grades:
+            # Attempt terbaru per (student, quiz) menimpa yang lebih lama;
+            # attempt yang belum disubmit (NULL) diurutkan paling awal
+            attempts = {
+                (student_id, quiz_id): attempt_id
+                for attempt_id, student_id, quiz_id in StudentQuizAttempt.objects.filter(
+                    student_id__in={g.student_id for g in quiz_grades},
+                    quiz_id__in={g.quiz_id for g in quiz_grades},
+                )
+                .order_by(F("submitted_at").asc(nulls_first=True), "id")
+                .values_list("id", "student_id", "quiz_id")
+            }
+            for grade in quiz_grades:
+                attempt_id = attempts.get((grade.student_id, grade.quiz_id))
+                if attempt_id:
+                    sources[grade.id] = {"quiz_attempt_id": attempt_id}
+
+        if group_grades:
+            # GroupQuiz unik per (quiz, group); student dipetakan lewat GroupMember
+            group_quizzes = {}
+            for group_quiz_id, quiz_id, student_id in GroupQuiz.objects.filter(
+                quiz_id__in={g.quiz_id for g in group_grades},
+                group__groupmember__student_id__in={g.student_id for g in group_grades},
+            ).values_list("id", "quiz_id", "group__groupmember__student_id"):
+                group_quizzes.setdefault((student_id, quiz_id), group_quiz_id)
+            for grade in group_grades:
+                group_quiz_id = group_quizzes.get((grade.student_id, grade.quiz_id))
+                if group_quiz_id:
+                    sources[grade.id] = {"group_quiz_id": group_quiz_id}
+
+        return sources
+
+    @classmethod
+    def link_grades(cls, grades, dry_run=False):
+        """Tautkan sumber untuk batch grade. Return jumlah grade yang ditautkan."""
+        grades = list(grades)
+        sources = cls.find_sources(grades)
+        linked = []
+        for grade in grades:
+            for field, value in sources.get(grade.id, {}).items():
+                setattr(grade, field, value)
+                linked.append(grade)
+        if linked and not dry_run:
+            Grade.objects.bulk_update(linked, SOURCE_FIELDS)
+        return len(linked)
+
+    @classmethod
+    def resolve(cls, grade):
+        """Pastikan grade tertaut ke sumbernya (untuk grade lama)"""
+        if not grade.has_source:
+            try:
+                cls.link_grades([grade])
+            except Exception as e:
+                logger.error(f"Error linking grade {grade.id} to its source: {e}")
+        return grade
@@ -0,0 +1,268 @@
+from collections import deque
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.text import slugify
+import csv
+import logging
+import tempfile
+import zipfile
+
+from ..models import Grade, ClassStudent, SubjectClass
+from .report_artifact_service import STREAM_CHUNK_SIZE, report_storage
+
+logger = logging.getLogger(__name__)
+
+GRADEBOOK_COLUMNS = [
+    "student_id",
+    "username",
+    "student_name",
+    "subject",
+    "type",
+    "title",
+    "group",
+    "grade",
+    "max_grade",
+    "group_score",
+    "submitted_at",
+    "graded_at",
+    "teacher_feedback",
+]
+
+# Ukuran batch server-side cursor saat membaca grade
+ITERATOR_CHUNK_SIZE = 1000
+
+# Jumlah baris CSV per chunk yang di-yield (satu hop thread per chunk di ASGI)
+CSV_ROWS_PER_CHUNK = 500
+
+
+class _Echo:
+    """Buffer semu untuk csv.writer: writerow mengembalikan baris CSV-nya"""
+
+    def write(self, value):
+        return value
+
+
+class _ZipStream:
+    """
+    File tujuan zipfile yang tidak bisa di-seek; byte yang sudah ditulis
+    diambil dengan pop() sehingga zip bisa di-stream per chunk.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _local(value):
+    return timezone.localtime(value).replace(tzinfo=None) if value else None
+
+
+class GradebookExportService:
+    """
+    Export nilai untuk satu kelas atau satu mata pelajaran yang diampu
+    teacher: gradebook CSV/XLSX dan zip berisi report PDF per siswa.
+
+    Gradebook dibaca dari Grade beserta AssignmentSubmission, quiz attempt,
+    dan GroupQuizResult sumbernya dalam satu query yang diiterasi dengan
+    server-side cursor. Semua export berupa generator sehingga memori tetap
+    datar untuk export satu angkatan sekalipun (di ASGI view membungkusnya
+    dengan utils.streaming.streaming_response); PDF dirender paralel di
+    worker pool report dengan jumlah render tertunda yang dibatasi.
+    """
+
+    def __init__(self, teacher, class_obj=None, subject=None):
+        self.teacher = teacher
+        self.class_obj = class_obj
+        self.subject = subject
+
+    @property
+    def export_name(self):
+        scope = self.subject.slug if self.subject else self.class_obj.slug
+        return f"gradebook-{scope}-{timezone.localdate().isoformat()}"
+
+    def subject_classes(self):
+        subject_classes = SubjectClass.objects.filter(teacher=self.teacher)
+        if self.class_obj:
+            subject_classes = subject_classes.filter(class_id=self.class_obj)
+        if self.subject:
+            subject_classes = subject_classes.filter(subject=self.subject)
+        return subject_classes
+
+    def has_access(self):
+        return self.subject_classes().exists()
+
+    def grades(self):
+        subject_classes = self.subject_classes()
+        subject_ids = subject_classes.values("subject_id")
+        student_ids = ClassStudent.objects.filter(
+            class_id__in=subject_classes.values("class_id")
+        ).values("student_id")
+        return Grade.objects.filter(
+            Q(material__subject_id__in=subject_ids)
+            | Q(assignment__material__subject_id__in=subject_ids)
+            | Q(quiz__material__subject_id__in=subject_ids),
+            student_id__in=student_ids,
+        ).order_by("student__username", "date", "id")
+
+    def gradebook_rows(self):
+        """Baris gradebook (list sesuai GRADEBOOK_COLUMNS), satu per grade"""
+        rows = self.grades().values_list(
+            "student_id",
+            "student__username",
+            "student__first_name",
+            "student__last_name",
+            "material__subject__name",
+            "subject_name",
+            "type",
+            "title",
+            "group_quiz__group__name",
+            "grade",
+            "max_grade",
+            "group_quiz__result__score",
+            "assignment_submission__submission_date",
+            "quiz_attempt__submitted_at",
+            "group_quiz__submitted_at",
+            "date",
+            "teacher_feedback",
+        )
+        for (
+            student_id,
+            username,
+            first_name,
+            last_name,
+            subject,
+            subject_name,
+            grade_type,
+            title,
+            group_name,
+            grade,
+            max_grade,
+            group_score,
+            submission_date,
+            attempt_submitted_at,
+            group_submitted_at,
+            graded_at,
+            feedback,
+        ) in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+            yield [
+                student_id,
+                username,
+                f"{first_name or ''} {last_name or ''}".strip() or username,
+                subject or subject_name,
+                grade_type,
+                title,
+                group_name or "",
+                grade,
+                max_grade,
+                group_score if group_score is not None else "",
+                _local(submission_date or attempt_submitted_at or group_submitted_at),
+                _local(graded_at),
+                feedback or "",
+            ]
+
+    def iter_csv(self):
+        writer = csv.writer(_Echo())
+        lines = [writer.writerow(GRADEBOOK_COLUMNS)]
+        for row in self.gradebook_rows():
+            lines.append(writer.writerow(row))
+            if len(lines) >= CSV_ROWS_PER_CHUNK:
+                yield "".join(lines)
+                lines = []
+        if lines:
+            yield "".join(lines)
+
+    def write_xlsx(self):
+        """
+        Tulis gradebook ke file sementara dengan workbook write-only openpyxl
+        (baris tidak ditahan di memori). Return file yang sudah di-seek ke awal.
+        """
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Gradebook")
+        sheet.append(GRADEBOOK_COLUMNS)
+        for row in self.gradebook_rows():
+            sheet.append(row)
+
+        output = tempfile.TemporaryFile()
+        workbook.save(output)
+        output.seek(0)
+        return output
+
+    def iter_reports_zip(self, artifact_for):
+        """
+        Stream zip berisi gradebook.csv dan report PDF setiap grade, dikelompokkan
+        per folder siswa. artifact_for(grade, student) -> ReportArtifactService.
+        """
+        stream = _ZipStream()
+        max_pending = getattr(settings, "REPORT_WORKERS", 2) * 2
+        timeout = getattr(settings, "REPORT_RENDER_TIMEOUT", 30)
+
+        with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as archive:
+            with archive.open("gradebook.csv", "w") as entry:
+                for chunk in self.iter_csv():
+                    entry.write(chunk.encode("utf-8"))
+                    yield stream.pop()
+            yield stream.pop()
+
+            pending = deque()
+            grades = self.grades().select_related(
+                "student",
+                "material",
+                "quiz",
+                "assignment",
+                "assignment_submission",
+                "quiz_attempt",
+                "group_quiz",
+            )
+            for grade in grades.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+                artifact = artifact_for(grade, grade.student)
+                pending.append((grade, artifact.submit()))
+                if len(pending) >= max_pending:
+                    yield from self._write_report(
+                        archive, stream, *pending.popleft(), timeout
+                    )
+            while pending:
+                yield from self._write_report(
+                    archive, stream, *pending.popleft(), timeout
+                )
+
+        yield stream.pop()
+
+    def _write_report(self, archive, stream, grade, future, timeout):
+        try:
+            name = future.result(timeout=timeout)
+        except Exception as e:
+            logger.error(f"Error rendering report for grade {grade.id}: {e}")
+            return
+
+        arcname = (
+            f"{grade.student.username}/"
+            f"{grade.type}-{slugify(grade.title) or 'report'}-{grade.id}.pdf"
+        )
+        with report_storage.open(name, "rb") as source, archive.open(
+            arcname, "w"
+        ) as entry:
+            while True:
+                chunk = source.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                entry.write(chunk)
+                yield stream.pop()
@@ -0,0 +1,201 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.utils import timezone
+import logging
+
+from ..models import (
+    ClassStudent,
+    CustomUser,
+    Notification,
+    NotificationInbox,
+)
+
+logger = logging.getLogger(__name__)
+
+STUDENT_ROLE_ID = 3
+STUDENT_NOTIFICATION_GROUP = "student_notifications"
+INBOX_BATCH_SIZE = 1000
+CATCH_UP_LIMIT = 50
+
+
+def user_notification_group(user_id):
+    return f"user_notifications_{user_id}"
+
+
+def class_notification_group(class_id):
+    return f"class_notifications_{class_id}"
+
+
+def notification_groups_for_user(user):
+    """Channel notifikasi user: pribadi, kelas yang diikuti, dan semua siswa"""
+    groups = [user_notification_group(user.id)]
+    groups.extend(
+        class_notification_group(class_id)
+        for class_id in ClassStudent.objects.filter(student_id=user.id)
+        .values_list("class_id", flat=True)
+        .distinct()
+    )
+    if user.role_id == STUDENT_ROLE_ID:
+        groups.append(STUDENT_NOTIFICATION_GROUP)
+    return groups
+
+
+def serialize_notification(notification, read_at=None):
+    return {
+        "id": notification.id,
+        "type": notification.type,
+        "title": notification.title,
+        "message": notification.message,
+        "link": notification.link,
+        "data": notification.data,
+        "announcement_id": notification.announcement_id,
+        "created_at": notification.created_at.isoformat(),
+        "is_read": read_at is not None,
+        "read_at": read_at.isoformat() if read_at else None,
+    }
+
+
+class NotificationService:
+    """
+    Pengiriman notifikasi dengan inbox tersimpan.
+
+    Isi notifikasi disimpan sekali (Notification) dan setiap penerima
+    mendapat satu baris inbox ringkas lewat bulk_create. Broadcast dikirim
+    per channel tujuan, bukan per user: satu pesan untuk satu kelas, dan
+    satu pesan untuk semua siswa, sehingga pengumuman ke seluruh sekolah
+    hanya butuh satu pesan channel layer. User yang offline mengejar
+    notifikasi saat reconnect lewat cursor (id notifikasi terakhir).
+    """
+
+    @classmethod
+    def create(cls, recipient_ids, channel_groups, title, message="", **fields):
+        """
+        Simpan notifikasi dan inbox semua penerima, lalu broadcast ke
+        channel_groups setelah transaksi commit. Return Notification.
+        """
+        with transaction.atomic():
+            notification = Notification.objects.create(
+                title=title, message=message, **fields
+            )
+            NotificationInbox.objects.bulk_create(
+                (
+                    NotificationInbox(user_id=user_id, notification=notification)
+                    for user_id in recipient_ids
+                ),
+                batch_size=INBOX_BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+            transaction.on_commit(lambda: cls.broadcast(notification, channel_groups))
+        return notification
+
+    @classmethod
+    def notify_users(cls, user_ids, title, message="", **fields):
+        user_ids = set(user_ids)
+        return cls.create(
+            user_ids,
+            [user_notification_group(user_id) for user_id in user_ids],
+            title,
+            message,
+            **fields,
+        )
+
+    @classmethod
+    def notify_classes(cls, class_ids, title, message="", **fields):
+        class_ids = set(class_ids)
+        student_ids = (
+            ClassStudent.objects.filter(class_id__in=class_ids)
+            .values_list("student_id", flat=True)
+            .distinct()
+            .iterator()
+        )
+        return cls.create(
+            student_ids,
+            [class_notification_group(class_id) for class_id in class_ids],
+            title,
+            message,
+            **fields,
+        )
+
+    @classmethod
+    def notify_all_students(cls, title, message="", **fields):
+        student_ids = (
+            CustomUser.objects.filter(role_id=STUDENT_ROLE_ID, is_active=True)
+            .values_list("id", flat=True)
+            .iterator()
+        )
+        return cls.create(
+            student_ids, [STUDENT_NOTIFICATION_GROUP], title, message, **fields
+        )
+
+    @staticmethod
+    def broadcast(notification, channel_groups):
+        channel_layer = get_channel_layer()
+        if not channel_layer:
+            return
+        event = {
+            "type": "send_notification",
+            "notification": serialize_notification(notification),
+        }
+        for group_name in channel_groups:
+            try:
+                async_to_sync(channel_layer.group_send)(group_name, event)
+            except Exception as e:
+                logger.error(f"Error broadcasting notification to {group_name}: {e}")
+
+    @staticmethod
+    def inbox(user_id):
+        return NotificationInbox.objects.filter(user_id=user_id).select_related(
+            "notification"
+        )
+
+    @classmethod
+    def catch_up(cls, user_id, after=0, limit=CATCH_UP_LIMIT):
+        """
+        Notifikasi dengan id > after, urut naik. Return (items, cursor,
+        has_more); cursor adalah id notifikasi terakhir yang dikirim.
+        """
+        rows = list(
+            cls.inbox(user_id)
+            .filter(notification_id__gt=after)
+            .order_by("notification_id")[: limit + 1]
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        items = [serialize_notification(row.notification, row.read_at) for row in rows]
+        cursor = rows[-1].notification_id if rows else after
+        return items, cursor, has_more
+
+    @classmethod
+    def history(cls, user_id, before=None, limit=CATCH_UP_LIMIT):
+        """Notifikasi terbaru lebih dulu, halaman sebelum id `before`"""
+        rows = cls.inbox(user_id).order_by("-notification_id")
+        if before:
+            rows = rows.filter(notification_id__lt=before)
+        rows = list(rows[: limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return [
+            serialize_notification(row.notification, row.read_at) for row in rows
+        ], has_more
+
+    @staticmethod
+    def unread_count(user_id):
+        return NotificationInbox.objects.filter(
+            user_id=user_id, read_at__isnull=True
+        ).count()
+
+    @staticmethod
+    def mark_read(user_id, notification_id=None):
+        """Tandai satu (atau semua) notifikasi sudah dibaca. Return jumlah baris."""
+        rows = NotificationInbox.objects.filter(user_id=user_id, read_at__isnull=True)
+        if notification_id is not None:
+            rows = rows.filter(notification_id=notification_id)
+        return rows.update(read_at=timezone.now())
+
+    @staticmethod
+    def remove(user_id, notification_id):
+        deleted, _ = NotificationInbox.objects.filter(
+            user_id=user_id, notification_id=notification_id
+        ).delete()
+        return deleted
@@ -0,0 +1,293 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+import logging
+
+from ..models import CustomUser, ClassStudent, GroupMember, SubjectClass
+
+logger = logging.getLogger(__name__)
+
+PRESENCE_KEY_PREFIX = "presence:user"
+SOCKET_COUNT_PREFIX = "presence:sockets"
+FLUSH_LOCK_KEY = "presence:flush-lock"
+
+
+def presence_key(user_id):
+    return f"{PRESENCE_KEY_PREFIX}:{user_id}"
+
+
+def socket_count_key(user_id):
+    return f"{SOCKET_COUNT_PREFIX}:{user_id}"
+
+
+def class_presence_group(class_id):
+    return f"presence_class_{class_id}"
+
+
+def group_presence_group(group_id):
+    return f"presence_group_{group_id}"
+
+
+def presence_scopes(user_id):
+    """
+    Scope presence user: (class_ids, group_ids) dari kelas yang diikuti
+    (student) atau diajar (teacher), serta kelompok yang diikuti.
+    """
+    class_ids = set(
+        ClassStudent.objects.filter(student_id=user_id).values_list(
+            "class_id", flat=True
+        )
+    )
+    class_ids.update(
+        SubjectClass.objects.filter(teacher_id=user_id).values_list(
+            "class_id", flat=True
+        )
+    )
+    group_ids = set(
+        GroupMember.objects.filter(student_id=user_id).values_list(
+            "group_id", flat=True
+        )
+    )
+    return sorted(class_ids), sorted(group_ids)
+
+
+def presence_groups_for_user(user_id, scopes=None):
+    """Nama channel group presence untuk kelas dan kelompok user"""
+    class_ids, group_ids = scopes or presence_scopes(user_id)
+    return [class_presence_group(cid) for cid in class_ids] + [
+        group_presence_group(gid) for gid in group_ids
+    ]
+
+
+def scope_member_ids(class_ids, group_ids):
+    """Semua user (student dan teacher) yang berbagi scope presence"""
+    member_ids = set(
+        ClassStudent.objects.filter(class_id__in=class_ids).values_list(
+            "student_id", flat=True
+        )
+    )
+    member_ids.update(
+        SubjectClass.objects.filter(class_id__in=class_ids).values_list(
+            "teacher_id", flat=True
+        )
+    )
+    member_ids.update(
+        GroupMember.objects.filter(group_id__in=group_ids).values_list(
+            "student_id", flat=True
+        )
+    )
+    member_ids.discard(None)
+    return member_ids
+
+
+class PresenceService:
+    """
+    Presence user disimpan di cache dengan TTL (PRESENCE_TTL detik), bukan di
+    tabel CustomUser. Heartbeat hanya memperbarui key cache; database hanya
+    ditulis saat user berubah status (online/offline) dan saat flush berkala
+    (setiap PRESENCE_FLUSH_INTERVAL detik) yang menyimpan last_activity
+    secara batch. Broadcast hanya dikirim saat status berubah, ke channel
+    kelas dan kelompok user.
+
+    User yang menutup tab tidak langsung offline: presence-nya diberi masa
+    tenggang PRESENCE_OFFLINE_GRACE detik, sehingga reload atau tab lain yang
+    masih terbuka tidak memicu broadcast offline lalu online lagi. Jumlah
+    socket yang masih terbuka per user dicatat di cache (socket_opened /
+    socket_closed); masa tenggang baru dimulai saat socket terakhir ditutup.
+    """
+
+    @staticmethod
+    def ttl():
+        return getattr(settings, "PRESENCE_TTL", 300)
+
+    @staticmethod
+    def flush_interval():
+        return getattr(settings, "PRESENCE_FLUSH_INTERVAL", 60)
+
+    @staticmethod
+    def offline_grace():
+        return getattr(settings, "PRESENCE_OFFLINE_GRACE", 15)
+
+    @classmethod
+    def heartbeat(cls, user_id, at=None):
+        """Catat aktivitas user. Return True jika user baru saja online."""
+        at = at or timezone.now()
+        key = presence_key(user_id)
+        came_online = cache.get(key) is None
+        cache.set(key, at.isoformat(), cls.ttl())
+        # Counter socket ikut diperpanjang; counter milik proses yang mati
+        # tanpa disconnect akhirnya expire sendiri
+        cache.touch(socket_count_key(user_id), cls.socket_count_timeout())
+
+        if came_online:
+            CustomUser.objects.filter(pk=user_id).update(
+                is_online=True, last_activity=at
+            )
+            cls.broadcast(user_id, True, at)
+
+        cls.maybe_flush()
+        return came_online
+
+    @classmethod
+    def socket_count_timeout(cls):
+        return cls.ttl() * 2
+
+    @classmethod
+    def socket_opened(cls, user_id):
+        """Catat satu socket baru milik user. Return jumlah socket terbuka."""
+        key = socket_count_key(user_id)
+        cache.add(key, 0, cls.socket_count_timeout())
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Key expired di antara add() dan incr()
+            cache.set(key, 1, cls.socket_count_timeout())
+            return 1
+
+    @classmethod
+    def socket_closed(cls, user_id):
+        """Catat satu socket user ditutup. Return sisa socket yang terbuka."""
+        key = socket_count_key(user_id)
+        try:
+            remaining = cache.decr(key)
+        except ValueError:
+            return 0
+        if remaining <= 0:
+            cache.delete(key)
+            return 0
+        return remaining
+
+    @classmethod
+    def release_socket(cls, user_id):
+        """
+        Socket user ditutup. Masa tenggang (go_offline) hanya dimulai jika
+        tidak ada socket lain yang masih terbuka. Return True jika dimulai.
+        """
+        if cls.socket_closed(user_id):
+            return False
+        cls.go_offline(user_id)
+        return True
+
+    @classmethod
+    def go_offline(cls, user_id, at=None):
+        """
+        Tandai user sedang pergi (logout, tab ditutup). Presence hanya
+        dipersingkat ke masa tenggang; broadcast offline dikirim oleh
+        expire_if_gone() atau flush() jika tidak ada heartbeat baru.
+        """
+        at = at or timezone.now()
+        cache.set(presence_key(user_id), at.isoformat(), cls.offline_grace())
+
+    @classmethod
+    def expire_if_gone(cls, user_id):
+        """Broadcast offline jika presence user sudah habis masa berlakunya"""
+        if cache.get(presence_key(user_id)) is not None:
+            return False
+        last_activity = timezone.now()
+        updated = CustomUser.objects.filter(pk=user_id, is_online=True).update(
+            is_online=False, last_activity=last_activity
+        )
+        if updated:
+            cls.broadcast(user_id, False, last_activity)
+        return bool(updated)
+
+    @classmethod
+    def snapshot(cls, scopes):
+        """Daftar user online yang berbagi scope (class_ids, group_ids)"""
+        online = cls.get_online(scope_member_ids(*scopes))
+        return [
+            {
+                "user_id": user_id,
+                "is_online": True,
+                "last_activity": last_activity.isoformat() if last_activity else None,
+            }
+            for user_id, last_activity in sorted(online.items())
+        ]
+
+    @staticmethod
+    def get_last_activity(user_id):
+        value = cache.get(presence_key(user_id))
+        return parse_datetime(value) if value else None
+
+    @classmethod
+    def is_online(cls, user_id):
+        return cls.get_last_activity(user_id) is not None
+
+    @staticmethod
+    def get_online(user_ids):
+        """Dict {user_id: last_activity} untuk user yang sedang online"""
+        user_ids = list(user_ids)
+        values = cache.get_many([presence_key(uid) for uid in user_ids])
+        return {
+            uid: parse_datetime(values[presence_key(uid)])
+            for uid in user_ids
+            if presence_key(uid) in values
+        }
+
+    @classmethod
+    def maybe_flush(cls):
+        # cache.add hanya berhasil sekali per interval, di semua proses
+        if cache.add(FLUSH_LOCK_KEY, 1, cls.flush_interval()):
+            try:
+                cls.flush()
+            except Exception as e:
+                logger.error(f"Error flushing presence: {e}")
+
+    @classmethod
+    def flush(cls):
+        """
+        Simpan last_activity user online ke database dalam satu batch dan
+        tandai offline user yang presence-nya sudah expired.
+        Return (jumlah last_activity diperbarui, jumlah user offline).
+        """
+        rows = list(
+            CustomUser.objects.filter(is_online=True).values_list(
+                "id", "last_activity"
+            )
+        )
+        if not rows:
+            return 0, 0
+
+        online = cls.get_online(uid for uid, _ in rows)
+        to_update = []
+        expired = []
+        for user_id, db_last_activity in rows:
+            last_activity = online.get(user_id)
+            if last_activity is None:
+                expired.append((user_id, db_last_activity))
+            elif db_last_activity is None or last_activity > db_last_activity:
+                to_update.append(CustomUser(id=user_id, last_activity=last_activity))
+
+        if to_update:
+            CustomUser.objects.bulk_update(
+                to_update, ["last_activity"], batch_size=500
+            )
+
+        if expired:
+            CustomUser.objects.filter(id__in=[uid for uid, _ in expired]).update(
+                is_online=False
+            )
+            for user_id, last_activity in expired:
+                cls.broadcast(user_id, False, last_activity)
+
+        return len(to_update), len(expired)
+
+    @staticmethod
+    def broadcast(user_id, is_online, last_activity):
+        channel_layer = get_channel_layer()
+        if not channel_layer:
+            return
+        event = {
+            "type": "user_status_update",
+            "user_id": user_id,
+            "is_online": is_online,
+            "last_activity": last_activity.isoformat() if last_activity else None,
+        }
+        try:
+            for group_name in presence_groups_for_user(user_id):
+                async_to_sync(channel_layer.group_send)(group_name, event)
+        except Exception as e:
+            logger.error(f"Error broadcasting presence for user {user_id}: {e}")
@@ -0,0 +1,265 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import connection
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.functional import LazyObject
+from django.utils.http import http_date, quote_etag
+import hashlib
+import logging
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Naikkan jika layout PDF berubah agar artifact lama tidak dipakai lagi
+REPORT_LAYOUT_VERSION = 1
+REPORT_DIR = "grades"
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_executor = None
+_executor_lock = threading.Lock()
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+class ReportStorage(LazyObject):
+    """
+    Storage privat untuk artifact report: container Azure
+    REPORT_AZURE_CONTAINER jika diset, selain itu REPORT_STORAGE_ROOT di
+    disk. Tidak pernah di bawah MEDIA_ROOT/MEDIA_URL karena report berisi
+    nilai siswa dan hanya boleh diunduh lewat view yang memeriksa akses.
+    """
+
+    def _setup(self):
+        container = getattr(settings, "REPORT_AZURE_CONTAINER", "")
+        if container:
+            from storages.backends.azure_storage import AzureStorage
+
+            self._wrapped = AzureStorage(azure_container=container)
+        else:
+            self._wrapped = FileSystemStorage(
+                location=settings.REPORT_STORAGE_ROOT, base_url=None
+            )
+
+
+report_storage = ReportStorage()
+
+
+def mark_reports_stale(grades):
+    """
+    Majukan Grade.updated_at untuk queryset grade agar versi artifact report
+    berganti saat isi report (jawaban, soal, feedback) berubah tanpa
+    menyentuh baris Grade.
+    """
+    grades.update(updated_at=timezone.now())
+
+
+def get_report_executor():
+    """Worker pool bersama untuk render report (REPORT_WORKERS thread)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "REPORT_WORKERS", 2),
+                thread_name_prefix="report",
+            )
+        return _executor
+
+
+def _run_in_worker(func, *args):
+    try:
+        return func(*args)
+    finally:
+        # Thread worker memakai koneksi database sendiri
+        connection.close()
+
+
+def submit_report_task(func, *args):
+    return get_report_executor().submit(_run_in_worker, func, *args)
+
+
+def _iter_file_range(fileobj, length):
+    try:
+        while length > 0:
+            chunk = fileobj.read(min(STREAM_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+def ranged_file_response(request, fileobj, size, filename, content_type):
+    """
+    FileResponse untuk file dari storage, dengan dukungan satu Range
+    (bytes=start-end) untuk melanjutkan unduhan.
+    """
+    match = RANGE_RE.match(request.headers.get("Range", ""))
+    if match and any(match.groups()):
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            # bytes=-N: N byte terakhir
+            start = max(size - int(last), 0)
+            end = size - 1
+
+        if start > end or start >= size:
+            fileobj.close()
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        fileobj.seek(start)
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _iter_file_range(fileobj, length), status=206, content_type=content_type
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(length)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    else:
+        response = FileResponse(
+            fileobj, as_attachment=True, filename=filename, content_type=content_type
+        )
+        response["Content-Length"] = str(size)
+
+    response["Accept-Ranges"] = "bytes"
+    return response
+
+
+class ReportArtifactService:
+    """
+    Report PDF per grade yang dirender sekali per (grade, updated_at) dan
+    disimpan sebagai artifact di report_storage (privat). Perubahan sumber
+    report memajukan updated_at lewat mark_reports_stale (lihat signals).
+
+    Render dijalankan di worker pool (bukan di thread request) dan render
+    yang sama tidak pernah berjalan dua kali bersamaan. Unduhan dilayani
+    sebagai file stream dengan ETag/Last-Modified dan dukungan Range.
+
+    render: callable(grade) -> bytes PDF.
+    """
+
+    def __init__(self, kind, grade, render):
+        self.kind = kind
+        self.grade = grade
+        self.render = render
+
+    @property
+    def version(self):
+        key = (
+            f"{self.kind}:{self.grade.id}:{self.grade.updated_at.isoformat()}:"
+            f"{REPORT_LAYOUT_VERSION}"
+        )
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    @property
+    def directory(self):
+        return f"{REPORT_DIR}/{self.grade.student_id}"
+
+    @property
+    def prefix(self):
+        return f"{self.kind}-{self.grade.id}-"
+
+    @property
+    def name(self):
+        return f"{self.directory}/{self.prefix}{self.version}.pdf"
+
+    @property
+    def filename(self):
+        return f"{self.kind}-{self.grade.id}.pdf"
+
+    def exists(self):
+        return report_storage.exists(self.name)
+
+    def build(self):
+        """Render dan simpan artifact (dijalankan di worker)"""
+        name = self.name
+        if report_storage.exists(name):
+            return name
+        pdf_data = self.render(self.grade)
+        saved_name = report_storage.save(name, ContentFile(pdf_data))
+        self.remove_stale_versions(keep=saved_name)
+        return saved_name
+
+    def remove_stale_versions(self, keep):
+        try:
+            _, files = report_storage.listdir(self.directory)
+        except (FileNotFoundError, NotImplementedError):
+            return
+        for filename in files:
+            path = f"{self.directory}/{filename}"
+            if filename.startswith(self.prefix) and path != keep:
+                try:
+                    report_storage.delete(path)
+                except Exception as e:
+                    logger.warning(f"Gagal menghapus report lama {path}: {e}")
+
+    def submit(self):
+        """Jadwalkan render di worker pool; render yang sama digabung"""
+        name = self.name
+        with _inflight_lock:
+            future = _inflight.get(name)
+            if future is None:
+                future = submit_report_task(self.build)
+                _inflight[name] = future
+                future.add_done_callback(lambda _: self._forget(name))
+        return future
+
+    @staticmethod
+    def _forget(name):
+        with _inflight_lock:
+            _inflight.pop(name, None)
+
+    def ensure(self, timeout=None):
+        """
+        Nama artifact yang siap diunduh, atau None jika render belum selesai
+        dalam timeout (REPORT_RENDER_TIMEOUT detik).
+        """
+        if self.exists():
+            return self.name
+        if timeout is None:
+            timeout = getattr(settings, "REPORT_RENDER_TIMEOUT", 30)
+        try:
+            return self.submit().result(timeout=timeout)
+        except FutureTimeoutError:
+            return None
+
+    def serve(self, request):
+        etag = quote_etag(self.version)
+        last_modified = int(self.grade.updated_at.timestamp())
+
+        conditional = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if conditional is not None:
+            conditional["ETag"] = etag
+            return conditional
+
+        name = self.ensure()
+        if name is None:
+            response = HttpResponse(
+                '{"status": "rendering"}', status=202, content_type="application/json"
+            )
+            response["Retry-After"] = "2"
+            return response
+
+        response = ranged_file_response(
+            request,
+            report_storage.open(name, "rb"),
+            report_storage.size(name),
+            self.filename,
+            "application/pdf",
+        )
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        response["Cache-Control"] = "private, no-cache"
+        return response
@@ -0,0 +1,263 @@
+from django.conf import settings
+from django.db.models import Count, Avg, Q
+from django.utils import timezone
+from datetime import timedelta
+import logging
+
+import numpy as np
+
+from ..models import (
+    Material,
+    AssignmentSubmission,
+    GroupQuizResult,
+    ClassStudent,
+    Grade,
+    StudentMaterialProgress,
+    CustomUser,
+    StudentAttendance,
+)
+from ..utils.cache import get_or_set_tagged, subject_tag, class_tag
+
+logger = logging.getLogger(__name__)
+
+
+class SubjectAnalyticsService:
+    """
+    Statistik mata pelajaran untuk satu kelas (student, material, tugas,
+    quiz) yang dihitung dengan query teragregasi per student/material dan
+    reduksi NumPy, bukan query per baris.
+
+    Hasil di-cache per subject dan kelas, dan diinvalidasi lewat tag subject
+    oleh signal grade, absensi, progress, submission, dan hasil quiz.
+    Status online student tidak ikut di-cache.
+    """
+
+    def __init__(self, subject, class_obj):
+        self.subject = subject
+        self.class_obj = class_obj
+
+    def cache_key(self):
+        return f"subject-analytics:{self.subject.id}:{self.class_obj.id}"
+
+    def get_analytics(self):
+        data = get_or_set_tagged(
+            self.cache_key(),
+            [subject_tag(self.subject.id), class_tag(self.class_obj.id)],
+            self.compute_analytics,
+            timeout=getattr(settings, "SUBJECT_ANALYTICS_CACHE_TIMEOUT", 300),
+        )
+        return self.with_presence(data)
+
+    def with_presence(self, data):
+        """Tambahkan is_online/last_activity terbaru ke data student"""
+        presence = {
+            row["id"]: row
+            for row in CustomUser.objects.filter(
+                id__in=[s["id"] for s in data["students"]]
+            ).values("id", "is_online", "last_activity")
+        }
+        students = []
+        for student in data["students"]:
+            row = presence.get(student["id"], {})
+            students.append(
+                {
+                    **student,
+                    "is_online": row.get("is_online", False),
+                    "last_activity": row.get("last_activity"),
+                }
+            )
+        return {**data, "students": students}
+
+    def compute_analytics(self):
+        materials = list(
+            Material.objects.filter(subject=self.subject).annotate(
+                assignments_count=Count("assignments", distinct=True),
+                quizzes_count=Count("quizzes", distinct=True),
+            )
+        )
+        students = self.get_students(len(materials))
+        return {
+            "students": students,
+            "performance_overview": self.get_performance_overview(students),
+            "materials": self.get_materials(materials),
+            "assignment_stats": self.get_assignment_stats(),
+            "quiz_stats": self.get_quiz_stats(),
+            "recent_activities": self.get_recent_activities(),
+        }
+
+    def get_students(self, total_materials):
+        students = list(
+            CustomUser.objects.filter(
+                classstudent__class_id=self.class_obj, role__name="Student"
+            ).select_related("studentmotivationprofile")
+        )
+        student_ids = [student.id for student in students]
+
+        avg_grades = dict(
+            Grade.objects.filter(
+                student_id__in=student_ids, subject_name=self.subject.name
+            )
+            .values("student_id")
+            .annotate(avg=Avg("grade"))
+            .values_list("student_id", "avg")
+        )
+        present_counts = dict(
+            StudentAttendance.objects.filter(
+                student_id__in=student_ids,
+                material__subject=self.subject,
+                status="present",
+            )
+            .values("student_id")
+            .annotate(n=Count("id"))
+            .values_list("student_id", "n")
+        )
+
+        students_data = []
+        for student in students:
+            avg_grade = avg_grades.get(student.id) or 0
+            if total_materials > 0:
+                attendance_rate = round(
+                    (present_counts.get(student.id, 0) / total_materials) * 100, 1
+                )
+            else:
+                attendance_rate = 0
+
+            motivation_level = "medium"
+            if hasattr(student, "studentmotivationprofile"):
+                level = student.studentmotivationprofile.motivation_level
+                motivation_level = level.lower() if level else motivation_level
+
+            students_data.append(
+                {
+                    "id": student.id,
+                    "username": student.username,
+                    "full_name": f"{student.first_name} {student.last_name}".strip()
+                    or student.username,
+                    "email": student.email,
+                    "average_grade": round(avg_grade, 1) if avg_grade else 0,
+                    "attendance_rate": attendance_rate,
+                    "motivation_level": motivation_level,
+                }
+            )
+        return students_data
+
+    @staticmethod
+    def get_performance_overview(students):
+        grades = np.array([s["average_grade"] for s in students], dtype=float)
+        attendance = np.array([s["attendance_rate"] for s in students], dtype=float)
+        total_students = len(students)
+
+        return {
+            "average_grade": round(float(grades.mean()), 1) if total_students else 0,
+            "average_attendance": (
+                round(float(attendance.mean()), 1) if total_students else 0
+            ),
+            "total_students": total_students,
+            "high_performers": int(np.count_nonzero(grades >= 80)),
+            "average_performers": int(
+                np.count_nonzero((grades >= 60) & (grades < 80))
+            ),
+            "low_performers": int(np.count_nonzero(grades < 60)),
+        }
+
+    def get_materials(self, materials):
+        total_students_in_class = ClassStudent.objects.filter(
+            class_id=self.class_obj
+        ).count()
+        completed_counts = {}
+        if total_students_in_class > 0:
+            completed_counts = dict(
+                StudentMaterialProgress.objects.filter(
+                    material__in=materials,
+                    student__classstudent__class_id=self.class_obj,
+                    completion_percentage=100,
+                )
+                .values("material_id")
+                .annotate(n=Count("id"))
+                .values_list("material_id", "n")
+            )
+
+        materials_data = []
+        for material in materials:
+            if total_students_in_class > 0:
+                completion_rate = round(
+                    (completed_counts.get(material.id, 0) / total_students_in_class)
+                    * 100,
+                    1,
+                )
+            else:
+                completion_rate = 0
+
+            materials_data.append(
+                {
+                    "id": material.id,
+                    "title": material.title,
+                    "slug": material.slug,
+                    "assignments_count": material.assignments_count,
+                    "quizzes_count": material.quizzes_count,
+                    "completion_rate": completion_rate,
+                }
+            )
+        return materials_data
+
+    def get_assignment_stats(self):
+        stats = AssignmentSubmission.objects.filter(
+            assignment__material__subject=self.subject
+        ).aggregate(
+            pending=Count("id", filter=Q(grade__isnull=True, is_draft=False)),
+            graded=Count("id", filter=Q(grade__isnull=False)),
+            avg_grade=Avg("grade", filter=Q(grade__isnull=False)),
+        )
+        total_assignments = Material.objects.filter(subject=self.subject).aggregate(
+            n=Count("assignments")
+        )["n"]
+
+        return {
+            "total_assignments": total_assignments,
+            "pending_submissions": stats["pending"],
+            "graded_submissions": stats["graded"],
+            "average_grade": round(stats["avg_grade"] or 0, 1),
+        }
+
+    def get_quiz_stats(self):
+        individual = Grade.objects.filter(
+            quiz__material__subject=self.subject, type="quiz"
+        ).aggregate(n=Count("id"), avg=Avg("grade"))
+        group_results = GroupQuizResult.objects.filter(
+            group_quiz__quiz__material__subject=self.subject
+        ).count()
+        total_quizzes = Material.objects.filter(subject=self.subject).aggregate(
+            n=Count("quizzes")
+        )["n"]
+
+        return {
+            "total_quizzes": total_quizzes,
+            "individual_results": individual["n"],
+            "group_results": group_results,
+            "average_grade": round(individual["avg"] or 0, 1),
+        }
+
+    def get_recent_activities(self):
+        # Recent activities (last 7 days)
+        week_ago = timezone.now() - timedelta(days=7)
+        recent_submissions = (
+            AssignmentSubmission.objects.filter(
+                assignment__material__subject=self.subject,
+                submission_date__gte=week_ago,
+                is_draft=False,
+            )
+            .select_related("student", "assignment")
+            .order_by("-submission_date")[:10]
+        )
+
+        return [
+            {
+                "type": "assignment_submission",
+                "student_name": f"{submission.student.first_name} {submission.student.last_name}".strip()
+                or submission.student.username,
+                "assignment_title": submission.assignment.title,
+                "submission_date": submission.submission_date,
+                "grade": submission.grade,
+            }
+            for submission in recent_submissions
+        ]
@@ -0,0 +1,345 @@
+from django.conf import settings
+from django.db.models import Count, Avg
+from django.utils import timezone
+from datetime import datetime, timedelta
+import logging
+
+from ..models import (
+    SubjectClass,
+    ClassStudent,
+    Material,
+    Assignment,
+    Quiz,
+    AssignmentSubmission,
+    GroupQuiz,
+    GroupQuizResult,
+    CustomUser,
+    StudentActivity,
+    Schedule,
+    TeacherDashboardSnapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def mark_teacher_dashboards_dirty(teacher_ids, *sections):
+    """
+    Tandai bagian dashboard teacher sebagai dirty. teacher_ids boleh berupa
+    list atau queryset values_list (dijalankan sebagai subquery).
+    """
+    fields = {
+        f"{section}_dirty": True
+        for section in sections
+        if section in TeacherDashboardSnapshot.SECTIONS
+    }
+    if fields:
+        TeacherDashboardSnapshot.objects.filter(teacher_id__in=teacher_ids).update(
+            **fields
+        )
+
+
+def teacher_ids_for_subject(subject_id):
+    return SubjectClass.objects.filter(subject_id=subject_id).values_list(
+        "teacher_id", flat=True
+    )
+
+
+def teacher_ids_for_material(material_id):
+    return SubjectClass.objects.filter(subject__materials=material_id).values_list(
+        "teacher_id", flat=True
+    )
+
+
+def teacher_ids_for_class(class_id):
+    return SubjectClass.objects.filter(class_id=class_id).values_list(
+        "teacher_id", flat=True
+    )
+
+
+def teacher_ids_for_students(student_ids):
+    """Teacher yang mengajar kelas salah satu student"""
+    return SubjectClass.objects.filter(
+        class_id__in=ClassStudent.objects.filter(student_id__in=student_ids).values(
+            "class_id"
+        )
+    ).values_list("teacher_id", flat=True)
+
+
+class TeacherDashboardService:
+    """
+    Service untuk dashboard teacher berbasis TeacherDashboardSnapshot.
+
+    Dashboard dibaca dari satu baris snapshot. Hanya bagian yang ditandai
+    dirty oleh signal, atau yang lebih tua dari TEACHER_DASHBOARD_MAX_STALENESS
+    detik, yang dihitung ulang.
+    """
+
+    def __init__(self, teacher):
+        self.teacher = teacher
+        self.max_staleness = getattr(settings, "TEACHER_DASHBOARD_MAX_STALENESS", 300)
+        self._scope = None
+
+    def get_dashboard(self):
+        snapshot, _ = TeacherDashboardSnapshot.objects.get_or_create(
+            teacher=self.teacher
+        )
+
+        sections = self.sections_to_refresh(snapshot)
+        if sections:
+            self.refresh(snapshot, sections)
+
+        return self.to_response(snapshot.data)
+
+    def sections_to_refresh(self, snapshot):
+        data = snapshot.data or {}
+        refreshed = data.get("refreshed_at", {})
+        now = timezone.now()
+        today = timezone.now().date().isoformat()
+
+        sections = set(snapshot.dirty_sections)
+        if data.get("schedule_date") != today:
+            sections.add("overview")
+        for section in TeacherDashboardSnapshot.SECTIONS:
+            refreshed_at = refreshed.get(section)
+            if not refreshed_at or now - datetime.fromisoformat(
+                refreshed_at
+            ) > timedelta(seconds=self.max_staleness):
+                sections.add(section)
+        return [s for s in TeacherDashboardSnapshot.SECTIONS if s in sections]
+
+    def refresh(self, snapshot, sections):
+        # Reset flag sebelum menghitung supaya event yang masuk selama
+        # perhitungan tetap menandai dirty untuk pembacaan berikutnya
+        TeacherDashboardSnapshot.objects.filter(pk=snapshot.pk).update(
+            **{f"{section}_dirty": False for section in sections}
+        )
+
+        data = dict(snapshot.data or {})
+        refreshed = dict(data.get("refreshed_at", {}))
+        now = timezone.now()
+        for section in sections:
+            data.update(getattr(self, f"build_{section}")())
+            refreshed[section] = now.isoformat()
+        data["refreshed_at"] = refreshed
+
+        snapshot.data = data
+        snapshot.refreshed_at = now
+        snapshot.save(update_fields=["data", "refreshed_at"])
+
+    @staticmethod
+    def to_response(data):
+        assignments_count = data.get("assignments_count", 0)
+        recent_submissions = data.get("recent_submissions", [])
+        return {
+            "subjects_count": data.get("subjects_count", 0),
+            "classes_count": data.get("classes_count", 0),
+            "materials_count": data.get("materials_count", 0),
+            "assignments_count": assignments_count,
+            "quizzes_count": data.get("quizzes_count", 0),
+            "total_students": data.get("total_students", 0),
+            "pending_submissions": data.get("pending_submissions", 0),
+            "recent_submissions": recent_submissions,
+            "today_schedule": data.get("today_schedule", []),
+            "recent_activities": data.get("recent_activities", []),
+            "upcoming_deadlines": data.get("upcoming_deadlines", []),
+            "performance_overview": {
+                "avg_assignment_grade": data.get("avg_assignment_grade", 0),
+                "avg_quiz_score": data.get("avg_quiz_score", 0),
+                "total_quiz_attempts": data.get("total_quiz_attempts", 0),
+                "completion_rate": (
+                    round((len(recent_submissions) / assignments_count * 100), 1)
+                    if assignments_count > 0
+                    else 0
+                ),
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Builder per bagian dashboard
+    # ------------------------------------------------------------------
+
+    @property
+    def scope(self):
+        """Subject dan kelas yang diajar teacher"""
+        if self._scope is None:
+            rows = list(
+                SubjectClass.objects.filter(teacher=self.teacher).values_list(
+                    "subject_id", "class_id"
+                )
+            )
+            self._scope = {
+                "subjects_count": len(rows),
+                "subject_ids": [subject_id for subject_id, _ in rows],
+                "class_ids": sorted({class_id for _, class_id in rows}),
+            }
+        return self._scope
+
+    def materials(self):
+        return Material.objects.filter(subject_id__in=self.scope["subject_ids"])
+
+    def count_students(self):
+        return (
+            CustomUser.objects.filter(
+                classstudent__class_id__in=self.scope["class_ids"],
+                role__name="Student",
+            )
+            .distinct()
+            .count()
+        )
+
+    def build_overview(self):
+        materials = self.materials()
+        today = timezone.now().date()
+
+        today_schedule = Schedule.objects.filter(
+            class_obj_id__in=self.scope["class_ids"],
+            day_of_week=today.weekday(),
+            subject_id__in=self.scope["subject_ids"],
+        ).select_related("subject", "class_obj")
+
+        return {
+            "subjects_count": self.scope["subjects_count"],
+            "classes_count": len(self.scope["class_ids"]),
+            "materials_count": materials.count(),
+            "assignments_count": Assignment.objects.filter(
+                material__in=materials
+            ).count(),
+            "quizzes_count": Quiz.objects.filter(material__in=materials).count(),
+            "total_students": self.count_students(),
+            "today_schedule": [
+                {
+                    "id": schedule.id,
+                    "subject_name": schedule.subject.name,
+                    "class_name": schedule.class_obj.name,
+                    "time": schedule.time.strftime("%H:%M"),
+                    "day": schedule.get_day_of_week_display(),
+                }
+                for schedule in today_schedule
+            ],
+            "schedule_date": today.isoformat(),
+        }
+
+    def build_submissions(self):
+        materials = self.materials()
+        now = timezone.now()
+
+        submissions = AssignmentSubmission.objects.filter(
+            assignment__material__in=materials
+        )
+
+        pending_submissions = submissions.filter(
+            grade__isnull=True, is_draft=False
+        ).count()
+
+        avg_assignment_grade = (
+            submissions.filter(grade__isnull=False).aggregate(avg_grade=Avg("grade"))[
+                "avg_grade"
+            ]
+            or 0
+        )
+
+        # Recent submissions (last 7 days)
+        recent_submissions = (
+            submissions.filter(submission_date__gte=now - timedelta(days=7), is_draft=False)
+            .select_related("student", "assignment__material__subject")
+            .order_by("-submission_date")[:10]
+        )
+        recent_submissions_data = [
+            {
+                "student_name": f"{submission.student.first_name} {submission.student.last_name}".strip()
+                or submission.student.username,
+                "assignment_title": submission.assignment.title,
+                "subject_name": submission.assignment.material.subject.name,
+                "submission_date": submission.submission_date.isoformat(),
+                "grade": submission.grade,
+                "is_graded": submission.grade is not None,
+            }
+            for submission in recent_submissions
+        ]
+
+        # Upcoming deadlines: jumlah submission dihitung dalam satu query agregat
+        upcoming_assignments = list(
+            Assignment.objects.filter(
+                material__in=materials,
+                due_date__gte=now,
+                due_date__lte=now + timedelta(days=7),
+            )
+            .select_related("material__subject")
+            .order_by("due_date")[:5]
+        )
+        submission_counts = dict(
+            AssignmentSubmission.objects.filter(
+                assignment__in=upcoming_assignments, is_draft=False
+            )
+            .values("assignment_id")
+            .annotate(n=Count("id"))
+            .values_list("assignment_id", "n")
+        )
+        expected_submissions = self.count_students() if upcoming_assignments else 0
+
+        upcoming_deadlines = []
+        for assignment in upcoming_assignments:
+            total_submissions = submission_counts.get(assignment.id, 0)
+            upcoming_deadlines.append(
+                {
+                    "title": assignment.title,
+                    "subject_name": assignment.material.subject.name,
+                    "due_date": assignment.due_date.isoformat(),
+                    "days_left": (assignment.due_date - now).days,
+                    "submissions_count": total_submissions,
+                    "expected_submissions": expected_submissions,
+                    "completion_rate": (
+                        round((total_submissions / expected_submissions * 100), 1)
+                        if expected_submissions > 0
+                        else 0
+                    ),
+                }
+            )
+
+        return {
+            "pending_submissions": pending_submissions,
+            "recent_submissions": recent_submissions_data,
+            "upcoming_deadlines": upcoming_deadlines,
+            "avg_assignment_grade": round(avg_assignment_grade, 1),
+        }
+
+    def build_quizzes(self):
+        materials = self.materials()
+
+        total_quiz_attempts = GroupQuiz.objects.filter(
+            quiz__material__in=materials, submitted_at__isnull=False
+        ).count()
+
+        avg_quiz_score = (
+            GroupQuizResult.objects.filter(
+                group_quiz__quiz__material__in=materials
+            ).aggregate(avg_score=Avg("score"))["avg_score"]
+            or 0
+        )
+
+        return {
+            "total_quiz_attempts": total_quiz_attempts,
+            "avg_quiz_score": round(avg_quiz_score, 1),
+        }
+
+    def build_activities(self):
+        recent_activities = (
+            StudentActivity.objects.filter(
+                student__classstudent__class_id__in=self.scope["class_ids"]
+            )
+            .select_related("student")
+            .order_by("-timestamp")[:8]
+        )
+
+        return {
+            "recent_activities": [
+                {
+                    "student_name": f"{activity.student.first_name} {activity.student.last_name}".strip()
+                    or activity.student.username,
+                    "title": activity.title,
+                    "type": activity.activity_type,
+                    "time": activity.timestamp.isoformat(),
+                }
+                for activity in recent_activities
+            ]
+        }
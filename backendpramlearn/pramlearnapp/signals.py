@@ -1,11 +1,64 @@
 import logging
-from django.db.models.signals import post_save
+from django.core.handlers.asgi import ASGIHandler
+from django.core.signals import request_finished
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from django.core.cache import cache
 from .models import (
+    CustomUser,
+    Announcement,
+    Material,
+    Assignment,
+    Quiz,
+    ClassStudent,
+    SubjectClass,
+    Schedule,
+    TeacherDashboardSnapshot,
     GroupQuiz,
+    GroupQuizResult,
+    GroupQuizSubmission,
+    GroupMember,
+    Question,
+    StudentQuizAttempt,
+    StudentQuizAnswer,
+    MaterialYoutubeVideo,
+    StudentAttendance,
+    StudentActivity,
+    Grade,
+    GradeStatistics,
     AssignmentSubmission,
+    AssignmentAnswer,
+    AssignmentQuestion,
     StudentMaterialProgress,
     StudentMaterialActivity,
+    Subject,
+    ARCSQuestion,
+    ARCSResponse,
+)
+
+from .services.assignment_analytics_service import invalidate_assignment_analytics
+from .services.gradeService import GradeService
+from .middleware import ws_user_cache_key
+from .services.notification_service import NotificationService
+from .services.database_status_service import record_connection_created
+from .services.report_artifact_service import mark_reports_stale
+from .utils.cache import (
+    invalidate_tags,
+    material_tag,
+    student_tag,
+    quiz_tag,
+    class_tag,
+    subject_tag,
+    arcs_questionnaire_tag,
+)
+from .services.teacher_dashboard_service import (
+    mark_teacher_dashboards_dirty,
+    teacher_ids_for_subject,
+    teacher_ids_for_material,
+    teacher_ids_for_class,
+    teacher_ids_for_students,
 )
 
 logger = logging.getLogger(__name__)
@@ -121,3 +174,402 @@ def update_progress_on_assignment_submission(sender, instance, **kwargs):
 
         except Exception as e:
             logger.error(f"❌ Error updating progress for {instance.student}: {e}")
+
+
+@receiver([post_save, post_delete], sender=AssignmentSubmission)
+@receiver([post_save, post_delete], sender=AssignmentQuestion)
+def invalidate_assignment_analytics_cache(sender, instance, **kwargs):
+    """Hapus cache analytics assignment saat submission atau soal berubah"""
+    invalidate_assignment_analytics(instance.assignment_id)
+
+
+@receiver([post_save, post_delete], sender=AssignmentAnswer)
+def invalidate_assignment_analytics_on_answer(sender, instance, **kwargs):
+    """Hapus cache analytics assignment saat jawaban berubah"""
+    if AssignmentAnswer.submission.is_cached(instance):
+        assignment_id = instance.submission.assignment_id
+    else:
+        assignment_id = (
+            AssignmentSubmission.objects.filter(pk=instance.submission_id)
+            .values_list("assignment_id", flat=True)
+            .first()
+        )
+    if assignment_id:
+        invalidate_assignment_analytics(assignment_id)
+
+
+@receiver([post_save, post_delete], sender=AssignmentSubmission)
+def mark_dashboard_on_submission(sender, instance, **kwargs):
+    """Submission baru atau dinilai: refresh bagian submissions dashboard teacher"""
+    mark_teacher_dashboards_dirty(
+        SubjectClass.objects.filter(
+            subject__materials__assignments=instance.assignment_id
+        ).values_list("teacher_id", flat=True),
+        "submissions",
+    )
+
+
+@receiver(post_save, sender=GroupQuiz)
+@receiver([post_save, post_delete], sender=GroupQuizResult)
+def mark_dashboard_on_quiz_completion(sender, instance, **kwargs):
+    """Quiz kelompok selesai: refresh bagian quizzes dashboard teacher"""
+    if sender is GroupQuiz:
+        if not instance.submitted_at:
+            return
+        teacher_ids = SubjectClass.objects.filter(
+            subject__materials__quizzes=instance.quiz_id
+        )
+    else:
+        teacher_ids = SubjectClass.objects.filter(
+            subject__materials__quizzes__groupquiz=instance.group_quiz_id
+        )
+    mark_teacher_dashboards_dirty(
+        teacher_ids.values_list("teacher_id", flat=True), "quizzes"
+    )
+
+
+@receiver([post_save, post_delete], sender=Material)
+def mark_dashboard_on_material_change(sender, instance, **kwargs):
+    # Judul/subject material juga tampil di daftar tugas, quiz dan aktivitas
+    mark_teacher_dashboards_dirty(
+        teacher_ids_for_subject(instance.subject_id),
+        "overview",
+        "submissions",
+        "quizzes",
+        "activities",
+    )
+
+
+@receiver([post_save, post_delete], sender=StudentActivity)
+def mark_dashboard_on_student_activity(sender, instance, **kwargs):
+    mark_teacher_dashboards_dirty(
+        teacher_ids_for_students([instance.student_id]), "activities"
+    )
+
+
+@receiver([post_save, post_delete], sender=Assignment)
+@receiver([post_save, post_delete], sender=Quiz)
+def mark_dashboard_on_content_change(sender, instance, **kwargs):
+    sections = ["overview", "submissions"] if sender is Assignment else ["overview"]
+    mark_teacher_dashboards_dirty(
+        teacher_ids_for_material(instance.material_id), *sections
+    )
+
+
+@receiver([post_save, post_delete], sender=ClassStudent)
+@receiver([post_save, post_delete], sender=Schedule)
+def mark_dashboard_on_class_change(sender, instance, **kwargs):
+    class_id = (
+        instance.class_id_id if sender is ClassStudent else instance.class_obj_id
+    )
+    mark_teacher_dashboards_dirty(teacher_ids_for_class(class_id), "overview")
+
+
+@receiver([post_save, post_delete], sender=SubjectClass)
+def mark_dashboard_on_subject_class_change(sender, instance, **kwargs):
+    mark_teacher_dashboards_dirty(
+        [instance.teacher_id], *TeacherDashboardSnapshot.SECTIONS
+    )
+
+
+# ----------------------------------------------------------------------
+# Invalidasi cache berbasis tag (lihat pramlearnapp.utils.cache)
+# ----------------------------------------------------------------------
+
+
+def material_class_tags(material_id):
+    return [
+        class_tag(class_id)
+        for class_id in SubjectClass.objects.filter(
+            subject__materials=material_id
+        ).values_list("class_id", flat=True)
+    ]
+
+
+@receiver([post_save, post_delete], sender=Material)
+def invalidate_cache_on_material(sender, instance, **kwargs):
+    invalidate_tags(material_tag(instance.pk), *material_class_tags(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Assignment)
+@receiver([post_save, post_delete], sender=Quiz)
+def invalidate_cache_on_material_content(sender, instance, **kwargs):
+    tags = [material_tag(instance.material_id)]
+    if sender is Quiz:
+        tags.append(quiz_tag(instance.pk))
+    invalidate_tags(*tags, *material_class_tags(instance.material_id))
+
+
+@receiver([post_save, post_delete], sender=AssignmentQuestion)
+def invalidate_cache_on_assignment_question(sender, instance, **kwargs):
+    material_id = (
+        Assignment.objects.filter(pk=instance.assignment_id)
+        .values_list("material_id", flat=True)
+        .first()
+    )
+    invalidate_tags(material_tag(material_id) if material_id else None)
+
+
+@receiver([post_save, post_delete], sender=Question)
+def invalidate_cache_on_quiz_question(sender, instance, **kwargs):
+    material_id = (
+        Quiz.objects.filter(pk=instance.quiz_id)
+        .values_list("material_id", flat=True)
+        .first()
+    )
+    invalidate_tags(
+        quiz_tag(instance.quiz_id), material_tag(material_id) if material_id else None
+    )
+
+
+@receiver([post_save, post_delete], sender=MaterialYoutubeVideo)
+def invalidate_cache_on_material_video(sender, instance, **kwargs):
+    invalidate_tags(material_tag(instance.material_id))
+
+
+@receiver([post_save, post_delete], sender=AssignmentSubmission)
+def invalidate_cache_on_submission(sender, instance, **kwargs):
+    material_id = (
+        Assignment.objects.filter(pk=instance.assignment_id)
+        .values_list("material_id", flat=True)
+        .first()
+    )
+    invalidate_tags(
+        student_tag(instance.student_id),
+        material_tag(material_id) if material_id else None,
+    )
+
+
+@receiver([post_save, post_delete], sender=StudentMaterialProgress)
+@receiver([post_save, post_delete], sender=StudentMaterialActivity)
+@receiver([post_save, post_delete], sender=StudentAttendance)
+def invalidate_cache_on_student_material(sender, instance, **kwargs):
+    invalidate_tags(
+        student_tag(instance.student_id), material_tag(instance.material_id)
+    )
+
+
+@receiver([post_save, post_delete], sender=Grade)
+@receiver([post_save, post_delete], sender=StudentActivity)
+def invalidate_cache_on_student_record(sender, instance, **kwargs):
+    invalidate_tags(student_tag(instance.student_id))
+
+
+@receiver([post_save, post_delete], sender=StudentQuizAttempt)
+def invalidate_cache_on_quiz_attempt(sender, instance, **kwargs):
+    invalidate_tags(student_tag(instance.student_id), quiz_tag(instance.quiz_id))
+
+
+@receiver([post_save, post_delete], sender=GroupQuiz)
+def invalidate_cache_on_group_quiz(sender, instance, **kwargs):
+    invalidate_tags(quiz_tag(instance.quiz_id))
+
+
+@receiver([post_save, post_delete], sender=GroupQuizResult)
+@receiver([post_save, post_delete], sender=GroupQuizSubmission)
+def invalidate_cache_on_group_quiz_result(sender, instance, **kwargs):
+    quiz_id = (
+        GroupQuiz.objects.filter(pk=instance.group_quiz_id)
+        .values_list("quiz_id", flat=True)
+        .first()
+    )
+    invalidate_tags(quiz_tag(quiz_id) if quiz_id else None)
+
+
+@receiver([post_save, post_delete], sender=GroupMember)
+def invalidate_cache_on_group_member(sender, instance, **kwargs):
+    invalidate_tags(student_tag(instance.student_id))
+
+
+@receiver([post_save, post_delete], sender=ClassStudent)
+def invalidate_cache_on_class_student(sender, instance, **kwargs):
+    invalidate_tags(student_tag(instance.student_id), class_tag(instance.class_id_id))
+
+
+@receiver([post_save, post_delete], sender=SubjectClass)
+@receiver([post_save, post_delete], sender=Schedule)
+def invalidate_cache_on_class_structure(sender, instance, **kwargs):
+    class_id = (
+        instance.class_id_id if sender is SubjectClass else instance.class_obj_id
+    )
+    invalidate_tags(class_tag(class_id))
+
+
+# ----------------------------------------------------------------------
+# Invalidasi statistik mata pelajaran (SubjectAnalyticsService)
+# ----------------------------------------------------------------------
+
+
+def invalidate_subjects(subject_ids):
+    invalidate_tags(*[subject_tag(sid) for sid in subject_ids if sid])
+
+
+@receiver([post_save, post_delete], sender=Grade)
+def invalidate_subject_analytics_on_grade(sender, instance, **kwargs):
+    # Statistik subject mengelompokkan grade berdasarkan subject_name
+    invalidate_subjects(
+        Subject.objects.filter(name=instance.subject_name).values_list("id", flat=True)
+    )
+
+
+@receiver([post_save, post_delete], sender=StudentAttendance)
+@receiver([post_save, post_delete], sender=StudentMaterialProgress)
+@receiver([post_save, post_delete], sender=Assignment)
+@receiver([post_save, post_delete], sender=Quiz)
+def invalidate_subject_analytics_on_material_record(sender, instance, **kwargs):
+    invalidate_subjects(
+        Material.objects.filter(pk=instance.material_id).values_list(
+            "subject_id", flat=True
+        )
+    )
+
+
+@receiver([post_save, post_delete], sender=Material)
+def invalidate_subject_analytics_on_material(sender, instance, **kwargs):
+    invalidate_subjects([instance.subject_id])
+
+
+@receiver([post_save, post_delete], sender=AssignmentSubmission)
+def invalidate_subject_analytics_on_submission(sender, instance, **kwargs):
+    invalidate_subjects(
+        Assignment.objects.filter(pk=instance.assignment_id).values_list(
+            "material__subject_id", flat=True
+        )
+    )
+
+
+@receiver([post_save, post_delete], sender=GroupQuizResult)
+def invalidate_subject_analytics_on_group_quiz_result(sender, instance, **kwargs):
+    invalidate_subjects(
+        GroupQuiz.objects.filter(pk=instance.group_quiz_id).values_list(
+            "quiz__material__subject_id", flat=True
+        )
+    )
+
+
+# ----------------------------------------------------------------------
+# Invalidasi analisis ARCS (ARCSAnalyticsService)
+# ----------------------------------------------------------------------
+
+
+@receiver(post_save, sender=ARCSResponse)
+def invalidate_arcs_analytics_on_response(sender, instance, **kwargs):
+    # Hanya response yang sudah selesai yang ikut dihitung
+    if instance.is_completed:
+        invalidate_tags(arcs_questionnaire_tag(instance.questionnaire_id))
+
+
+@receiver(post_delete, sender=ARCSResponse)
+@receiver([post_save, post_delete], sender=ARCSQuestion)
+def invalidate_arcs_analytics_on_change(sender, instance, **kwargs):
+    invalidate_tags(arcs_questionnaire_tag(instance.questionnaire_id))
+
+
+# ----------------------------------------------------------------------
+# Snapshot statistik grade siswa (GradeStatistics)
+# ----------------------------------------------------------------------
+
+
+@receiver(post_save, sender=Grade)
+def update_grade_statistics_on_grade(sender, instance, created, **kwargs):
+    try:
+        GradeService(instance.student).record_grade(instance, created=created)
+    except Exception as e:
+        logger.error(f"Error updating grade statistics: {e}")
+
+
+@receiver(post_delete, sender=Grade)
+def rebuild_grade_statistics_on_delete(sender, instance, **kwargs):
+    # Jangan membuat snapshot baru untuk siswa yang sedang dihapus
+    stats = GradeStatistics.objects.filter(student_id=instance.student_id).first()
+    if stats:
+        stats.update_statistics()
+
+
+# ----------------------------------------------------------------------
+# Versi artifact report PDF (ReportArtifactService)
+# ----------------------------------------------------------------------
+
+
+@receiver([post_save, post_delete], sender=AssignmentAnswer)
+def mark_reports_stale_on_assignment_answer(sender, instance, **kwargs):
+    mark_reports_stale(
+        Grade.objects.filter(assignment_submission_id=instance.submission_id)
+    )
+
+
+@receiver([post_save, post_delete], sender=StudentQuizAnswer)
+def mark_reports_stale_on_quiz_answer(sender, instance, **kwargs):
+    mark_reports_stale(Grade.objects.filter(quiz_attempt_id=instance.attempt_id))
+
+
+@receiver([post_save, post_delete], sender=GroupQuizSubmission)
+def mark_reports_stale_on_group_quiz_answer(sender, instance, **kwargs):
+    mark_reports_stale(Grade.objects.filter(group_quiz_id=instance.group_quiz_id))
+
+
+@receiver([post_save, post_delete], sender=AssignmentQuestion)
+def mark_reports_stale_on_assignment_question(sender, instance, **kwargs):
+    mark_reports_stale(Grade.objects.filter(assignment_id=instance.assignment_id))
+
+
+@receiver([post_save, post_delete], sender=Question)
+def mark_reports_stale_on_quiz_question(sender, instance, **kwargs):
+    mark_reports_stale(Grade.objects.filter(quiz_id=instance.quiz_id))
+
+
+# ----------------------------------------------------------------------
+# Cache user autentikasi WebSocket (JWTAuthMiddleware)
+# ----------------------------------------------------------------------
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_ws_user_cache(sender, instance, **kwargs):
+    cache.delete(ws_user_cache_key(instance.pk))
+
+
+# ----------------------------------------------------------------------
+# Notifikasi pengumuman (NotificationService)
+# ----------------------------------------------------------------------
+
+
+@receiver(post_save, sender=Announcement)
+def notify_announcement(sender, instance, created, **kwargs):
+    if not created or not instance.is_active:
+        return
+    fields = {
+        "type": "announcement",
+        "announcement": instance,
+        "data": {"priority": instance.priority},
+    }
+    try:
+        if instance.target_audience == "all":
+            NotificationService.notify_all_students(
+                instance.title, instance.content, **fields
+            )
+        elif instance.target_audience == "class" and instance.target_class_id:
+            NotificationService.notify_classes(
+                [instance.target_class_id], instance.title, instance.content, **fields
+            )
+    except Exception as e:
+        logger.error(f"Error sending announcement notification: {e}")
+
+
+# ----------------------------------------------------------------------
+# Koneksi database (DatabaseStatusService)
+# ----------------------------------------------------------------------
+
+
+@receiver(connection_created)
+def count_connection_created(sender, connection, **kwargs):
+    record_connection_created(connection.alias)
+
+
+@receiver(request_finished, sender=ASGIHandler)
+def close_asgi_request_connections(sender, **kwargs):
+    # Request HTTP di ASGI berjalan di thread sendiri yang dibuang setelah
+    # request selesai, jadi koneksinya tidak bisa dipakai ulang: tutup
+    # sekarang daripada menggantung sampai garbage collection. Koneksi
+    # persisten (CONN_MAX_AGE) tetap dipakai ulang oleh database_sync_to_async
+    # di consumer WebSocket, yang berjalan di satu thread bersama.
+    connections.close_all()
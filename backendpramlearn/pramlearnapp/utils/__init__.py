@@ -1,5 +1,28 @@
 from .log_student_activity import log_student_activity
+from .cache import (
+    make_tag,
+    material_tag,
+    student_tag,
+    quiz_tag,
+    class_tag,
+    subject_tag,
+    arcs_questionnaire_tag,
+    invalidate_tags,
+    get_or_set_tagged,
+)
+from .streaming import iterate_in_thread, streaming_response
 
 __all__ = [
     'log_student_activity',
+    'make_tag',
+    'material_tag',
+    'student_tag',
+    'quiz_tag',
+    'class_tag',
+    'subject_tag',
+    'arcs_questionnaire_tag',
+    'invalidate_tags',
+    'get_or_set_tagged',
+    'iterate_in_thread',
+    'streaming_response',
 ]
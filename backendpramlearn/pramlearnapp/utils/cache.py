@@ -0,0 +1,110 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+TAG_PREFIX = "tag"
+
+
+def make_tag(kind, object_id):
+    """Nama tag cache, contoh: make_tag("material", 5) -> "tag:material:5" """
+    return f"{TAG_PREFIX}:{kind}:{object_id}"
+
+
+def material_tag(material_id):
+    return make_tag("material", material_id)
+
+
+def student_tag(student_id):
+    return make_tag("student", student_id)
+
+
+def quiz_tag(quiz_id):
+    return make_tag("quiz", quiz_id)
+
+
+def class_tag(class_id):
+    return make_tag("class", class_id)
+
+
+def subject_tag(subject_id):
+    return make_tag("subject", subject_id)
+
+
+def arcs_questionnaire_tag(questionnaire_id):
+    return make_tag("arcs_questionnaire", questionnaire_id)
+
+
+def get_tag_versions(tags):
+    """
+    Ambil versi setiap tag. Tag yang belum ada diberi versi baru, sehingga
+    entry lama yang mungkin masih tersimpan tidak akan terbaca lagi.
+    """
+    tags = sorted(set(tags))
+    if not tags:
+        return {}
+    versions = cache.get_many(tags)
+    missing = {tag: uuid.uuid4().hex[:12] for tag in tags if tag not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return versions
+
+
+def invalidate_tags(*tags):
+    """Invalidasi semua entry cache yang memakai salah satu tag ini"""
+    tags = {tag for tag in tags if tag}
+    if tags:
+        cache.set_many({tag: uuid.uuid4().hex[:12] for tag in tags}, timeout=None)
+
+
+def tagged_key(key, tags):
+    """Gabungkan key dengan versi tag saat ini"""
+    versions = get_tag_versions(tags)
+    signature = "|".join(f"{tag}={versions[tag]}" for tag in sorted(versions))
+    digest = hashlib.md5(signature.encode()).hexdigest()
+    return f"{key}:{digest}"
+
+
+def get_or_set_tagged(key, tags, compute, timeout=None):
+    """
+    Ambil nilai dari cache berdasarkan key dan tag, atau hitung dengan
+    compute() lalu simpan. Nilai None tidak di-cache.
+    """
+    if timeout is None:
+        timeout = getattr(settings, "CACHE_DEFAULT_TIMEOUT", 300)
+    full_key = tagged_key(key, tags)
+    value = cache.get(full_key)
+    if value is None:
+        value = compute()
+        if value is not None:
+            cache.set(full_key, value, timeout)
+    return value
+
+
+def student_scope_tags(student_id):
+    """Tag untuk view student: data milik student dan kelas yang diikuti"""
+    from pramlearnapp.models import ClassStudent
+
+    class_ids = ClassStudent.objects.filter(student_id=student_id).values_list(
+        "class_id", flat=True
+    )
+    return [student_tag(student_id)] + [class_tag(cid) for cid in class_ids]
+
+
+def teacher_scope_tags(teacher_id):
+    """Tag untuk view teacher: kelas dan material dari subject yang diajar"""
+    from pramlearnapp.models import SubjectClass, Material
+
+    subject_classes = list(
+        SubjectClass.objects.filter(teacher_id=teacher_id).values_list(
+            "subject_id", "class_id"
+        )
+    )
+    material_ids = Material.objects.filter(
+        subject_id__in=[subject_id for subject_id, _ in subject_classes]
+    ).values_list("id", flat=True)
+    return [class_tag(cid) for _, cid in subject_classes] + [
+        material_tag(mid) for mid in material_ids
+    ]
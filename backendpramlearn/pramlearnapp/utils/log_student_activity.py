@@ -1,12 +1,7 @@
-from pramlearnapp.models.studentActivity import StudentActivity
-from django.utils import timezone
+def log_student_activity(student, title, activity_type, related_object_id=None):
+    """Catat aktivitas siswa lewat buffer asinkron (lihat ActivityLogService)"""
+    from pramlearnapp.services.activity_log_service import ActivityLogService
 
-
-def log_student_activity(student, title, description, type_):
-    StudentActivity.objects.create(
-        student=student,
-        title=title,
-        description=description,
-        type=type_,
-        timestamp=timezone.now(),
+    return ActivityLogService.record(
+        student, activity_type, title, related_object_id=related_object_id
     )
@@ -0,0 +1,37 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+_END = object()
+
+
+def _next_chunk(iterator):
+    return next(iterator, _END)
+
+
+async def iterate_in_thread(iterable):
+    """
+    Iterator async yang mengambil chunk generator sync satu per satu lewat
+    sync_to_async. Semua next() berjalan di thread sync yang sama
+    (thread_sensitive), sehingga server-side cursor tetap valid.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = await sync_to_async(_next_chunk, thread_sensitive=True)(iterator)
+        if chunk is _END:
+            return
+        yield chunk
+
+
+def streaming_response(request, iterable, **kwargs):
+    """
+    StreamingHttpResponse yang benar-benar di-stream per chunk.
+
+    Di ASGI, Django 5.0 mengonsumsi iterator sync dengan
+    sync_to_async(list) (seluruh isi ditahan di memori sebelum byte
+    pertama dikirim), jadi generator dibungkus iterate_in_thread. Di WSGI
+    iterator sync tetap dipakai langsung.
+    """
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        iterable = iterate_in_thread(iterable)
+    return StreamingHttpResponse(iterable, **kwargs)
@@ -1,12 +1,13 @@
 from pramlearnapp.views.admin.userViewSet import UserViewSet, RegisterView
 from pramlearnapp.views.admin.roleViewSet import RoleViewSet
 from pramlearnapp.views.admin.authView import LoginView
+from pramlearnapp.views.admin.databaseStatusView import DatabaseStatusView
 
 from pramlearnapp.views.student.availableStudentView import AvailableStudentListView, AvailableAndRelatedStudentListView
 from pramlearnapp.views.student.classStudentViewSet import ClassStudentViewSet, ClassStudentDetail
 from pramlearnapp.views.student.studentMotivationProfileView import StudentMotivationProfileView, UploadARCSCSVView
 from pramlearnapp.views.student.studentViewSet import StudentViewSet
-from pramlearnapp.views.student.attendanceView import MaterialAttendanceListView, update_attendance, bulk_create_attendance
+from pramlearnapp.views.student.attendanceView import MaterialAttendanceListView, update_attendance, bulk_create_attendance, bulk_update_attendance, attendance_sheet
 from pramlearnapp.views.student.studentAssignmentViewSet import (
     StudentAvailableAssignmentsView, StudentAssignmentQuestionsView,
     StudentAssignmentDraftView, StudentAssignmentSubmitView,
@@ -57,11 +58,12 @@ from pramlearnapp.views.student.quizViewSet import (
 
 __all__ = [
     # Admin
-    "UserViewSet", "RegisterView", "RoleViewSet", "LoginView",
+    "UserViewSet", "RegisterView", "RoleViewSet", "LoginView", "DatabaseStatusView",
     # Student
     "AvailableStudentListView", "AvailableAndRelatedStudentListView", "ClassStudentViewSet", "ClassStudentDetail",
     "StudentMotivationProfileView", "UploadARCSCSVView", "StudentViewSet",
     "MaterialAttendanceListView", "update_attendance", "bulk_create_attendance",
+    "bulk_update_attendance", "attendance_sheet",
     "StudentAvailableAssignmentsView", "StudentAssignmentQuestionsView", "StudentAssignmentDraftView",
     "StudentAssignmentSubmitView", "StudentAssignmentSubmissionsView", "StudentAssignmentBySlugView", "StudentAssignmentAnswersView",
     "StudentGradesView", "StudentGradeAnalyticsView", "QuizAttemptReviewView", "AssignmentFeedbackByGradeView", "QuizReviewView", "GroupQuizReviewView",
@@ -1,10 +1,12 @@
 from pramlearnapp.views.admin.userViewSet import UserViewSet, RegisterView
 from pramlearnapp.views.admin.roleViewSet import RoleViewSet
 from pramlearnapp.views.admin.authView import LoginView
+from pramlearnapp.views.admin.databaseStatusView import DatabaseStatusView
 
 __all__ = [
     "UserViewSet",
     "RegisterView",
     "RoleViewSet",
     "LoginView",
+    "DatabaseStatusView",
 ]
@@ -0,0 +1,16 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from pramlearnapp.permissions import IsAdminUser
+from pramlearnapp.services.database_status_service import DatabaseStatusService
+
+
+class DatabaseStatusView(APIView):
+    """
+    Metrik koneksi database proses ini: konfigurasi koneksi persisten,
+    jumlah koneksi yang dibuka, dan koneksi server PostgreSQL per state.
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        return Response(DatabaseStatusService.snapshot())
@@ -1,9 +1,10 @@
 from rest_framework import viewsets, permissions
 from pramlearnapp.models import Role
 from pramlearnapp.serializers import RoleSerializer
+from pramlearnapp.mixins import ProjectedListMixin
 
 
-class RoleViewSet(viewsets.ModelViewSet):
+class RoleViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     """
     ViewSet untuk melihat dan mengedit instance Role.
     """
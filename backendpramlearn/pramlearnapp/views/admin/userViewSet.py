@@ -2,9 +2,10 @@ from rest_framework import viewsets, permissions, generics
 from pramlearnapp.models import CustomUser
 from pramlearnapp.permissions import IsAdminUser
 from pramlearnapp.serializers import UserSerializer
+from pramlearnapp.mixins import ProjectedListMixin
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     """
     ViewSet untuk melihat dan mengedit instance User.
     """
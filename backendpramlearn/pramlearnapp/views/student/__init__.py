@@ -2,7 +2,7 @@ from pramlearnapp.views.student.availableStudentView import AvailableStudentList
 from pramlearnapp.views.student.classStudentViewSet import ClassStudentViewSet, ClassStudentDetail
 from pramlearnapp.views.student.studentMotivationProfileView import StudentMotivationProfileView, UploadARCSCSVView
 from pramlearnapp.views.student.studentViewSet import StudentViewSet
-from pramlearnapp.views.student.attendanceView import MaterialAttendanceListView, update_attendance, bulk_create_attendance
+from pramlearnapp.views.student.attendanceView import MaterialAttendanceListView, update_attendance, bulk_create_attendance, bulk_update_attendance, attendance_sheet
 from pramlearnapp.views.student.studentDashboardView import StudentDashboardView
 
 __all__ = [
@@ -16,4 +16,6 @@ __all__ = [
     "MaterialAttendanceListView",
     "update_attendance",
     "bulk_create_attendance",
+    "bulk_update_attendance",
+    "attendance_sheet",
 ]
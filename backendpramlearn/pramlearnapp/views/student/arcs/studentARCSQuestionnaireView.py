@@ -460,6 +460,10 @@ class StudentARCSResponseSubmitView(APIView):
         """
         Menyimpan jawaban individual untuk setiap pertanyaan
 
+        Pertanyaan kuesioner dimuat sekali ke dict, jawaban divalidasi di
+        memori, lalu semua jawaban di-upsert dengan satu bulk_create
+        (update_conflicts pada pasangan response-question).
+
         Args:
             response (ARCSResponse): Objek response
             questionnaire (ARCSQuestionnaire): Objek kuesioner
@@ -468,38 +472,39 @@ class StudentARCSResponseSubmitView(APIView):
         Returns:
             list: Daftar objek ARCSAnswer yang telah disimpan
         """
-        saved_answers = []
+        questions = {
+            question.id: question
+            for question in ARCSQuestion.objects.filter(questionnaire=questionnaire)
+        }
 
+        # Satu jawaban per pertanyaan; jawaban terakhir yang dipakai
+        answers = {}
         for answer_data in answers_data:
             question_id = answer_data.get("question_id")
-
             try:
-                question = ARCSQuestion.objects.get(
-                    id=question_id, questionnaire=questionnaire
-                )
-            except ARCSQuestion.DoesNotExist:
+                question = questions.get(int(question_id))
+            except (TypeError, ValueError):
+                question = None
+            if question is None:
                 logger.warning(f"Pertanyaan dengan ID {question_id} tidak ditemukan")
                 continue
 
-            # Membuat atau memperbarui jawaban
-            answer, answer_created = ARCSAnswer.objects.get_or_create(
+            answers[question.id] = ARCSAnswer(
                 response=response,
                 question=question,
-                defaults={
-                    "text_value": answer_data.get("text_value"),
-                    "choice_value": answer_data.get("choice_value"),
-                    "likert_value": answer_data.get("likert_value"),
-                },
+                text_value=answer_data.get("text_value"),
+                choice_value=answer_data.get("choice_value"),
+                likert_value=answer_data.get("likert_value"),
             )
 
-            if not answer_created:
-                # Memperbarui jawaban yang sudah ada
-                answer.text_value = answer_data.get("text_value")
-                answer.choice_value = answer_data.get("choice_value")
-                answer.likert_value = answer_data.get("likert_value")
-                answer.save()
-
-            saved_answers.append(answer)
+        saved_answers = list(answers.values())
+        if saved_answers:
+            ARCSAnswer.objects.bulk_create(
+                saved_answers,
+                update_conflicts=True,
+                unique_fields=["response", "question"],
+                update_fields=["text_value", "choice_value", "likert_value"],
+            )
 
         logger.info(f"Berhasil menyimpan {len(saved_answers)} jawaban")
         return saved_answers
@@ -3,13 +3,15 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from pramlearnapp.models import StudentAttendance
+from pramlearnapp.models import StudentAttendance, SubjectClass
 from pramlearnapp.models.material import Material
-from pramlearnapp.models.classes import ClassStudent
 from pramlearnapp.serializers import StudentAttendanceSerializer
+from pramlearnapp.mixins import ProjectedListMixin
+from pramlearnapp.permissions import IsTeacherUser
+from pramlearnapp.services.attendance_service import AttendanceService
 
 
-class MaterialAttendanceListView(generics.ListAPIView):
+class MaterialAttendanceListView(ProjectedListMixin, generics.ListAPIView):
     """
     Get all attendance records for a specific material
     """
@@ -32,17 +34,21 @@ def update_attendance(request, material_id, student_id):
     try:
         material = get_object_or_404(Material, id=material_id)
 
-        # Get or create attendance record
-        attendance, created = StudentAttendance.objects.get_or_create(
-            student_id=student_id,
-            material_id=material_id,
-            defaults={'status': 'absent', 'updated_by': request.user}
-        )
+        # Tanpa status, status yang sudah ada dipertahankan
+        new_status = request.data.get('status')
+        if new_status is None:
+            new_status = StudentAttendance.objects.filter(
+                student_id=student_id, material_id=material_id
+            ).values_list('status', flat=True).first() or 'absent'
 
-        # Update status and who updated it
-        attendance.status = request.data.get('status', attendance.status)
-        attendance.updated_by = request.user
-        attendance.save()
+        # Perubahan tunggal memakai jalur batch yang sama (satu broadcast)
+        AttendanceService(material).apply_changes(
+            [{'student_id': student_id, 'status': new_status}],
+            updated_by=request.user,
+        )
+        attendance = StudentAttendance.objects.select_related(
+            'student', 'updated_by'
+        ).get(student_id=student_id, material_id=material_id)
 
         serializer = StudentAttendanceSerializer(attendance)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -62,29 +68,12 @@ def bulk_create_attendance(request, material_id):
     """
     try:
         material = get_object_or_404(Material, id=material_id)
-        subject = material.subject
-        subject_class = subject.subject_class
-        class_id = subject_class.class_id.id
-
-        # Get all students in the class
-        student_ids = ClassStudent.objects.filter(
-            class_id=class_id
-        ).values_list('student_id', flat=True)
-
-        # Create attendance records for students who don't have one
-        created_count = 0
-        for student_id in student_ids:
-            attendance, created = StudentAttendance.objects.get_or_create(
-                student_id=student_id,
-                material_id=material_id,
-                defaults={'status': 'absent', 'updated_by': request.user}
-            )
-            if created:
-                created_count += 1
+        created_count, total_students = AttendanceService(
+            material).create_for_class(updated_by=request.user)
 
         return Response({
             'message': f'Created {created_count} attendance records',
-            'total_students': len(student_ids)
+            'total_students': total_students
         }, status=status.HTTP_201_CREATED)
 
     except Exception as e:
@@ -92,3 +81,57 @@ def bulk_create_attendance(request, material_id):
             {'error': str(e)},
             status=status.HTTP_400_BAD_REQUEST
         )
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsTeacherUser])
+def bulk_update_attendance(request, material_id):
+    """
+    Apply many attendance changes in one request (teacher of the material only).
+    Body: {"changes": [{"student_id": 1, "status": "present"}, ...]}
+    """
+    material = get_object_or_404(Material, id=material_id)
+    if not SubjectClass.objects.filter(
+        subject_id=material.subject_id, teacher=request.user
+    ).exists():
+        return Response(
+            {'error': 'Anda tidak mengajar materi ini'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    changes = request.data.get('changes', [])
+    if not isinstance(changes, list):
+        return Response(
+            {'error': 'changes must be a list'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        changed = AttendanceService(material).apply_changes(
+            changes, updated_by=request.user
+        )
+    except (ValueError, KeyError, TypeError) as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    return Response({
+        'updated_count': len(changed),
+        'changes': [
+            {'student_id': row.student_id, 'status': row.status}
+            for row in changed
+        ],
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def attendance_sheet(request, material_id):
+    """
+    Attendance sheet for all students in the material's class
+    """
+    material = get_object_or_404(
+        Material.objects.select_related('subject__subject_class'),
+        id=material_id
+    )
+    return Response(AttendanceService(material).sheet(), status=status.HTTP_200_OK)
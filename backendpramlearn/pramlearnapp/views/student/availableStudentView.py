@@ -1,9 +1,10 @@
 from rest_framework import generics
 from pramlearnapp.models import CustomUser, ClassStudent
 from pramlearnapp.serializers import AvailableStudentSerializer
+from pramlearnapp.mixins import ProjectedListMixin
 
 
-class AvailableStudentListView(generics.ListAPIView):
+class AvailableStudentListView(ProjectedListMixin, generics.ListAPIView):
     serializer_class = AvailableStudentSerializer
 
     def get_queryset(self):
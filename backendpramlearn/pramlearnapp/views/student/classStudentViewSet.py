@@ -6,9 +6,10 @@ from rest_framework import status
 from pramlearnapp.models import ClassStudent, CustomUser, StudentMotivationProfile
 from pramlearnapp.serializers import ClassStudentSerializer
 from pramlearnapp.serializers.student.studentSerializer import StudentSerializer
+from pramlearnapp.mixins import ProjectedListMixin
 
 
-class ClassStudentViewSet(viewsets.ModelViewSet):
+class ClassStudentViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     queryset = ClassStudent.objects.all()
     serializer_class = ClassStudentSerializer
     permission_classes = [permissions.IsAuthenticated]
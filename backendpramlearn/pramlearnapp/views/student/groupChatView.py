@@ -3,7 +3,10 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from pramlearnapp.models import Material, GroupMember, GroupChat
+from django.http import Http404
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from pramlearnapp.models import Material, GroupMember, GroupChat, GroupChatReadState
 from pramlearnapp.serializers.student.groupChatSerializer import (
     GroupChatSerializer,
     GroupMemberStatusSerializer,
@@ -14,6 +17,39 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+CHAT_PAGE_SIZE = 50
+CHAT_MAX_PAGE_SIZE = 100
+
+
+def get_unread_count(group, user):
+    """Jumlah pesan setelah penanda baca terakhir user (satu perbandingan)"""
+    state = GroupChatReadState.objects.filter(group=group, user=user).first()
+    messages = GroupChat.objects.filter(group=group).exclude(sender=user)
+    if state and state.last_read_at:
+        messages = messages.filter(created_at__gt=state.last_read_at)
+    return messages.count(), state
+
+
+def mark_read_up_to(group, user, message):
+    """
+    Simpan penanda baca (high-water mark) untuk user di group. Penanda hanya
+    bergerak maju, pesan yang lebih lama tidak menurunkannya.
+    """
+    state, created = GroupChatReadState.objects.get_or_create(
+        group=group,
+        user=user,
+        defaults={"last_read_message": message, "last_read_at": message.created_at},
+    )
+    if not created and (
+        state.last_read_at is None or message.created_at > state.last_read_at
+    ):
+        GroupChatReadState.objects.filter(pk=state.pk).filter(
+            Q(last_read_at__isnull=True) | Q(last_read_at__lt=message.created_at)
+        ).update(last_read_message=message, last_read_at=message.created_at)
+        state.last_read_message = message
+        state.last_read_at = message.created_at
+    return state
+
 
 class StudentGroupChatView(APIView):
     """API untuk chat kelompok siswa"""
@@ -37,42 +73,94 @@ class StudentGroupChatView(APIView):
                     status=status.HTTP_403_FORBIDDEN,
                 )
 
-            # Get group members with online status
-            group_members = GroupMember.objects.filter(
-                group=user_group.group
-            ).select_related("student")
+            # Keyset pagination: ?before=<message_id> untuk riwayat lama,
+            # ?after=<message_id> untuk pesan baru
+            try:
+                before_id = int(request.query_params.get("before") or 0) or None
+                after_id = int(request.query_params.get("after") or 0) or None
+            except ValueError:
+                return Response(
+                    {"error": "Parameter before/after harus berupa id pesan"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            try:
+                limit = min(
+                    int(request.query_params.get("limit", CHAT_PAGE_SIZE)),
+                    CHAT_MAX_PAGE_SIZE,
+                )
+            except ValueError:
+                limit = CHAT_PAGE_SIZE
+            limit = max(limit, 1)
 
-            # Get recent chat messages (last 50)
-            chat_messages = (
-                GroupChat.objects.filter(group=user_group.group)
-                .select_related("sender")
-                .order_by("-created_at")[:50]
-            )
+            chat_messages = GroupChat.objects.filter(
+                group=user_group.group
+            ).select_related("sender")
 
-            # Serialize data
-            members_serializer = GroupMemberStatusSerializer(
-                group_members, many=True, context={"request": request}
-            )
+            if after_id:
+                anchor = get_object_or_404(
+                    GroupChat, id=after_id, group=user_group.group
+                )
+                page = list(
+                    chat_messages.filter(
+                        Q(created_at__gt=anchor.created_at)
+                        | Q(created_at=anchor.created_at, id__gt=anchor.id)
+                    ).order_by("created_at", "id")[: limit + 1]
+                )
+                has_more = len(page) > limit
+                page = page[:limit]
+            else:
+                if before_id:
+                    anchor = get_object_or_404(
+                        GroupChat, id=before_id, group=user_group.group
+                    )
+                    chat_messages = chat_messages.filter(
+                        Q(created_at__lt=anchor.created_at)
+                        | Q(created_at=anchor.created_at, id__lt=anchor.id)
+                    )
+                page = list(chat_messages.order_by("-created_at", "-id")[: limit + 1])
+                has_more = len(page) > limit
+                page = page[:limit]
+                page.reverse()  # Reverse to show oldest first
 
             chat_serializer = GroupChatSerializer(
-                reversed(chat_messages),  # Reverse to show oldest first
+                page,
                 many=True,
                 context={"request": request},
             )
 
-            return Response(
-                {
-                    "group_info": {
-                        "id": user_group.group.id,
-                        "name": user_group.group.name,
-                        "code": user_group.group.code,
-                    },
-                    "members": members_serializer.data,
-                    "messages": chat_serializer.data,
+            unread_count, read_state = get_unread_count(user_group.group, request.user)
+
+            response_data = {
+                "group_info": {
+                    "id": user_group.group.id,
+                    "name": user_group.group.name,
+                    "code": user_group.group.code,
                 },
-                status=status.HTTP_200_OK,
-            )
+                "messages": chat_serializer.data,
+                "has_more": has_more,
+                "oldest_message_id": page[0].id if page else None,
+                "newest_message_id": page[-1].id if page else None,
+                "unread_count": unread_count,
+                "last_read_message_id": (
+                    read_state.last_read_message_id if read_state else None
+                ),
+            }
+
+            # Member status hanya dikirim pada pemuatan awal
+            if not before_id and not after_id:
+                group_members = GroupMember.objects.filter(
+                    group=user_group.group
+                ).select_related("student")
+                members_serializer = GroupMemberStatusSerializer(
+                    group_members, many=True, context={"request": request}
+                )
+                response_data["members"] = members_serializer.data
+
+            return Response(response_data, status=status.HTTP_200_OK)
 
+        except Http404:
+            # Material atau pesan anchor (before/after) tidak ditemukan
+            raise
         except Exception as e:
             logger.error(f"Error in StudentGroupChatView: {str(e)}")
             return Response(
@@ -103,10 +191,27 @@ class StudentGroupChatView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Create chat message
-            chat_message = GroupChat.objects.create(
-                group=user_group.group, sender=request.user, message=message_text
-            )
+            # client_id dari client: pesan yang dikirim ulang (misalnya lewat
+            # socket lalu REST) dengan id yang sama tidak disimpan dua kali
+            client_id = str(request.data.get("client_id") or "")[:64] or None
+            try:
+                with transaction.atomic():
+                    chat_message = GroupChat.objects.create(
+                        group=user_group.group,
+                        sender=request.user,
+                        message=message_text,
+                        client_id=client_id,
+                    )
+            except IntegrityError:
+                if not client_id:
+                    raise
+                chat_message = GroupChat.objects.select_related("sender").get(
+                    sender=request.user, client_id=client_id
+                )
+                serializer = GroupChatSerializer(
+                    chat_message, context={"request": request}
+                )
+                return Response(serializer.data, status=status.HTTP_200_OK)
 
             # Serialize message
             serializer = GroupChatSerializer(chat_message, context={"request": request})
@@ -126,3 +231,58 @@ class StudentGroupChatView(APIView):
             return Response(
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class StudentGroupChatReadView(APIView):
+    """API untuk menandai chat kelompok sudah dibaca sampai pesan tertentu"""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, material_slug):
+        try:
+            material = get_object_or_404(Material, slug=material_slug)
+
+            user_group = GroupMember.objects.filter(
+                student=request.user, group__material=material
+            ).first()
+
+            if not user_group:
+                return Response(
+                    {"error": "Anda tidak terdaftar dalam kelompok"},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+
+            message_id = request.data.get("message_id")
+            if message_id:
+                message = get_object_or_404(
+                    GroupChat, id=message_id, group=user_group.group
+                )
+            else:
+                # Tanpa message_id: tandai semua pesan sudah dibaca
+                message = (
+                    GroupChat.objects.filter(group=user_group.group)
+                    .order_by("-created_at", "-id")
+                    .first()
+                )
+                if not message:
+                    return Response(
+                        {"last_read_message_id": None, "unread_count": 0},
+                        status=status.HTTP_200_OK,
+                    )
+
+            mark_read_up_to(user_group.group, request.user, message)
+            unread_count, read_state = get_unread_count(user_group.group, request.user)
+
+            return Response(
+                {
+                    "last_read_message_id": read_state.last_read_message_id,
+                    "unread_count": unread_count,
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        except Exception as e:
+            logger.error(f"Error marking chat as read: {str(e)}")
+            return Response(
+                {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
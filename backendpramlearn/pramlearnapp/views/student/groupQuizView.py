@@ -10,7 +10,6 @@ from pramlearnapp.models import (
     GroupQuizSubmission,
     GroupQuizResult,
     Question,
-    StudentActivity,
 )
 from pramlearnapp.serializers.student.quizSerializer import (
     GroupQuizSerializer,
@@ -24,6 +23,7 @@ from django.db import transaction
 import traceback
 import logging
 from pramlearnapp.services.gradeService import create_grade_from_group_quiz
+from pramlearnapp.utils.log_student_activity import log_student_activity
 
 logger = logging.getLogger(__name__)
 
@@ -320,12 +320,11 @@ class SubmitGroupQuizView(APIView):
 
                 # Step 7: Log activity
                 try:
-                    StudentActivity.objects.create(
-                        student=user,
-                        title=f"Menyelesaikan Group Quiz: {quiz.title}",
-                        description=f"Group quiz diselesaikan dengan skor {score:.1f}",
-                        activity_type="group_quiz",
-                        timestamp=timezone.now(),
+                    log_student_activity(
+                        user,
+                        f"Menyelesaikan Group Quiz: {quiz.title}",
+                        "group_quiz",
+                        related_object_id=quiz.id,
                     )
                     logger.info(f"✅ Activity logged for {user.username}")
                 except Exception as activity_error:
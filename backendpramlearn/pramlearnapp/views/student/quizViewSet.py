@@ -11,8 +11,8 @@ from pramlearnapp.models import (
     GroupQuiz,
     GroupQuizSubmission,
     GroupQuizResult,
-    StudentActivity,
 )
+from pramlearnapp.utils.log_student_activity import log_student_activity
 from pramlearnapp.decorators import student_required
 import traceback
 import logging
@@ -405,12 +405,11 @@ class SubmitGroupQuizView(APIView):
                         logger.error(f"❌ Traceback: {traceback.format_exc()}")
 
                 try:
-                    StudentActivity.objects.create(
-                        student=user,
-                        title=f"Menyelesaikan Group Quiz: {quiz.title}",
-                        description=f"Group quiz diselesaikan dengan skor {result.score:.1f}",
-                        activity_type="group_quiz",
-                        timestamp=timezone.now(),
+                    log_student_activity(
+                        user,
+                        f"Menyelesaikan Group Quiz: {quiz.title}",
+                        "group_quiz",
+                        related_object_id=quiz.id,
                     )
                     logger.info(f"✅ Activity logged for {user.username}")
                 except Exception as activity_error:
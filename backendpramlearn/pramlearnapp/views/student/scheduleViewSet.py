@@ -1,9 +1,10 @@
 from rest_framework import viewsets, permissions
 from pramlearnapp.models.schedule import Schedule
 from pramlearnapp.serializers import TodayScheduleSerializer, ScheduleModelSerializer
+from pramlearnapp.mixins import ProjectedListMixin
 
 
-class ScheduleViewSet(viewsets.ModelViewSet):
+class ScheduleViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     queryset = Schedule.objects.all()
     serializer_class = ScheduleModelSerializer
     permission_classes = [permissions.IsAuthenticated]
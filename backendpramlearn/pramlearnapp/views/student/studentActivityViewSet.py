@@ -1,11 +1,13 @@
 from rest_framework import viewsets, permissions
 from pramlearnapp.models.studentActivity import StudentActivity
 from pramlearnapp.serializers.student.studentActivitySerializer import StudentActivitySerializer
+from pramlearnapp.mixins import ProjectedListMixin
 
 
-class StudentActivityViewSet(viewsets.ReadOnlyModelViewSet):
+class StudentActivityViewSet(ProjectedListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = StudentActivity.objects.all().order_by('-timestamp')
     serializer_class = StudentActivitySerializer
+    cursor_ordering = "-timestamp"
     # Tambahkan custom permission jika perlu
     permission_classes = [permissions.IsAuthenticated]
 
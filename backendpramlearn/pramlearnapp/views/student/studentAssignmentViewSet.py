@@ -15,7 +15,6 @@ from pramlearnapp.models import (
     SubjectClass,
     Material,
     StudentAssignmentDraft,
-    StudentActivity,
 )
 from pramlearnapp.serializers.student.studentAssignmentSerializer import (
     StudentAssignmentSerializer,
@@ -397,12 +396,11 @@ class StudentAssignmentSubmitView(APIView):
 
                 # Log student activity
                 try:
-                    StudentActivity.objects.create(
-                        student=user,
-                        title=f"Menyelesaikan Assignment: {assignment.title}",
-                        description=f"Assignment diselesaikan dengan nilai {submission.grade:.1f}",
-                        activity_type="assignment",
-                        timestamp=timezone.now(),
+                    log_student_activity(
+                        user,
+                        f"Menyelesaikan Assignment: {assignment.title}",
+                        "assignment",
+                        related_object_id=assignment.id,
                     )
                     logger.info(f"✅ Student activity logged")
                 except Exception as activity_error:
@@ -463,12 +461,11 @@ class StudentAssignmentSubmissionsView(APIView):
 
             # Log student activity
             try:
-                StudentActivity.objects.create(
-                    student=request.user,
-                    title=f"Melihat Riwayat Assignment: {assignment.title}",
-                    description="Melihat riwayat pengumpulan assignment",
-                    activity_type="assignment",
-                    timestamp=timezone.now(),
+                log_student_activity(
+                    request.user,
+                    f"Melihat Riwayat Assignment: {assignment.title}",
+                    "assignment",
+                    related_object_id=assignment.id,
                 )
             except Exception as activity_error:
                 logger.error(f"Failed to log student activity: {str(activity_error)}")
@@ -18,6 +18,8 @@ from pramlearnapp.models.group import GroupMember, GroupQuiz
 from pramlearnapp.models.grade import Grade
 from pramlearnapp.views.student.studentUpcomingDeadlinesView import StudentUpcomingDeadlinesView
 from pramlearnapp.views.student.studentQuickActionsView import StudentQuickActionsView
+from pramlearnapp.decorators import cache_response
+from pramlearnapp.utils.cache import student_scope_tags
 
 
 class StudentDashboardView(APIView):
@@ -25,6 +27,9 @@ class StudentDashboardView(APIView):
     Dashboard utama student: subjects, assignments, quizzes, progress, recent activities, today schedule
     """
 
+    @cache_response(
+        timeout=60, tags=lambda request: student_scope_tags(request.user.pk)
+    )
     def get(self, request):
         user = request.user
         # Pastikan hanya student
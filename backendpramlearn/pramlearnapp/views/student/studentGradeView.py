@@ -1,6 +1,7 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework import generics, status
+from rest_framework.exceptions import APIException
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes
 from django.db.models import Avg, Count, Q, Min, Max
@@ -16,6 +17,9 @@ from pramlearnapp.serializers import (
     StudentGradeAnalyticsSerializer
 )
 from ...services.gradeService import GradeService
+from ...services.grade_source_service import GradeSourceService, is_group_grade
+from ...services.report_artifact_service import ReportArtifactService
+from pramlearnapp.mixins import ProjectedListMixin
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -28,11 +32,15 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class StudentGradeView(APIView):
+class StudentGradeView(ProjectedListMixin, generics.GenericAPIView):
     """
-    API untuk mengambil grades siswa dengan filtering & sorting
+    API untuk mengambil grades siswa dengan filtering & sorting.
+    Daftar grades mendukung ?cursor=/?page_size= dan ?fields= (lihat
+    ProjectedListMixin); statistik tetap dihitung dari semua grade.
     """
     permission_classes = [IsAuthenticated]
+    serializer_class = GradeSerializer
+    cursor_ordering = ("-date", "-id")
 
     def get(self, request):
         try:
@@ -67,15 +75,14 @@ class StudentGradeView(APIView):
                     status=status.HTTP_403_FORBIDDEN
                 )
 
-            # Get atau create grade statistics
-            grade_stats, created = GradeStatistics.objects.get_or_create(
-                student=request.user
-            )
-            if created:
-                grade_stats.update_statistics()
+            # Snapshot statistik (diperbarui oleh signal saat grade ditulis)
+            grade_service = GradeService(request.user)
+            grade_stats = grade_service.get_statistics()
 
             # Get grades dengan filtering
-            grades = Grade.objects.filter(student=request.user)
+            grades = Grade.objects.filter(student=request.user).select_related(
+                'material', 'quiz'
+            )
 
             # Apply filters
             subject_filter = request.GET.get('subject_id')
@@ -110,16 +117,28 @@ class StudentGradeView(APIView):
             # Sorting
             grades = grades.order_by('-date')
 
-            # Serialize data
-            grade_serializer = GradeSerializer(grades, many=True)
+            # Serialize data (halaman cursor jika diminta client)
+            grades = self.filter_queryset(grades)
+            page = self.paginate_queryset(grades)
+            grade_serializer = self.get_serializer(
+                grades if page is None else page, many=True)
             stats_serializer = GradeStatisticsSerializer(grade_stats)
 
-            return Response({
+            data = {
                 'grades': grade_serializer.data,
                 'statistics': stats_serializer.data,
-                'total_count': grades.count()
-            })
-
+                'performance_trend': grade_service.calculate_performance_trend(),
+                'subject_breakdown': grade_service.get_subject_breakdown(),
+                'total_count': len(grade_serializer.data)
+            }
+            if page is not None:
+                data['next'] = self.paginator.get_next_link()
+                data['previous'] = self.paginator.get_previous_link()
+            return Response(data)
+
+        except APIException:
+            # Mis. cursor tidak valid (404) dari pagination
+            raise
         except Exception as e:
             logger.error(f"Error in StudentGradeView: {str(e)}")
             return Response(
@@ -193,13 +212,14 @@ class StudentAchievementView(APIView):
                     status=status.HTTP_403_FORBIDDEN
                 )
 
-            achievements = Achievement.objects.filter(student=request.user)
-            serializer = AchievementSerializer(achievements, many=True)
-
-            # Check for new achievements
+            # Achievement baru diberikan saat grade ditulis; ambil yang
+            # belum ditampilkan sebelum membaca daftar achievement
             grade_service = GradeService(request.user)
             new_achievements = grade_service.check_and_award_achievements()
 
+            achievements = Achievement.objects.filter(student=request.user)
+            serializer = AchievementSerializer(achievements, many=True)
+
             return Response({
                 'achievements': serializer.data,
                 'new_achievements': new_achievements
@@ -226,7 +246,7 @@ class AssignmentFeedbackByGradeView(APIView):
         try:
             # Get grade first
             grade = get_object_or_404(
-                Grade,
+                Grade.objects.select_related('material'),
                 id=grade_id,
                 student=request.user,
                 type='assignment'
@@ -237,59 +257,32 @@ class AssignmentFeedbackByGradeView(APIView):
             logger.info(
                 f"Grade details: title={grade.title}, grade={grade.grade}, date={grade.date}")
 
-            # PERBAIKAN: Cari jawaban dengan berbagai metode
+            # Jawaban diambil langsung dari submission sumber grade
             answers_data = []
-
-            # Method 1: Cari berdasarkan assignment title matching
-            if grade.title:
-                try:
-                    # Cari assignment berdasarkan title
-                    possible_assignments = Assignment.objects.filter(
-                        title__icontains=grade.title.replace(
-                            'Tugas ', '').replace('Assignment ', '')
-                    )
-
-                    logger.info(
-                        f"Found {possible_assignments.count()} possible assignments")
-
-                    for assignment in possible_assignments:
-                        submissions = AssignmentSubmission.objects.filter(
-                            assignment=assignment,
-                            student=request.user
-                        ).order_by('-submission_date')
-                        for submission in submissions:
-                            answers = AssignmentAnswer.objects.filter(
-                                submission=submission
-                            ).select_related('question')
-
-                            logger.info(
-                                f"Found {answers.count()} answers for submission {submission.id}")
-
-                            if answers.exists():
-                                for answer in answers:
-                                    question = answer.question
-                                    answers_data.append({
-                                        'id': answer.id,
-                                        'question_text': question.text if question else 'Question not available',
-                                        'question_id': question.id if question else None,
-                                        'answer_text': getattr(answer, 'answer_text', None) or getattr(answer, 'essay_answer', None),
-                                        'selected_choice': getattr(answer, 'selected_choice', None),
-                                        'answer_type': 'multiple_choice' if getattr(answer, 'selected_choice', None) else 'essay',
-                                        'teacher_feedback': getattr(answer, 'teacher_feedback', ''),
-                                        'points_earned': getattr(answer, 'points_earned', None),
-                                        'max_points': getattr(answer, 'max_points', 1),
-                                        'is_correct': getattr(answer, 'is_correct', False),
-                                    })
-
-                                logger.info(
-                                    f"Added {len(answers_data)} answers from assignment {assignment.id}")
-                                break  # Stop after finding answers
-
-                        if answers_data:
-                            break  # Stop searching if we found answers
-
-                except Exception as e:
-                    logger.error(f"Error in method 1: {e}")
+            GradeSourceService.resolve(grade)
+
+            if grade.assignment_submission_id:
+                answers = AssignmentAnswer.objects.filter(
+                    submission_id=grade.assignment_submission_id
+                ).select_related('question')
+
+                for answer in answers:
+                    question = answer.question
+                    answers_data.append({
+                        'id': answer.id,
+                        'question_text': question.text if question else 'Question not available',
+                        'question_id': question.id if question else None,
+                        'answer_text': getattr(answer, 'answer_text', None) or getattr(answer, 'essay_answer', None),
+                        'selected_choice': getattr(answer, 'selected_choice', None),
+                        'answer_type': 'multiple_choice' if getattr(answer, 'selected_choice', None) else 'essay',
+                        'teacher_feedback': getattr(answer, 'teacher_feedback', ''),
+                        'points_earned': getattr(answer, 'points_earned', None),
+                        'max_points': getattr(answer, 'max_points', 1),
+                        'is_correct': getattr(answer, 'is_correct', False),
+                    })
+
+                logger.info(
+                    f"Found {len(answers_data)} answers for submission {grade.assignment_submission_id}")
 
             # Safe field access untuk grade
             subject_name = getattr(grade, 'subject_name', None)
@@ -349,14 +342,14 @@ class AssignmentFeedbackByGradeView(APIView):
         try:
             # Get grade data
             grade = get_object_or_404(
-                Grade,
+                Grade.objects.select_related('material'),
                 id=grade_id,
                 student=request.user,
                 type='assignment'
             )
 
             if format_type == 'pdf':
-                return self.generate_pdf_report(grade, request.user)
+                return grade_report_artifact(grade, request.user).serve(request)
             else:
                 return self.generate_text_report(grade, request.user)
 
@@ -367,8 +360,8 @@ class AssignmentFeedbackByGradeView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    def generate_pdf_report(self, grade, user):
-        """Generate PDF report using reportlab mirip modal AssignmentFeedback"""
+    def render_pdf_report(self, grade, user):
+        """Render PDF report (bytes) using reportlab mirip modal AssignmentFeedback"""
         try:
             from reportlab.lib.enums import TA_CENTER, TA_LEFT
             buffer = BytesIO()
@@ -497,28 +490,11 @@ class AssignmentFeedbackByGradeView(APIView):
             # --- REVIEW JAWABAN ---
             # Ambil jawaban dari AssignmentAnswer jika ada
             answers = []
-            try:
-                possible_assignments = Assignment.objects.filter(
-                    title__icontains=grade.title.replace(
-                        'Tugas ', '').replace('Assignment ', '')
-                )
-                for assignment in possible_assignments:
-                    submissions = AssignmentSubmission.objects.filter(
-                        assignment=assignment,
-                        student=user
-                    ).order_by('-submission_date')
-                    for submission in submissions:
-                        answers_qs = AssignmentAnswer.objects.filter(
-                            submission=submission
-                        ).select_related('question')
-                        if answers_qs.exists():
-                            for answer in answers_qs:
-                                answers.append(answer)
-                            break
-                    if answers:
-                        break
-            except Exception:
-                pass
+            GradeSourceService.resolve(grade)
+            if grade.assignment_submission_id:
+                answers = list(AssignmentAnswer.objects.filter(
+                    submission_id=grade.assignment_submission_id
+                ).select_related('question'))
 
             if answers:
                 story.append(
@@ -637,21 +613,44 @@ class AssignmentFeedbackByGradeView(APIView):
             doc.build(story)
             pdf_data = buffer.getvalue()
             buffer.close()
-            response = HttpResponse(content_type='application/pdf')
-            response[
-                'Content-Disposition'] = f'attachment; filename="assignment-feedback-{grade.id}.pdf"'
-            response.write(pdf_data)
-            return response
+            return pdf_data
 
         except Exception as e:
             logger.error(f"Error generating PDF: {e}")
-            return self.generate_text_report(grade, user)
+            raise
+
+
+def build_group_data(group, user):
+    """Data kelompok dan anggotanya untuk review quiz kelompok"""
+    group_members = GroupMember.objects.filter(
+        group=group
+    ).select_related('student')
+
+    return {
+        'id': group.id,
+        'name': group.name,
+        'code': group.code,
+        'members': [
+            {
+                'id': m.student.id,
+                'name': f"{m.student.first_name} {m.student.last_name}".strip() or m.student.username,
+                'username': m.student.username,
+                'student_id': m.student.username,
+                'is_current_user': m.student.id == user.id
+            }
+            for m in group_members
+        ]
+    }
 
 
 class QuizReviewView(APIView):
     """API untuk mendapatkan detail review quiz attempt"""
     permission_classes = [IsAuthenticated]
 
+    def perform_content_negotiation(self, request, force=False):
+        # ?format=pdf adalah format unduhan report, bukan format renderer DRF
+        return super().perform_content_negotiation(request, force=True)
+
     def get(self, request, attempt_id):
         """Get quiz review details"""
         download_format = request.GET.get('format')
@@ -669,81 +668,44 @@ class QuizReviewView(APIView):
             attempt = None
             grade = None
             quiz = None
+            group_quiz = None
             is_group_quiz = False
             group_data = None
 
-            # Method 1: Cari berdasarkan Grade dengan tipe quiz
+            # Ambil grade beserta sumbernya (FK langsung, bukan pencocokan judul)
             try:
                 grade = get_object_or_404(
-                    Grade,
+                    Grade.objects.select_related(
+                        'quiz__material__subject',
+                        'quiz_attempt',
+                        'group_quiz__group',
+                        'group_quiz__quiz__material__subject',
+                    ),
                     id=attempt_id,
                     student=request.user,
                     type='quiz'
                 )
                 logger.info(f"Found Grade {attempt_id} with type quiz")
 
-                # PERBAIKAN: Deteksi apakah ini group quiz berdasarkan title
-                if grade.title and "group" in grade.title.lower():
+                GradeSourceService.resolve(grade)
+                group_quiz = grade.group_quiz
+
+                if group_quiz or is_group_grade(grade):
                     is_group_quiz = True
-                    logger.info("Detected as group quiz based on title")
-
-                    # Cari quiz berdasarkan title matching
-                    quiz_title_clean = grade.title.replace(
-                        'Quiz ', '').replace('(Group)', '').strip()
-                    possible_quiz = Quiz.objects.filter(
-                        title__icontains=quiz_title_clean,
-                        is_group_quiz=True
-                    ).first()
-
-                    if possible_quiz:
-                        quiz = possible_quiz
-                        logger.info(f"Found matching group quiz: {quiz.title}")
-
-                        # Cari GroupMember untuk user ini
-                        user_group_member = GroupMember.objects.filter(
-                            student=request.user,
-                            group__material=quiz.material
-                        ).first()
-
-                        if user_group_member:
-                            # Build group_data
-                            group_members = GroupMember.objects.filter(
-                                group=user_group_member.group
-                            ).select_related('student')
+                    quiz = group_quiz.quiz if group_quiz else grade.quiz
 
-                            group_data = {
-                                'id': user_group_member.group.id,
-                                'name': user_group_member.group.name,
-                                'code': user_group_member.group.code,
-                                'members': [
-                                    {
-                                        'id': m.student.id,
-                                        'name': f"{m.student.first_name} {m.student.last_name}".strip() or m.student.username,
-                                        'username': m.student.username,
-                                        'student_id': m.student.username,
-                                        'is_current_user': m.student.id == request.user.id
-                                    }
-                                    for m in group_members
-                                ]
-                            }
-                            logger.info(
-                                f"Found group data: {group_data['name']} with {len(group_data['members'])} members")
-                        else:
-                            logger.warning(
-                                "User not found in any group for this quiz material")
+                    if group_quiz:
+                        group_data = build_group_data(
+                            group_quiz.group, request.user)
+                        logger.info(
+                            f"Found group data: {group_data['name']} with {len(group_data['members'])} members")
+                    else:
+                        logger.warning(
+                            "Group quiz source not found for this grade")
                 else:
                     # Individual quiz
                     is_group_quiz = False
-                    quiz_title_clean = grade.title.replace('Quiz ', '').strip()
-                    possible_quiz = Quiz.objects.filter(
-                        title__icontains=quiz_title_clean,
-                        is_group_quiz=False
-                    ).first()
-
-                    if possible_quiz:
-                        quiz = possible_quiz
-                        logger.info(
-                            f"Found matching individual quiz: {quiz.title}")
+                    quiz = grade.quiz
 
             except Exception as e:
                 logger.error(f"Error finding grade: {e}")
@@ -761,126 +723,115 @@ class QuizReviewView(APIView):
             if quiz and is_group_quiz:
                 # PERBAIKAN: Untuk group quiz, ambil data dari GroupQuizSubmission
                 try:
-                    user_group_member = GroupMember.objects.filter(
-                        student=request.user,
-                        group__material=quiz.material
-                    ).first()
-
-                    if user_group_member:
-                        group_quiz = GroupQuiz.objects.filter(
-                            quiz=quiz,
-                            group=user_group_member.group
-                        ).first()
-
-                        if group_quiz:
-                            # Get submissions untuk group quiz ini
-                            group_submissions = GroupQuizSubmission.objects.filter(
+                    if group_quiz:
+                        # Get submissions untuk group quiz ini, per question
+                        submissions_by_question = {
+                            submission.question_id: submission
+                            for submission in GroupQuizSubmission.objects.filter(
                                 group_quiz=group_quiz
-                            ).select_related('question', 'student')
-
-                            # Get all questions untuk quiz ini
-                            all_questions = quiz.questions.all()
-
-                            for question in all_questions:
-                                # Cari submission untuk question ini
-                                submission = group_submissions.filter(
-                                    question=question).first()
-
-                                if submission:
-                                    is_correct = submission.is_correct
-                                    if is_correct:
-                                        correct_count += 1
-                                    else:
-                                        incorrect_count += 1
-
-                                    # User answer
-                                    user_answer = None
-                                    if submission.selected_choice:
-                                        choice_map = {
-                                            'A': question.choice_a,
-                                            'B': question.choice_b,
-                                            'C': question.choice_c,
-                                            'D': question.choice_d
-                                        }
-                                        user_answer = f"{submission.selected_choice}. {choice_map.get(submission.selected_choice, '')}"
-
-                                    # Correct answer
-                                    correct_answer = None
-                                    if hasattr(question, 'correct_choice') and question.correct_choice:
-                                        choice_map = {
-                                            'A': question.choice_a,
-                                            'B': question.choice_b,
-                                            'C': question.choice_c,
-                                            'D': question.choice_d
-                                        }
-                                        correct_answer = f"{question.correct_choice}. {choice_map.get(question.correct_choice, '')}"
-
-                                    questions_data.append({
-                                        'id': submission.id,
-                                        'question_id': question.id,
-                                        'question_text': question.text,
-                                        'question_image': getattr(question, 'image_url', None),
-                                        'question_type': 'multiple_choice',
-                                        'choices': {
-                                            'A': question.choice_a,
-                                            'B': question.choice_b,
-                                            'C': question.choice_c,
-                                            'D': question.choice_d
-                                        },
-                                        'user_answer': user_answer,
-                                        'selected_choice': submission.selected_choice,
-                                        'correct_answer': correct_answer,
-                                        'is_correct': is_correct,
-                                        'points': 1 if is_correct else 0,
-                                        'max_points': 1,
-                                        'explanation': getattr(question, 'explanation', None),
-                                        'answered_by_name': f"{submission.student.first_name} {submission.student.last_name}".strip() or submission.student.username,
-                                        'teacher_feedback': None
-                                    })
+                            ).select_related('student')
+                        }
+
+                        # Get all questions untuk quiz ini
+                        all_questions = quiz.questions.all()
+
+                        for question in all_questions:
+                            # Cari submission untuk question ini
+                            submission = submissions_by_question.get(
+                                question.id)
+
+                            if submission:
+                                is_correct = submission.is_correct
+                                if is_correct:
+                                    correct_count += 1
                                 else:
-                                    # Question tidak dijawab
-                                    unanswered_count += 1
-                                    correct_answer = None
-                                    if hasattr(question, 'correct_choice') and question.correct_choice:
-                                        choice_map = {
-                                            'A': question.choice_a,
-                                            'B': question.choice_b,
-                                            'C': question.choice_c,
-                                            'D': question.choice_d
-                                        }
-                                        correct_answer = f"{question.correct_choice}. {choice_map.get(question.correct_choice, '')}"
-
-                                    questions_data.append({
-                                        'id': f"unanswered_{question.id}",
-                                        'question_id': question.id,
-                                        'question_text': question.text,
-                                        'question_image': getattr(question, 'image_url', None),
-                                        'question_type': 'multiple_choice',
-                                        'choices': {
-                                            'A': question.choice_a,
-                                            'B': question.choice_b,
-                                            'C': question.choice_c,
-                                            'D': question.choice_d
-                                        },
-                                        'user_answer': None,
-                                        'selected_choice': None,
-                                        'correct_answer': correct_answer,
-                                        'is_correct': False,
-                                        'points': 0,
-                                        'max_points': 1,
-                                        'explanation': getattr(question, 'explanation', None),
-                                        'answered_by_name': 'Tidak dijawab',
-                                        'teacher_feedback': None
-                                    })
-
-                            logger.info(
-                                f"Found {len(questions_data)} questions for group quiz")
-                        else:
-                            logger.warning(
-                                "GroupQuiz not found for user's group")
+                                    incorrect_count += 1
+
+                                # User answer
+                                user_answer = None
+                                if submission.selected_choice:
+                                    choice_map = {
+                                        'A': question.choice_a,
+                                        'B': question.choice_b,
+                                        'C': question.choice_c,
+                                        'D': question.choice_d
+                                    }
+                                    user_answer = f"{submission.selected_choice}. {choice_map.get(submission.selected_choice, '')}"
+
+                                # Correct answer
+                                correct_answer = None
+                                if hasattr(question, 'correct_choice') and question.correct_choice:
+                                    choice_map = {
+                                        'A': question.choice_a,
+                                        'B': question.choice_b,
+                                        'C': question.choice_c,
+                                        'D': question.choice_d
+                                    }
+                                    correct_answer = f"{question.correct_choice}. {choice_map.get(question.correct_choice, '')}"
+
+                                questions_data.append({
+                                    'id': submission.id,
+                                    'question_id': question.id,
+                                    'question_text': question.text,
+                                    'question_image': getattr(question, 'image_url', None),
+                                    'question_type': 'multiple_choice',
+                                    'choices': {
+                                        'A': question.choice_a,
+                                        'B': question.choice_b,
+                                        'C': question.choice_c,
+                                        'D': question.choice_d
+                                    },
+                                    'user_answer': user_answer,
+                                    'selected_choice': submission.selected_choice,
+                                    'correct_answer': correct_answer,
+                                    'is_correct': is_correct,
+                                    'points': 1 if is_correct else 0,
+                                    'max_points': 1,
+                                    'explanation': getattr(question, 'explanation', None),
+                                    'answered_by_name': f"{submission.student.first_name} {submission.student.last_name}".strip() or submission.student.username,
+                                    'teacher_feedback': None
+                                })
+                            else:
+                                # Question tidak dijawab
+                                unanswered_count += 1
+                                correct_answer = None
+                                if hasattr(question, 'correct_choice') and question.correct_choice:
+                                    choice_map = {
+                                        'A': question.choice_a,
+                                        'B': question.choice_b,
+                                        'C': question.choice_c,
+                                        'D': question.choice_d
+                                    }
+                                    correct_answer = f"{question.correct_choice}. {choice_map.get(question.correct_choice, '')}"
+
+                                questions_data.append({
+                                    'id': f"unanswered_{question.id}",
+                                    'question_id': question.id,
+                                    'question_text': question.text,
+                                    'question_image': getattr(question, 'image_url', None),
+                                    'question_type': 'multiple_choice',
+                                    'choices': {
+                                        'A': question.choice_a,
+                                        'B': question.choice_b,
+                                        'C': question.choice_c,
+                                        'D': question.choice_d
+                                    },
+                                    'user_answer': None,
+                                    'selected_choice': None,
+                                    'correct_answer': correct_answer,
+                                    'is_correct': False,
+                                    'points': 0,
+                                    'max_points': 1,
+                                    'explanation': getattr(question, 'explanation', None),
+                                    'answered_by_name': 'Tidak dijawab',
+                                    'teacher_feedback': None
+                                })
+
+                        logger.info(
+                            f"Found {len(questions_data)} questions for group quiz")
                     else:
                         logger.warning(
-                            "User not in any group for this quiz material")
+                            "GroupQuiz not found for this grade")
 
                 except Exception as e:
                     logger.error(f"Error getting group quiz questions: {e}")
@@ -888,35 +839,37 @@ class QuizReviewView(APIView):
             elif quiz and not is_group_quiz:
                 # PERBAIKAN: Untuk individual quiz, cari dari StudentQuizAttempt jika ada
                 try:
-                    # Coba cari StudentQuizAttempt berdasarkan quiz dan user
-                    from pramlearnapp.models import StudentQuizAttempt, StudentQuizAnswer
+                    # Attempt sumber grade (FK langsung)
+                    from pramlearnapp.models import StudentQuizAnswer
 
-                    quiz_attempt = StudentQuizAttempt.objects.filter(
-                        quiz=quiz,
-                        student=request.user
-                    ).order_by('-completed_at').first()
+                    quiz_attempt = grade.quiz_attempt
 
                     if quiz_attempt:
                         # Get quiz answers
                         quiz_answers = StudentQuizAnswer.objects.filter(
-                            quiz_attempt=quiz_attempt
+                            attempt=quiz_attempt
                         ).select_related('question').order_by('question__id')
 
                         # Process answers
                         for answer in quiz_answers:
                             question = answer.question
+                            # StudentQuizAnswer menyimpan pilihan di selected_answer
+                            question_type = getattr(
+                                question, 'question_type', 'multiple_choice')
+                            selected_choice = getattr(
+                                answer, 'selected_choice', None) or getattr(answer, 'selected_answer', None)
                             is_correct = getattr(answer, 'is_correct', False)
 
                             if is_correct:
                                 correct_count += 1
-                            elif getattr(answer, 'selected_choice', None) or getattr(answer, 'answer_text', None):
+                            elif selected_choice or getattr(answer, 'answer_text', None):
                                 incorrect_count += 1
                             else:
                                 unanswered_count += 1
 
                             # Determine correct answer untuk multiple choice
                             correct_answer = None
-                            if question.question_type == 'multiple_choice':
+                            if question_type == 'multiple_choice':
                                 correct_choice = getattr(
                                     question, 'correct_choice', None)
                                 if correct_choice:
@@ -930,14 +883,14 @@ class QuizReviewView(APIView):
 
                             # User answer
                             user_answer = None
-                            if getattr(answer, 'selected_choice', None):
+                            if selected_choice:
                                 choice_map = {
                                     'A': question.choice_a,
                                     'B': question.choice_b,
                                     'C': question.choice_c,
                                     'D': question.choice_d
                                 }
-                                user_answer = f"{answer.selected_choice}. {choice_map.get(answer.selected_choice, '')}"
+                                user_answer = f"{selected_choice}. {choice_map.get(selected_choice, '')}"
                             elif getattr(answer, 'answer_text', None):
                                 user_answer = answer.answer_text
 
@@ -946,15 +899,15 @@ class QuizReviewView(APIView):
                                 'question_id': question.id,
                                 'question_text': question.text,
                                 'question_image': getattr(question, 'image_url', None),
-                                'question_type': question.question_type,
+                                'question_type': question_type,
                                 'choices': {
                                     'A': question.choice_a,
                                     'B': question.choice_b,
                                     'C': question.choice_c,
                                     'D': question.choice_d
-                                } if question.question_type == 'multiple_choice' else None,
+                                } if question_type == 'multiple_choice' else None,
                                 'user_answer': user_answer,
-                                'selected_choice': getattr(answer, 'selected_choice', None),
+                                'selected_choice': selected_choice,
                                 'correct_answer': correct_answer,
                                 'is_correct': is_correct,
                                 'points': getattr(answer, 'points_earned', None),
@@ -1048,7 +1001,7 @@ class QuizReviewView(APIView):
             )
 
             if format_type == 'pdf':
-                return self.generate_quiz_pdf_report(grade, request.user)
+                return grade_report_artifact(grade, request.user).serve(request)
             else:
                 return self.generate_quiz_text_report(grade, request.user)
 
@@ -1059,8 +1012,8 @@ class QuizReviewView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    def generate_quiz_pdf_report(self, grade, user):
-        """Generate PDF report using reportlab mirip modal QuizResultsDetail"""
+    def render_quiz_pdf_report(self, grade, user):
+        """Render PDF report (bytes) using reportlab mirip modal QuizResultsDetail"""
         try:
             from reportlab.lib.enums import TA_CENTER, TA_LEFT
             buffer = BytesIO()
@@ -1287,7 +1240,7 @@ class QuizReviewView(APIView):
                 [[contact_para]],
                 style=[
                     ("BACKGROUND", (0, 0), (-1, -1), HexColor("#f0f8ff")),
-                    ("BOX", (0, 0), (-1, -1), 2, HexColor("#d9d9d9"), 'DASHED'),
+                    ("BOX", (0, 0), (-1, -1), 2, HexColor("#d9d9d9"), None, (4, 2)),
                     ("LEFTPADDING", (0, 0), (-1, -1), 8),
                     ("RIGHTPADDING", (0, 0), (-1, -1), 8),
                 ]
@@ -1312,27 +1265,27 @@ class QuizReviewView(APIView):
             doc.build(story)
             pdf_data = buffer.getvalue()
             buffer.close()
-
-            response = HttpResponse(content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="quiz-report-{grade.id}.pdf"'
-            response.write(pdf_data)
-            return response
+            return pdf_data
 
         except Exception as e:
             logger.error(f"Error generating quiz PDF: {e}")
-            return HttpResponse("Error generating PDF report", status=500)
+            raise
 
 
 class GroupQuizReviewView(APIView):
     """API untuk mendapatkan detail review quiz attempt"""
     permission_classes = [IsAuthenticated]
 
+    def perform_content_negotiation(self, request, force=False):
+        # ?format=pdf adalah format unduhan report, bukan format renderer DRF
+        return super().perform_content_negotiation(request, force=True)
+
     def get(self, request, attempt_id):
         """Get quiz review details"""
         download_format = request.GET.get('format')
 
         if download_format:
-            return self.download_quiz_report(request, attempt_id, download_format)
+            return self.download_group_quiz_report(request, attempt_id, download_format)
 
         try:
             # Import model yang diperlukan
@@ -1344,76 +1297,38 @@ class GroupQuizReviewView(APIView):
             attempt = None
             grade = None
             quiz = None
+            group_quiz = None
             is_group_quiz = True  # Karena ini khusus untuk group quiz
             group_data = None
 
-            # Method 1: Cari berdasarkan Grade dengan tipe quiz dan group keyword
+            # Ambil grade beserta sumbernya (FK langsung, bukan pencocokan judul)
             try:
                 grade = get_object_or_404(
-                    Grade,
+                    Grade.objects.select_related(
+                        'quiz__material__subject',
+                        'quiz_attempt',
+                        'group_quiz__group',
+                        'group_quiz__quiz__material__subject',
+                    ),
                     id=attempt_id,
                     student=request.user,
                     type='quiz'
                 )
                 logger.info(f"Found Grade {attempt_id} with type quiz")
 
-                # PERBAIKAN: Deteksi group quiz berdasarkan title atau langsung cari
-                if grade.title and "group" in grade.title.lower():
-                    # Cari quiz berdasarkan title matching
-                    quiz_title_clean = grade.title.replace(
-                        'Quiz ', '').replace('(Group)', '').strip()
-                    possible_quiz = Quiz.objects.filter(
-                        title__icontains=quiz_title_clean,
-                        is_group_quiz=True
-                    ).first()
-
-                    if possible_quiz:
-                        quiz = possible_quiz
-                        logger.info(f"Found matching group quiz: {quiz.title}")
-
-                        # Cari GroupMember untuk user ini
-                        user_group_member = GroupMember.objects.filter(
-                            student=request.user,
-                            group__material=quiz.material
-                        ).first()
-
-                        if user_group_member:
-                            # Build group_data
-                            group_members = GroupMember.objects.filter(
-                                group=user_group_member.group
-                            ).select_related('student')
+                GradeSourceService.resolve(grade)
+                group_quiz = grade.group_quiz
 
-                            group_data = {
-                                'id': user_group_member.group.id,
-                                'name': user_group_member.group.name,
-                                'code': user_group_member.group.code,
-                                'members': [
-                                    {
-                                        'id': m.student.id,
-                                        'name': f"{m.student.first_name} {m.student.last_name}".strip() or m.student.username,
-                                        'username': m.student.username,
-                                        'student_id': m.student.username,
-                                        'is_current_user': m.student.id == request.user.id
-                                    }
-                                    for m in group_members
-                                ]
-                            }
-                            logger.info(
-                                f"Found group data: {group_data['name']} with {len(group_data['members'])} members")
-                        else:
-                            logger.warning(
-                                "User not found in any group for this quiz material")
-                else:
-                    # Fallback: coba cari berdasarkan title tanpa "group" keyword
-                    quiz_title_clean = grade.title.replace('Quiz ', '').strip()
-                    possible_quiz = Quiz.objects.filter(
-                        title__icontains=quiz_title_clean,
-                        is_group_quiz=True
-                    ).first()
+                quiz = group_quiz.quiz if group_quiz else grade.quiz
 
-                    if possible_quiz:
-                        quiz = possible_quiz
-                        logger.info(f"Found matching group quiz: {quiz.title}")
+                if group_quiz:
+                    group_data = build_group_data(
+                        group_quiz.group, request.user)
+                    logger.info(
+                        f"Found group data: {group_data['name']} with {len(group_data['members'])} members")
+                else:
+                    logger.warning(
+                        "Group quiz source not found for this grade")
 
             except Exception as e:
                 logger.error(f"Error finding grade: {e}")
@@ -1430,139 +1345,126 @@ class GroupQuizReviewView(APIView):
 
             if quiz:
                 try:
-                    # Cari user's group member
-                    user_group_member = GroupMember.objects.filter(
-                        student=request.user,
-                        group__material=quiz.material
-                    ).first()
-
-                    if user_group_member:
-                        # Cari GroupQuiz
-                        group_quiz = GroupQuiz.objects.filter(
-                            quiz=quiz,
-                            group=user_group_member.group
-                        ).first()
-
-                        if group_quiz:
-                            # Get submissions untuk group quiz ini
-                            group_submissions = GroupQuizSubmission.objects.filter(
+                    if group_quiz:
+                        # Get submissions untuk group quiz ini, per question
+                        submissions_by_question = {
+                            submission.question_id: submission
+                            for submission in GroupQuizSubmission.objects.filter(
                                 group_quiz=group_quiz
-                            ).select_related('question', 'student')
-
-                            # Get all questions untuk quiz ini
-                            all_questions = quiz.questions.all()
-
-                            for question in all_questions:
-                                # Cari submission untuk question ini
-                                submission = group_submissions.filter(
-                                    question=question).first()
-
-                                if submission:
-                                    is_correct = submission.is_correct
-                                    if is_correct:
-                                        correct_count += 1
-                                    else:
-                                        incorrect_count += 1
-
-                                    # User answer
-                                    user_answer = None
-                                    if submission.selected_choice:
-                                        choice_map = {
-                                            'A': question.choice_a,
-                                            'B': question.choice_b,
-                                            'C': question.choice_c,
-                                            'D': question.choice_d
-                                        }
-                                        user_answer = f"{submission.selected_choice}. {choice_map.get(submission.selected_choice, '')}"
-
-                                    # Correct answer
-                                    correct_answer = None
-                                    if hasattr(question, 'correct_choice') and question.correct_choice:
-                                        choice_map = {
-                                            'A': question.choice_a,
-                                            'B': question.choice_b,
-                                            'C': question.choice_c,
-                                            'D': question.choice_d
-                                        }
-                                        correct_answer = f"{question.correct_choice}. {choice_map.get(question.correct_choice, '')}"
-
-                                    questions_data.append({
-                                        'id': submission.id,
-                                        'question_id': question.id,
-                                        'question_text': question.text,
-                                        'question_image': getattr(question, 'image_url', None),
-                                        'question_type': 'multiple_choice',
-                                        'choices': {
-                                            'A': question.choice_a,
-                                            'B': question.choice_b,
-                                            'C': question.choice_c,
-                                            'D': question.choice_d
-                                        },
-                                        'user_answer': user_answer,
-                                        'selected_choice': submission.selected_choice,
-                                        'correct_answer': correct_answer,
-                                        'is_correct': is_correct,
-                                        'points': 1 if is_correct else 0,
-                                        'max_points': 1,
-                                        'explanation': getattr(question, 'explanation', None),
-                                        'answered_by_name': f"{submission.student.first_name} {submission.student.last_name}".strip() or submission.student.username,
-                                        'teacher_feedback': None
-                                    })
+                            ).select_related('student')
+                        }
+
+                        # Get all questions untuk quiz ini
+                        all_questions = quiz.questions.all()
+
+                        for question in all_questions:
+                            # Cari submission untuk question ini
+                            submission = submissions_by_question.get(
+                                question.id)
+
+                            if submission:
+                                is_correct = submission.is_correct
+                                if is_correct:
+                                    correct_count += 1
                                 else:
-                                    # Question tidak dijawab
-                                    unanswered_count += 1
-                                    correct_answer = None
-                                    if hasattr(question, 'correct_choice') and question.correct_choice:
-                                        choice_map = {
-                                            'A': question.choice_a,
-                                            'B': question.choice_b,
-                                            'C': question.choice_c,
-                                            'D': question.choice_d
-                                        }
-                                        correct_answer = f"{question.correct_choice}. {choice_map.get(question.correct_choice, '')}"
-
-                                    questions_data.append({
-                                        'id': f"unanswered_{question.id}",
-                                        'question_id': question.id,
-                                        'question_text': question.text,
-                                        'question_image': getattr(question, 'image_url', None),
-                                        'question_type': 'multiple_choice',
-                                        'choices': {
-                                            'A': question.choice_a,
-                                            'B': question.choice_b,
-                                            'C': question.choice_c,
-                                            'D': question.choice_d
-                                        },
-                                        'user_answer': None,
-                                        'selected_choice': None,
-                                        'correct_answer': correct_answer,
-                                        'is_correct': False,
-                                        'points': 0,
-                                        'max_points': 1,
-                                        'explanation': getattr(question, 'explanation', None),
-                                        'answered_by_name': 'Tidak dijawab',
-                                        'teacher_feedback': None
-                                    })
-
-                            # Get GroupQuizResult untuk informasi tambahan
-                            try:
-                                group_quiz_result = GroupQuizResult.objects.get(
-                                    group_quiz=group_quiz
-                                )
-                                completed_at = group_quiz_result.completed_at
-                                final_score = group_quiz_result.score
-                            except GroupQuizResult.DoesNotExist:
-                                completed_at = group_quiz.submitted_at
-                                final_score = grade.grade
-
-                            logger.info(
-                                f"Found {len(questions_data)} questions for group quiz")
-                        else:
-                            logger.warning(
-                                "GroupQuiz not found for user's group")
+                                    incorrect_count += 1
+
+                                # User answer
+                                user_answer = None
+                                if submission.selected_choice:
+                                    choice_map = {
+                                        'A': question.choice_a,
+                                        'B': question.choice_b,
+                                        'C': question.choice_c,
+                                        'D': question.choice_d
+                                    }
+                                    user_answer = f"{submission.selected_choice}. {choice_map.get(submission.selected_choice, '')}"
+
+                                # Correct answer
+                                correct_answer = None
+                                if hasattr(question, 'correct_choice') and question.correct_choice:
+                                    choice_map = {
+                                        'A': question.choice_a,
+                                        'B': question.choice_b,
+                                        'C': question.choice_c,
+                                        'D': question.choice_d
+                                    }
+                                    correct_answer = f"{question.correct_choice}. {choice_map.get(question.correct_choice, '')}"
+
+                                questions_data.append({
+                                    'id': submission.id,
+                                    'question_id': question.id,
+                                    'question_text': question.text,
+                                    'question_image': getattr(question, 'image_url', None),
+                                    'question_type': 'multiple_choice',
+                                    'choices': {
+                                        'A': question.choice_a,
+                                        'B': question.choice_b,
+                                        'C': question.choice_c,
+                                        'D': question.choice_d
+                                    },
+                                    'user_answer': user_answer,
+                                    'selected_choice': submission.selected_choice,
+                                    'correct_answer': correct_answer,
+                                    'is_correct': is_correct,
+                                    'points': 1 if is_correct else 0,
+                                    'max_points': 1,
+                                    'explanation': getattr(question, 'explanation', None),
+                                    'answered_by_name': f"{submission.student.first_name} {submission.student.last_name}".strip() or submission.student.username,
+                                    'teacher_feedback': None
+                                })
+                            else:
+                                # Question tidak dijawab
+                                unanswered_count += 1
+                                correct_answer = None
+                                if hasattr(question, 'correct_choice') and question.correct_choice:
+                                    choice_map = {
+                                        'A': question.choice_a,
+                                        'B': question.choice_b,
+                                        'C': question.choice_c,
+                                        'D': question.choice_d
+                                    }
+                                    correct_answer = f"{question.correct_choice}. {choice_map.get(question.correct_choice, '')}"
+
+                                questions_data.append({
+                                    'id': f"unanswered_{question.id}",
+                                    'question_id': question.id,
+                                    'question_text': question.text,
+                                    'question_image': getattr(question, 'image_url', None),
+                                    'question_type': 'multiple_choice',
+                                    'choices': {
+                                        'A': question.choice_a,
+                                        'B': question.choice_b,
+                                        'C': question.choice_c,
+                                        'D': question.choice_d
+                                    },
+                                    'user_answer': None,
+                                    'selected_choice': None,
+                                    'correct_answer': correct_answer,
+                                    'is_correct': False,
+                                    'points': 0,
+                                    'max_points': 1,
+                                    'explanation': getattr(question, 'explanation', None),
+                                    'answered_by_name': 'Tidak dijawab',
+                                    'teacher_feedback': None
+                                })
+
+                        # Get GroupQuizResult untuk informasi tambahan
+                        try:
+                            group_quiz_result = GroupQuizResult.objects.get(
+                                group_quiz=group_quiz
+                            )
+                            completed_at = group_quiz_result.completed_at
+                            final_score = group_quiz_result.score
+                        except GroupQuizResult.DoesNotExist:
+                            completed_at = group_quiz.submitted_at
+                            final_score = grade.grade
+
+                        logger.info(
+                            f"Found {len(questions_data)} questions for group quiz")
                     else:
                         logger.warning(
-                            "User not in any group for this quiz material")
+                            "GroupQuiz not found for this grade")
 
                 except Exception as e:
                     logger.error(f"Error getting group quiz questions: {e}")
@@ -1661,7 +1563,7 @@ class GroupQuizReviewView(APIView):
                 )
 
             if format_type == 'pdf':
-                return self.generate_group_quiz_pdf_report(grade, request.user)
+                return grade_report_artifact(grade, request.user).serve(request)
             else:
                 return self.generate_group_quiz_text_report(grade, request.user)
 
@@ -1672,11 +1574,29 @@ class GroupQuizReviewView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    def generate_group_quiz_pdf_report(self, grade, user):
-        """Generate Group Quiz PDF report - menggunakan method yang sama dengan individual quiz tapi dengan penyesuaian"""
+    def render_group_quiz_pdf_report(self, grade, user):
+        """Render Group Quiz PDF report - menggunakan method yang sama dengan individual quiz tapi dengan penyesuaian"""
         # Menggunakan method yang sama dari QuizReviewView dengan flag group quiz
         quiz_review_view = QuizReviewView()
-        return quiz_review_view.generate_quiz_pdf_report(grade, user)
+        return quiz_review_view.render_quiz_pdf_report(grade, user)
+
+
+def grade_report_artifact(grade, user):
+    """
+    Artifact report PDF untuk satu grade. Report quiz individu dan kelompok
+    memakai layout yang sama sehingga berbagi satu artifact.
+    """
+    if grade.type == 'assignment':
+        return ReportArtifactService(
+            'assignment-feedback',
+            grade,
+            lambda g: AssignmentFeedbackByGradeView().render_pdf_report(g, user),
+        )
+    return ReportArtifactService(
+        'quiz-report',
+        grade,
+        lambda g: QuizReviewView().render_quiz_pdf_report(g, user),
+    )
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -0,0 +1,93 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from pramlearnapp.services.notification_service import (
+    NotificationService,
+    CATCH_UP_LIMIT,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_MAX_PAGE_SIZE = 100
+
+
+class StudentNotificationListView(APIView):
+    """
+    Inbox notifikasi user, terbaru lebih dulu.
+
+    Query Parameters:
+    - before: id notifikasi, untuk halaman yang lebih lama
+    - after: id notifikasi, untuk notifikasi baru sejak cursor (urut naik)
+    - limit: jumlah item (maks 100)
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            limit = min(
+                int(request.query_params.get("limit", CATCH_UP_LIMIT)),
+                NOTIFICATION_MAX_PAGE_SIZE,
+            )
+            before = request.query_params.get("before")
+            after = request.query_params.get("after")
+            before = int(before) if before else None
+            after = int(after) if after else None
+        except ValueError:
+            return Response(
+                {"error": "before, after, dan limit harus berupa angka"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = max(limit, 1)
+
+        if after is not None:
+            results, cursor, has_more = NotificationService.catch_up(
+                request.user.id, after, limit
+            )
+        else:
+            results, has_more = NotificationService.history(
+                request.user.id, before, limit
+            )
+            cursor = results[0]["id"] if results else None
+
+        return Response(
+            {
+                "results": results,
+                "has_more": has_more,
+                "cursor": cursor,
+                "unread_count": NotificationService.unread_count(request.user.id),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class StudentNotificationDetailView(APIView):
+    """Hapus notifikasi dari inbox user"""
+
+    permission_classes = [IsAuthenticated]
+
+    def delete(self, request, notification_id):
+        if not NotificationService.remove(request.user.id, notification_id):
+            return Response(
+                {"error": "Notifikasi tidak ditemukan"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class StudentNotificationReadView(APIView):
+    """Tandai satu notifikasi, atau semua notifikasi, sudah dibaca"""
+
+    permission_classes = [IsAuthenticated]
+
+    def put(self, request, notification_id=None):
+        updated = NotificationService.mark_read(request.user.id, notification_id)
+        return Response(
+            {
+                "updated": updated,
+                "unread_count": NotificationService.unread_count(request.user.id),
+            },
+            status=status.HTTP_200_OK,
+        )
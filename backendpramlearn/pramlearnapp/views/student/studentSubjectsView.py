@@ -4,11 +4,14 @@ from rest_framework.permissions import IsAuthenticated
 from pramlearnapp.permissions import IsStudentUser
 from pramlearnapp.models import ClassStudent, Subject, SubjectClass, Material, CustomUser, StudentMaterialProgress, Schedule
 from django.db.models import Prefetch
+from pramlearnapp.decorators import cache_response
+from pramlearnapp.utils.cache import student_scope_tags
 
 
 class StudentSubjectsView(APIView):
     permission_classes = [IsAuthenticated, IsStudentUser]
 
+    @cache_response(tags=lambda request: student_scope_tags(request.user.pk))
     def get(self, request):
         user = request.user
         print("DEBUG IsStudentUser:", user, getattr(user, "role", None),
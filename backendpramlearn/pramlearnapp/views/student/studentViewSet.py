@@ -1,9 +1,10 @@
 from rest_framework import viewsets, permissions
 from pramlearnapp.models import CustomUser, Role
 from pramlearnapp.serializers.student.studentSerializer import StudentSerializer
+from pramlearnapp.mixins import ProjectedListMixin
 
 
-class StudentViewSet(viewsets.ModelViewSet):
+class StudentViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     """
     ViewSet untuk melihat dan mengedit instance Student.
     """
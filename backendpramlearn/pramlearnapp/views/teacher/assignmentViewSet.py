@@ -17,19 +17,20 @@ from pramlearnapp.serializers.teacher.assignmentSerializer import (
 )
 from pramlearnapp.decorators import student_required  # Add this import
 from pramlearnapp.services.gradeService import create_grade_from_submission
+from pramlearnapp.mixins import ProjectedListMixin
 import traceback
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class AssignmentViewSet(viewsets.ModelViewSet):
+class AssignmentViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     queryset = Assignment.objects.all()
     serializer_class = AssignmentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
 
-class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
+class AssignmentSubmissionViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     queryset = AssignmentSubmission.objects.all()
     serializer_class = AssignmentSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -4,9 +4,10 @@ from rest_framework.response import Response
 from django.http import Http404
 from pramlearnapp.models import Class, SubjectClass, ClassStudent
 from pramlearnapp.serializers import ClassSerializer, ClassDetailSerializer, SubjectClassSerializer
+from pramlearnapp.mixins import ProjectedListMixin
 
 
-class ClassViewSet(viewsets.ModelViewSet):
+class ClassViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     """
     ViewSet untuk melihat dan mengedit instance Class.
     """
@@ -67,7 +68,7 @@ class ClassDetailPage(generics.RetrieveAPIView):
         return super().get(request, *args, **kwargs)
 
 
-class SubjectClassViewSet(viewsets.ModelViewSet):
+class SubjectClassViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     queryset = SubjectClass.objects.all()
     serializer_class = SubjectClassSerializer
     permission_classes = [permissions.IsAuthenticated]
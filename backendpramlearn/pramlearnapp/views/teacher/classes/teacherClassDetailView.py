@@ -3,7 +3,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.utils import timezone
 from datetime import datetime, timedelta
-from django.db.models import Count, Avg, Q, F, Case, When, IntegerField
+from django.db.models import Count, Avg, Q, F, OuterRef, Subquery
 from django.shortcuts import get_object_or_404
 from pramlearnapp.models import (
     Class, SubjectClass, ClassStudent, CustomUser, 
@@ -11,6 +11,7 @@ from pramlearnapp.models import (
     GroupQuizResult, StudentAttendance, Material, Grade,
     StudentActivity, Subject, StudentMotivationProfile
 )
+from pramlearnapp.decorators import read_replica
 from pramlearnapp.permissions import IsTeacherUser
 from rest_framework.permissions import IsAuthenticated
 
@@ -21,6 +22,7 @@ class TeacherClassDetailView(APIView):
     """
     permission_classes = [IsAuthenticated, IsTeacherUser]
 
+    @read_replica
     def get(self, request, class_slug):
         user = request.user
         
@@ -40,10 +42,10 @@ class TeacherClassDetailView(APIView):
                     status=status.HTTP_403_FORBIDDEN
                 )
             
-            # Get teacher's subjects in this class
+            # Get teacher's subjects in this class (jumlah materi dihitung sekaligus)
             teacher_subjects = Subject.objects.filter(
                 id__in=teacher_subject_classes.values_list('subject_id', flat=True)
-            )
+            ).annotate(materials_count=Count('materials'))
             
             # Get materials for teacher's subjects
             materials = Material.objects.filter(
@@ -60,31 +62,37 @@ class TeacherClassDetailView(APIView):
             
             # Add subjects info
             for subject in teacher_subjects:
-                subject_materials = materials.filter(subject=subject)
                 class_info['subjects'].append({
                     'id': subject.id,
                     'name': subject.name,
                     'slug': subject.slug,
-                    'materials_count': subject_materials.count()
+                    'materials_count': subject.materials_count
                 })
-            
+
+            # Student kelas diambil sekali dan dipakai semua bagian
+            student_ids = list(
+                ClassStudent.objects.filter(
+                    class_id=class_obj.id
+                ).values_list('student_id', flat=True)
+            )
+
             # Get students in class with detailed info
-            students_data = self.get_students_data(class_obj, materials, user)
-            
+            students_data = self.get_students_data(student_ids, materials)
+
             # Get class performance overview
-            performance_overview = self.get_performance_overview(class_obj, materials, user)
-            
+            performance_overview = self.get_performance_overview(student_ids, materials)
+
             # Get attendance summary
-            attendance_summary = self.get_attendance_summary(class_obj, materials)
-            
+            attendance_summary = self.get_attendance_summary(student_ids, materials)
+
             # Get recent activities
-            recent_activities = self.get_recent_activities(class_obj, materials)
-            
+            recent_activities = self.get_recent_activities(student_ids)
+
             # Get assignment statistics
-            assignment_stats = self.get_assignment_statistics(class_obj, materials)
-            
+            assignment_stats = self.get_assignment_statistics(student_ids, materials)
+
             # Get quiz statistics
-            quiz_stats = self.get_quiz_statistics(class_obj, materials)
+            quiz_stats = self.get_quiz_statistics(student_ids, materials)
             
             return Response({
                 'class_info': class_info,
@@ -102,76 +110,94 @@ class TeacherClassDetailView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
-    def get_students_data(self, class_obj, materials, teacher):
-        """Get detailed students data with performance metrics"""
-        class_students = ClassStudent.objects.filter(
-            class_id=class_obj.id
-        ).select_related('student')
-        
-        students_data = []
-        
-        for class_student in class_students:
-            student = class_student.student
-            
-            # Get student's grades for teacher's materials
-            grades = Grade.objects.filter(
-                Q(assignment__material__in=materials) |
-                Q(quiz__material__in=materials) |
-                Q(material__in=materials),
-                student=student
+    @staticmethod
+    def material_grades(materials):
+        """Grade yang berasal dari material teacher (tugas, quiz, atau material)"""
+        return Grade.objects.filter(
+            Q(assignment__material__in=materials) |
+            Q(quiz__material__in=materials) |
+            Q(material__in=materials)
+        )
+
+    def get_students_data(self, student_ids, materials):
+        """
+        Get detailed students data with performance metrics.
+        Semua metrik dihitung dengan agregasi per student (jumlah query tetap,
+        tidak bergantung pada jumlah student).
+        """
+        latest_activity = StudentActivity.objects.filter(
+            student=OuterRef('pk')
+        ).order_by('-timestamp').values('timestamp')[:1]
+
+        students = CustomUser.objects.filter(id__in=student_ids).annotate(
+            latest_activity_at=Subquery(latest_activity),
+            motivation_profile_id=F('studentmotivationprofile__id'),
+            motivation_level=F('studentmotivationprofile__motivation_level'),
+        )
+
+        grade_stats = {
+            row['student_id']: row
+            for row in self.material_grades(materials).filter(
+                student_id__in=student_ids
+            ).values('student_id').annotate(
+                avg=Avg('grade'), total=Count('id')
             )
-            
-            avg_grade = grades.aggregate(avg=Avg('grade'))['avg'] or 0
-            total_assessments = grades.count()
-            
-            # Get attendance for teacher's materials
-            attendance_records = StudentAttendance.objects.filter(
-                student=student,
+        }
+
+        attendance_stats = {
+            row['student_id']: row
+            for row in StudentAttendance.objects.filter(
+                student_id__in=student_ids,
                 material__in=materials
+            ).values('student_id').annotate(
+                total=Count('id'),
+                present=Count('id', filter=Q(status='present'))
             )
-            
-            total_attendance = attendance_records.count()
-            present_count = attendance_records.filter(status='present').count()
-            attendance_rate = 0
-            if total_attendance > 0:
-                attendance_rate = round((present_count / total_attendance) * 100, 1)
-            
-            # Get assignment submissions
-            assignment_submissions = AssignmentSubmission.objects.filter(
-                student=student,
+        }
+
+        submission_counts = dict(
+            AssignmentSubmission.objects.filter(
+                student_id__in=student_ids,
                 assignment__material__in=materials,
                 is_draft=False
-            )
-            
-            submitted_assignments = assignment_submissions.count()
-            total_assignments = Assignment.objects.filter(material__in=materials).count()
-            
+            ).values('student_id').annotate(
+                total=Count('id')
+            ).values_list('student_id', 'total')
+        )
+
+        total_assignments = Assignment.objects.filter(material__in=materials).count()
+
+        students_data = []
+
+        for student in students:
+            grades = grade_stats.get(student.id, {})
+            avg_grade = grades.get('avg') or 0
+            total_assessments = grades.get('total', 0)
+
+            attendance = attendance_stats.get(student.id, {})
+            total_attendance = attendance.get('total', 0)
+            attendance_rate = 0
+            if total_attendance > 0:
+                attendance_rate = round((attendance['present'] / total_attendance) * 100, 1)
+
+            submitted_assignments = submission_counts.get(student.id, 0)
             submission_rate = 0
             if total_assignments > 0:
                 submission_rate = round((submitted_assignments / total_assignments) * 100, 1)
-            
-            # Get motivation profile
-            motivation_level = None
-            try:
-                profile = StudentMotivationProfile.objects.get(student=student)
-                motivation_level = profile.motivation_level
-            except StudentMotivationProfile.DoesNotExist:
-                motivation_level = 'Unknown'
-            
-            # Get recent activity
-            recent_activity = StudentActivity.objects.filter(
-                student=student
-            ).order_by('-timestamp').first()
-            
+
+            motivation_level = (
+                student.motivation_level if student.motivation_profile_id else 'Unknown'
+            )
+
             last_activity = None
-            if recent_activity:
-                last_activity = recent_activity.timestamp.isoformat()
-            
+            if student.latest_activity_at:
+                last_activity = student.latest_activity_at.isoformat()
+
             # Performance status
             performance_status = self.get_student_performance_status(
                 avg_grade, attendance_rate, submission_rate
             )
-            
+
             students_data.append({
                 'id': student.id,
                 'username': student.username,
@@ -188,50 +214,43 @@ class TeacherClassDetailView(APIView):
                 'motivation_level': motivation_level,
                 'performance_status': performance_status
             })
-        
+
         # Sort by performance (average grade desc, then attendance rate desc)
         students_data.sort(key=lambda x: (-x['average_grade'], -x['attendance_rate']))
-        
+
         return students_data
-    
-    def get_performance_overview(self, class_obj, materials, teacher):
+
+    def get_performance_overview(self, student_ids, materials):
         """Get class performance overview"""
-        student_ids = ClassStudent.objects.filter(
-            class_id=class_obj.id
-        ).values_list('student_id', flat=True)
-        
-        # Grade statistics
-        grades = Grade.objects.filter(
-            Q(assignment__material__in=materials) |
-            Q(quiz__material__in=materials) |
-            Q(material__in=materials),
+        # Grade statistics dan distribusi dalam satu agregasi
+        grade_stats = self.material_grades(materials).filter(
             student_id__in=student_ids
+        ).aggregate(
+            avg=Avg('grade'),
+            total=Count('id'),
+            A=Count('id', filter=Q(grade__gte=90)),
+            B=Count('id', filter=Q(grade__gte=80, grade__lt=90)),
+            C=Count('id', filter=Q(grade__gte=70, grade__lt=80)),
+            D=Count('id', filter=Q(grade__gte=60, grade__lt=70)),
+            E=Count('id', filter=Q(grade__lt=60)),
         )
-        
-        avg_grade = grades.aggregate(avg=Avg('grade'))['avg'] or 0
-        total_assessments = grades.count()
-        
-        # Grade distribution
-        grade_distribution = {
-            'A': grades.filter(grade__gte=90).count(),
-            'B': grades.filter(grade__gte=80, grade__lt=90).count(),
-            'C': grades.filter(grade__gte=70, grade__lt=80).count(),
-            'D': grades.filter(grade__gte=60, grade__lt=70).count(),
-            'E': grades.filter(grade__lt=60).count()
-        }
-        
+
+        avg_grade = grade_stats['avg'] or 0
+        grade_distribution = {key: grade_stats[key] for key in ['A', 'B', 'C', 'D', 'E']}
+
         # Attendance statistics
-        attendance_records = StudentAttendance.objects.filter(
+        attendance = StudentAttendance.objects.filter(
             student_id__in=student_ids,
             material__in=materials
+        ).aggregate(
+            total=Count('id'),
+            present=Count('id', filter=Q(status='present'))
         )
-        
-        total_attendance = attendance_records.count()
-        present_count = attendance_records.filter(status='present').count()
+
         class_attendance_rate = 0
-        if total_attendance > 0:
-            class_attendance_rate = round((present_count / total_attendance) * 100, 1)
-        
+        if attendance['total'] > 0:
+            class_attendance_rate = round((attendance['present'] / attendance['total']) * 100, 1)
+
         # Assignment statistics
         total_assignments = Assignment.objects.filter(material__in=materials).count()
         submitted_assignments = AssignmentSubmission.objects.filter(
@@ -239,70 +258,64 @@ class TeacherClassDetailView(APIView):
             assignment__material__in=materials,
             is_draft=False
         ).count()
-        
+
         class_submission_rate = 0
         if total_assignments > 0 and len(student_ids) > 0:
             expected_submissions = total_assignments * len(student_ids)
             class_submission_rate = round((submitted_assignments / expected_submissions) * 100, 1)
-        
+
         return {
             'total_students': len(student_ids),
             'average_grade': round(avg_grade, 1),
-            'total_assessments': total_assessments,
+            'total_assessments': grade_stats['total'],
             'grade_distribution': grade_distribution,
             'attendance_rate': class_attendance_rate,
             'submission_rate': class_submission_rate,
             'performance_trend': self.get_performance_trend(student_ids, materials)
         }
-    
-    def get_attendance_summary(self, class_obj, materials):
-        """Get attendance summary by material"""
-        student_ids = ClassStudent.objects.filter(
-            class_id=class_obj.id
-        ).values_list('student_id', flat=True)
-        
+
+    def get_attendance_summary(self, student_ids, materials):
+        """Get attendance summary by material (satu query teragregasi)"""
+        in_class = Q(studentattendance__student_id__in=student_ids)
+        materials_with_counts = materials.select_related('subject').annotate(
+            total_records=Count('studentattendance', filter=in_class),
+            present_count=Count(
+                'studentattendance', filter=in_class & Q(studentattendance__status='present')),
+            absent_count=Count(
+                'studentattendance', filter=in_class & Q(studentattendance__status='absent')),
+            late_count=Count(
+                'studentattendance', filter=in_class & Q(studentattendance__status='late')),
+            excused_count=Count(
+                'studentattendance', filter=in_class & Q(studentattendance__status='excused')),
+        )
+
         attendance_by_material = []
-        
-        for material in materials:
-            attendance_records = StudentAttendance.objects.filter(
-                student_id__in=student_ids,
-                material=material
-            )
-            
-            total = attendance_records.count()
-            present = attendance_records.filter(status='present').count()
-            absent = attendance_records.filter(status='absent').count()
-            late = attendance_records.filter(status='late').count()
-            excused = attendance_records.filter(status='excused').count()
-            
+
+        for material in materials_with_counts:
             rate = 0
-            if total > 0:
-                rate = round((present / total) * 100, 1)
-            
+            if material.total_records > 0:
+                rate = round((material.present_count / material.total_records) * 100, 1)
+
             attendance_by_material.append({
                 'material_id': material.id,
                 'material_name': material.title,
                 'subject_name': material.subject.name,
-                'total_records': total,
-                'present_count': present,
-                'absent_count': absent,
-                'late_count': late,
-                'excused_count': excused,
+                'total_records': material.total_records,
+                'present_count': material.present_count,
+                'absent_count': material.absent_count,
+                'late_count': material.late_count,
+                'excused_count': material.excused_count,
                 'attendance_rate': rate
             })
-        
+
         return attendance_by_material
-    
-    def get_recent_activities(self, class_obj, materials):
+
+    def get_recent_activities(self, student_ids):
         """Get recent activities from students in this class"""
-        student_ids = ClassStudent.objects.filter(
-            class_id=class_obj.id
-        ).values_list('student_id', flat=True)
-        
         activities = StudentActivity.objects.filter(
             student_id__in=student_ids
-        ).order_by('-timestamp')[:10]
-        
+        ).select_related('student').order_by('-timestamp')[:10]
+
         activities_data = []
         for activity in activities:
             activities_data.append({
@@ -311,95 +324,80 @@ class TeacherClassDetailView(APIView):
                 'title': activity.title,
                 'timestamp': activity.timestamp.isoformat()
             })
-        
+
         return activities_data
-    
-    def get_assignment_statistics(self, class_obj, materials):
+
+    def get_assignment_statistics(self, student_ids, materials):
         """Get assignment statistics"""
-        student_ids = ClassStudent.objects.filter(
-            class_id=class_obj.id
-        ).values_list('student_id', flat=True)
-        
-        assignments = Assignment.objects.filter(material__in=materials)
-        total_assignments = assignments.count()
-        
+        total_assignments = Assignment.objects.filter(material__in=materials).count()
+
         # Submissions statistics
         submissions = AssignmentSubmission.objects.filter(
             assignment__material__in=materials,
             student_id__in=student_ids,
             is_draft=False
+        ).aggregate(
+            total=Count('id'),
+            graded=Count('id', filter=Q(grade__isnull=False)),
+            pending=Count('id', filter=Q(grade__isnull=True)),
+            avg_grade=Avg('grade', filter=Q(grade__isnull=False)),
         )
-        
-        total_submissions = submissions.count()
-        graded_submissions = submissions.filter(grade__isnull=False).count()
-        pending_submissions = submissions.filter(grade__isnull=True).count()
-        
-        avg_submission_grade = submissions.filter(
-            grade__isnull=False
-        ).aggregate(avg=Avg('grade'))['avg'] or 0
-        
+
         return {
             'total_assignments': total_assignments,
-            'total_submissions': total_submissions,
-            'graded_submissions': graded_submissions,
-            'pending_submissions': pending_submissions,
-            'average_submission_grade': round(avg_submission_grade, 1)
+            'total_submissions': submissions['total'],
+            'graded_submissions': submissions['graded'],
+            'pending_submissions': submissions['pending'],
+            'average_submission_grade': round(submissions['avg_grade'] or 0, 1)
         }
-    
-    def get_quiz_statistics(self, class_obj, materials):
+
+    def get_quiz_statistics(self, student_ids, materials):
         """Get quiz statistics"""
-        student_ids = ClassStudent.objects.filter(
-            class_id=class_obj.id
-        ).values_list('student_id', flat=True)
-        
         quizzes = Quiz.objects.filter(material__in=materials)
         total_quizzes = quizzes.count()
-        
+
         # Group quiz results
         group_quiz_results = GroupQuizResult.objects.filter(
             group_quiz__quiz__material__in=materials,
             group_quiz__group__groupmember__student_id__in=student_ids
         ).distinct()
-        
+
         total_attempts = group_quiz_results.count()
         avg_quiz_score = group_quiz_results.aggregate(
             avg=Avg('score')
         )['avg'] or 0
-        
+
         return {
             'total_quizzes': total_quizzes,
             'total_attempts': total_attempts,
             'average_quiz_score': round(avg_quiz_score, 1)
         }
-    
+
     def get_performance_trend(self, student_ids, materials):
-        """Get performance trend over last 30 days"""
+        """Get performance trend over last 30 days (4 minggu, satu agregasi)"""
         thirty_days_ago = timezone.now() - timedelta(days=30)
-        
-        # Get grades from last 30 days grouped by week
-        weekly_grades = []
+
+        weeks = {}
         for i in range(4):  # 4 weeks
             week_start = thirty_days_ago + timedelta(weeks=i)
             week_end = week_start + timedelta(weeks=1)
-            
-            week_grades = Grade.objects.filter(
-                (
-                    Q(assignment__material__in=materials) |
-                    Q(quiz__material__in=materials) |
-                    Q(material__in=materials)
-                ),
-                student_id__in=student_ids,
-                date__gte=week_start,
-                date__lt=week_end
-            ).aggregate(avg=Avg('grade'))['avg'] or 0
-            
-            weekly_grades.append({
+            weeks[f'week_{i + 1}'] = Avg(
+                'grade', filter=Q(date__gte=week_start, date__lt=week_end)
+            )
+
+        averages = self.material_grades(materials).filter(
+            student_id__in=student_ids,
+            date__gte=thirty_days_ago
+        ).aggregate(**weeks)
+
+        return [
+            {
                 'week': i + 1,
-                'average_grade': round(week_grades, 1)
-            })
-        
-        return weekly_grades
-    
+                'average_grade': round(averages[f'week_{i + 1}'] or 0, 1)
+            }
+            for i in range(4)
+        ]
+
     def get_student_performance_status(self, avg_grade, attendance_rate, submission_rate):
         """Get student performance status"""
         # Calculate overall score based on weighted average
@@ -0,0 +1,98 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from pramlearnapp.models import Class, Subject
+from pramlearnapp.permissions import IsTeacherUser
+from pramlearnapp.services.gradebook_export_service import GradebookExportService
+from pramlearnapp.utils.streaming import streaming_response
+from pramlearnapp.views.student.studentGradeView import grade_report_artifact
+import logging
+
+logger = logging.getLogger(__name__)
+
+XLSX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
+
+
+class TeacherGradeExportMixin:
+    """Scope export: kelas (class_slug) atau mata pelajaran (subject_slug)"""
+
+    permission_classes = [IsAuthenticated, IsTeacherUser]
+
+    def get_export_service(self, request, class_slug=None, subject_slug=None):
+        if class_slug:
+            class_obj = get_object_or_404(Class, slug=class_slug)
+            return GradebookExportService(request.user, class_obj=class_obj)
+        subject = get_object_or_404(Subject, slug=subject_slug)
+        return GradebookExportService(request.user, subject=subject)
+
+    def forbidden(self):
+        return Response(
+            {"error": "You do not have access to this class or subject"},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+
+class TeacherGradebookExportView(TeacherGradeExportMixin, APIView):
+    """
+    Export gradebook kelas/mata pelajaran sebagai CSV (default) atau XLSX.
+
+    Query Parameters:
+    - type: csv | xlsx
+    """
+
+    def get(self, request, class_slug=None, subject_slug=None):
+        service = self.get_export_service(request, class_slug, subject_slug)
+        if not service.has_access():
+            return self.forbidden()
+
+        export_type = request.query_params.get("type", "csv").lower()
+        if export_type not in ("csv", "xlsx"):
+            return Response(
+                {"error": "type harus csv atau xlsx"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        filename = f"{service.export_name}.{export_type}"
+        if export_type == "xlsx":
+            return FileResponse(
+                service.write_xlsx(),
+                as_attachment=True,
+                filename=filename,
+                content_type=XLSX_CONTENT_TYPE,
+            )
+
+        response = streaming_response(
+            request, service.iter_csv(), content_type="text/csv; charset=utf-8"
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class TeacherGradeReportsExportView(TeacherGradeExportMixin, APIView):
+    """
+    Export zip berisi gradebook.csv dan report PDF setiap grade siswa
+    (satu folder per siswa). Report dirender paralel dan zip di-stream.
+    """
+
+    def get(self, request, class_slug=None, subject_slug=None):
+        service = self.get_export_service(request, class_slug, subject_slug)
+        if not service.has_access():
+            return self.forbidden()
+
+        logger.info(
+            f"Grade reports export {service.export_name} by {request.user.username}"
+        )
+        response = streaming_response(
+            request,
+            service.iter_reports_zip(grade_report_artifact),
+            content_type="application/zip",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{service.export_name}-reports.zip"'
+        )
+        return response
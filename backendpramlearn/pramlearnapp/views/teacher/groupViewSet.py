@@ -11,9 +11,10 @@ from rest_framework import status
 from rest_framework.decorators import action
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
+from pramlearnapp.mixins import ProjectedListMixin
 
 
-class GroupViewSet(viewsets.ModelViewSet):
+class GroupViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     queryset = Group.objects.all()
     serializer_class = GroupSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -26,7 +27,7 @@ class GroupViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class GroupMemberViewSet(viewsets.ModelViewSet):
+class GroupMemberViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     """
     ViewSet untuk melihat dan mengedit instance GroupMember.
     """
@@ -2,15 +2,16 @@ from rest_framework import viewsets, generics, permissions
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from django.http import Http404
-from pramlearnapp.models import Material, Subject, StudentActivity
+from pramlearnapp.models import Material, Subject
 from pramlearnapp.serializers import MaterialSerializer, MaterialDetailSerializer
 from rest_framework.response import Response
 from rest_framework import status
-from django.utils import timezone
 from rest_framework.exceptions import ValidationError
+from pramlearnapp.mixins import ProjectedListMixin
+from pramlearnapp.utils.log_student_activity import log_student_activity
 
 
-class MaterialViewSet(viewsets.ModelViewSet):
+class MaterialViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     queryset = Material.objects.all()
     serializer_class = MaterialSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -98,11 +99,10 @@ class MaterialAccessView(APIView):
             return Response({"detail": "Material not found."}, status=404)
 
         # Catat aktivitas akses materi
-        StudentActivity.objects.create(
-            student=user,
-            title=f"Mengakses Materi: {material.title}",
-            # description=f"Kamu membuka materi '{material.title}'."
-            activity_type="material",
-            timestamp=timezone.now(),
+        log_student_activity(
+            user,
+            f"Mengakses Materi: {material.title}",
+            "material",
+            related_object_id=material.id,
         )
         return Response({"detail": "Material access recorded."}, status=200)
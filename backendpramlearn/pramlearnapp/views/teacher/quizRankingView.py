@@ -4,6 +4,8 @@ from rest_framework import permissions, status
 from django.db.models import Count, Avg, Q, F
 from pramlearnapp.models import Quiz, Group, GroupQuiz, GroupQuizSubmission, GroupQuizResult, GroupMember, CustomUser
 from pramlearnapp.serializers.teacher.groupSerializer import GroupSerializer
+from pramlearnapp.decorators import cache_response
+from pramlearnapp.utils.cache import quiz_tag
 
 
 class QuizRankingView(APIView):
@@ -12,6 +14,11 @@ class QuizRankingView(APIView):
     """
     permission_classes = [permissions.IsAuthenticated]
 
+    @cache_response(
+        timeout=30,
+        tags=lambda request, quiz_id: [quiz_tag(quiz_id)],
+        per_user=False,
+    )
     def get(self, request, quiz_id):
         material_id = request.query_params.get('material_id')
 
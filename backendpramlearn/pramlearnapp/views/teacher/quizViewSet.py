@@ -1,9 +1,10 @@
 from rest_framework import viewsets, permissions
 from pramlearnapp.models import Quiz
 from pramlearnapp.serializers import QuizSerializer
+from pramlearnapp.mixins import ProjectedListMixin
 
 
-class QuizViewSet(viewsets.ModelViewSet):
+class QuizViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     queryset = Quiz.objects.all()
     serializer_class = QuizSerializer
 
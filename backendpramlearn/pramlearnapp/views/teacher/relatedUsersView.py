@@ -5,9 +5,8 @@ from pramlearnapp.models import SubjectClass, ClassStudent, CustomUser, Class
 from pramlearnapp.serializers import StudentSerializer
 from pramlearnapp.permissions import IsTeacherUser
 from pramlearnapp.serializers.user import CustomUserSerializer
+from pramlearnapp.services.presence_service import PresenceService
 from django.utils import timezone
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
 
 
 class CurrentUserView(APIView):
@@ -19,63 +18,32 @@ class CurrentUserView(APIView):
         return Response(serializer.data)
 
     def patch(self, request):
-        """Update status online user"""
+        """
+        Heartbeat status online user. Status disimpan di PresenceService
+        (cache); tabel user hanya ditulis saat status berubah atau saat flush.
+        """
         user = request.user
-        allowed_fields = ['is_online', 'last_activity']
 
         # Handle data dari form atau JSON
         if request.content_type == 'application/json':
             data = request.data
         else:
             # Handle FormData dari sendBeacon
-            data = {}
-            for field in allowed_fields:
-                if field in request.POST:
-                    data[field] = request.POST[field]
+            data = request.POST
 
-        # Update field yang diizinkan
-        update_data = {}
-        for field in allowed_fields:
-            if field in data:
-                update_data[field] = data[field]
+        is_online = data.get('is_online', True)
+        if isinstance(is_online, str):
+            is_online = is_online.lower() in ('true', '1', 'yes')
 
-        # Update database
-        for field, value in update_data.items():
-            if field == 'last_activity':
-                if isinstance(value, str):
-                    from django.utils.dateparse import parse_datetime
-                    from django.utils import timezone
-                    parsed_value = parse_datetime(value)
-                    value = parsed_value if parsed_value else timezone.now()
-                setattr(user, field, value)
-            elif field == 'is_online':
-                if isinstance(value, str):
-                    value = value.lower() in ('true', '1', 'yes')
-                setattr(user, field, value)
-            else:
-                setattr(user, field, value)
-
-        user.save()
-        print(
-            f"💾 User {user.username} status updated: is_online={user.is_online}")
-
-        # Broadcast real-time update via WebSocket
-        try:
-            channel_layer = get_channel_layer()
-            if channel_layer:
-                async_to_sync(channel_layer.group_send)(
-                    "user_status_updates",
-                    {
-                        'type': 'user_status_update',
-                        'user_id': user.id,
-                        'is_online': user.is_online,
-                        'last_activity': user.last_activity.isoformat() if user.last_activity else None
-                    }
-                )
-                print(f"📡 WebSocket broadcast sent for user {user.username}")
-        except Exception as e:
-            print(f"❌ WebSocket broadcast error: {e}")
+        now = timezone.now()
+        if is_online:
+            PresenceService.heartbeat(user.id, now)
+        else:
+            PresenceService.go_offline(user.id, now)
 
+        # Refleksikan status presence tanpa menyimpan ulang seluruh row user
+        user.is_online = bool(is_online)
+        user.last_activity = now
         serializer = CustomUserSerializer(user)
         return Response(serializer.data)
 
@@ -17,7 +17,9 @@ from pramlearnapp.serializers.teacher.arcs_questionnaire import (
     ARCSQuestionSerializer,
     ARCSResponseSerializer,
 )
+from pramlearnapp.decorators import read_replica
 from pramlearnapp.permissions import IsTeacherUser
+from pramlearnapp.services.arcs_analytics_service import ARCSAnalyticsService
 from rest_framework.permissions import IsAuthenticated
 
 
@@ -276,6 +278,7 @@ class TeacherSessionARCSResponsesView(APIView):
 
     permission_classes = [IsAuthenticated, IsTeacherUser]
 
+    @read_replica
     def get(self, request, material_slug, questionnaire_id):
         try:
             # Verify access
@@ -344,32 +347,10 @@ class TeacherSessionARCSAnalyticsView(APIView):
                 ARCSQuestionnaire, id=questionnaire_id, material=material
             )
 
-            # Calculate ARCS dimension averages
-            from pramlearnapp.models.arcs_questionnaire import ARCSAnswer
-
-            dimension_stats = {}
-            for dimension, _ in ARCSQuestion.ARCS_DIMENSIONS:
-                questions = questionnaire.questions.filter(dimension=dimension)
-                if questions.exists():
-                    answers = ARCSAnswer.objects.filter(
-                        question__in=questions,
-                        response__is_completed=True,
-                        likert_value__isnull=False,
-                    )
-
-                    if answers.exists():
-                        avg_score = answers.aggregate(avg=Avg("likert_value"))["avg"]
-                        dimension_stats[dimension] = {
-                            "average_score": round(avg_score, 2),
-                            "total_responses": answers.count(),
-                            "questions_count": questions.count(),
-                        }
-                    else:
-                        dimension_stats[dimension] = {
-                            "average_score": 0,
-                            "total_responses": 0,
-                            "questions_count": questions.count(),
-                        }
+            # Statistik semua dimensi ARCS (cached per kuesioner)
+            dimension_stats = ARCSAnalyticsService(
+                questionnaire
+            ).get_dimension_statistics()
 
             return Response(
                 {
@@ -16,6 +16,9 @@ from pramlearnapp.models import (
 )
 from pramlearnapp.permissions import IsTeacherUser
 from rest_framework.permissions import IsAuthenticated
+from pramlearnapp.services.assignment_analytics_service import (
+    AssignmentAnalyticsService,
+)
 from pramlearnapp.serializers.teacher.assignmentSerializer import (
     AssignmentSerializer,
     AssignmentSubmissionSerializer,
@@ -43,15 +46,8 @@ class TeacherSessionAssignmentView(APIView):
                 SubjectClass, subject=material.subject, teacher=request.user
             )
 
-            # Get assignments dengan relasi yang diperlukan
-            assignments = (
-                Assignment.objects.filter(material=material)
-                .prefetch_related(
-                    "questions",
-                    "assignmentsubmission_set__student",
-                    "assignmentsubmission_set__answers",
-                )
-                .order_by("-created_at")
+            assignments = list(
+                Assignment.objects.filter(material=material).order_by("-created_at")
             )
 
             # Get students in this class for context
@@ -59,7 +55,6 @@ class TeacherSessionAssignmentView(APIView):
                 class_id=subject_class.class_id
             ).select_related("student")
 
-            total_students = class_students.count()
             students_data = []
             for cs in class_students:
                 student = cs.student
@@ -73,20 +68,19 @@ class TeacherSessionAssignmentView(APIView):
                         or student.username,
                     }
                 )
+            total_students = len(students_data)
+
+            # Statistik submission semua assignment dalam satu query agregat
+            analytics_service = AssignmentAnalyticsService(
+                material, subject_class.class_id
+            )
+            summary = analytics_service.submission_summary([a.id for a in assignments])
 
+            now = timezone.now()
             assignments_data = []
             for assignment in assignments:
-                # Get submission statistics
-                submissions = assignment.assignmentsubmission_set.filter(is_draft=False)
-                total_submissions = submissions.count()
-                graded_submissions = submissions.filter(grade__isnull=False).count()
-                pending_submissions = submissions.filter(grade__isnull=True).count()
-
-                # Calculate average grade
-                avg_grade = 0
-                if graded_submissions > 0:
-                    grades = submissions.filter(grade__isnull=False)
-                    avg_grade = grades.aggregate(avg=Avg("grade"))["avg"] or 0
+                stats = summary[assignment.id]
+                total_submissions = stats["total_submissions"]
 
                 # Get submission rate
                 submission_rate = (
@@ -96,17 +90,7 @@ class TeacherSessionAssignmentView(APIView):
                 )
 
                 # Check if assignment is overdue
-                is_overdue = (
-                    timezone.now() > assignment.due_date
-                    if assignment.due_date
-                    else False
-                )
-
-                # Get recent submissions (last 24 hours)
-                yesterday = timezone.now() - timedelta(hours=24)
-                recent_submissions = submissions.filter(
-                    submission_date__gte=yesterday
-                ).count()
+                is_overdue = now > assignment.due_date if assignment.due_date else False
 
                 assignment_dict = {
                     "id": assignment.id,
@@ -118,14 +102,14 @@ class TeacherSessionAssignmentView(APIView):
                     "created_at": assignment.created_at.isoformat(),
                     "updated_at": assignment.updated_at.isoformat(),
                     "slug": assignment.slug,
-                    "question_count": assignment.questions.count(),
+                    "question_count": stats["question_count"],
                     "total_submissions": total_submissions,
-                    "graded_submissions": graded_submissions,
-                    "pending_submissions": pending_submissions,
-                    "average_grade": round(avg_grade, 1),
+                    "graded_submissions": stats["graded_submissions"],
+                    "pending_submissions": stats["pending_submissions"],
+                    "average_grade": round(stats["average_grade"], 1),
                     "submission_rate": round(submission_rate, 1),
                     "is_overdue": is_overdue,
-                    "recent_submissions": recent_submissions,
+                    "recent_submissions": stats["recent_submissions"],
                     "status": self.get_assignment_status(
                         assignment, total_submissions, total_students
                     ),
@@ -653,16 +637,16 @@ class TeacherSessionAssignmentAnalyticsView(APIView):
                 SubjectClass, subject=material.subject, teacher=request.user
             )
 
-            assignments = Assignment.objects.filter(material=material)
+            analytics_service = AssignmentAnalyticsService(
+                material, subject_class.class_id
+            )
 
             # Performance analytics
             analytics_data = {
-                "performance_trend": self.get_performance_trend(assignments),
-                "question_analysis": self.get_question_analysis(assignments),
-                "student_performance": self.get_student_performance(
-                    assignments, subject_class.class_id
-                ),
-                "submission_timeline": self.get_submission_timeline(assignments),
+                "performance_trend": analytics_service.get_performance_trend(),
+                "question_analysis": analytics_service.get_question_analysis(),
+                "student_performance": analytics_service.get_student_performance(),
+                "submission_timeline": analytics_service.get_submission_timeline(),
             }
 
             return Response(analytics_data, status=status.HTTP_200_OK)
@@ -673,23 +657,3 @@ class TeacherSessionAssignmentAnalyticsView(APIView):
                 {"error": f"Failed to fetch analytics: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
-
-    def get_performance_trend(self, assignments):
-        """Calculate performance trend over time"""
-        # Implementation for performance trend analysis
-        return []
-
-    def get_question_analysis(self, assignments):
-        """Analyze question difficulty and accuracy"""
-        # Implementation for question analysis
-        return []
-
-    def get_student_performance(self, assignments, class_obj):
-        """Analyze individual student performance"""
-        # Implementation for student performance analysis
-        return []
-
-    def get_submission_timeline(self, assignments):
-        """Analyze submission patterns"""
-        # Implementation for submission timeline analysis
-        return []
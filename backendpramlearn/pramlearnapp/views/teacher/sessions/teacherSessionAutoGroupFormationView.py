@@ -10,6 +10,7 @@ from pramlearnapp.models import (
     SubjectClass,
     StudentMotivationProfile,
 )
+from pramlearnapp.decorators import read_replica
 from pramlearnapp.permissions import IsTeacherUser
 from rest_framework.permissions import IsAuthenticated
 from pramlearnapp.services.group_formation_pdf_service import GroupFormationPDFService
@@ -46,6 +47,7 @@ class TeacherSessionAutoGroupFormationView(APIView):
         self.algorithms = GroupFormationAlgorithms()
         self.quality_service = GroupQualityService()
 
+    @read_replica
     def get(self, request, material_slug):
         """
         Menangani permintaan GET untuk ekspor PDF analisis kelompok atau analisis kelas.
@@ -28,6 +28,56 @@ from pramlearnapp.permissions import IsTeacherUser
 from rest_framework.permissions import IsAuthenticated
 
 
+class SessionMaterialBulkLoader:
+    """
+    Memuat data per student/group/quiz/assignment untuk satu material dalam
+    jumlah query tetap. Hasilnya berupa dictionary yang di-key dengan id,
+    sehingga view tidak perlu query per baris.
+    """
+
+    def __init__(self, material):
+        self.material = material
+
+    def attendance_by_student(self):
+        return dict(
+            StudentAttendance.objects.filter(material=self.material).values_list(
+                "student_id", "status"
+            )
+        )
+
+    def progress_by_student(self):
+        return dict(
+            StudentMaterialProgress.objects.filter(material=self.material).values_list(
+                "student_id", "completion_percentage"
+            )
+        )
+
+    def quiz_count_by_group(self):
+        return dict(
+            GroupQuiz.objects.filter(group__material=self.material)
+            .values("group_id")
+            .annotate(n=Count("id"))
+            .values_list("group_id", "n")
+        )
+
+    def assigned_groups_by_quiz(self):
+        return dict(
+            GroupQuiz.objects.filter(quiz__material=self.material)
+            .values("quiz_id")
+            .annotate(n=Count("id"))
+            .values_list("quiz_id", "n")
+        )
+
+    def completed_submissions_by_quiz(self):
+        # Jumlah GroupQuiz yang sudah punya submission, per quiz
+        return dict(
+            GroupQuizSubmission.objects.filter(group_quiz__quiz__material=self.material)
+            .values("group_quiz__quiz_id")
+            .annotate(n=Count("group_quiz", distinct=True))
+            .values_list("group_quiz__quiz_id", "n")
+        )
+
+
 class TeacherSessionMaterialDetailView(APIView):
     """
     API untuk mendapatkan detail material dalam context sessions
@@ -38,57 +88,20 @@ class TeacherSessionMaterialDetailView(APIView):
     def get(self, request, material_slug):
         try:
             # Get material
-            material = get_object_or_404(Material, slug=material_slug)
-
-            # Get related data
-            groups = Group.objects.filter(material=material).prefetch_related(
-                "groupmember_set__student"
-            )
-            quizzes = Quiz.objects.filter(material=material).prefetch_related(
-                "questions"
+            material = get_object_or_404(
+                Material.objects.select_related(
+                    "subject__subject_class__class_id"
+                ).prefetch_related("pdf_files", "youtube_videos"),
+                slug=material_slug,
             )
-            assignments = Assignment.objects.filter(material=material)
+            loader = SessionMaterialBulkLoader(material)
 
             # Get students in the material's class
             subject_class = material.subject.subject_class
             class_obj = subject_class.class_id
 
-            # --- GANTI INI ---
-            # students_data = []
-            # for student in class_students:
-            #     ...
-            #     students_data.append({...})
-
-            # Pakai method yang benar:
-            students_data = self.get_students_data(class_obj, material)
-
-            # Prepare groups data
-            groups_data = []
-            for group in groups:
-                members = []
-                for member in group.groupmember_set.all():
-                    student = member.student
-                    members.append(
-                        {
-                            "id": student.id,
-                            "username": student.username,
-                            "first_name": student.first_name,
-                            "last_name": student.last_name,
-                        }
-                    )
-
-                quiz_count = GroupQuiz.objects.filter(group=group).count()
-
-                groups_data.append(
-                    {
-                        "id": group.id,
-                        "name": group.name,
-                        "code": group.code,
-                        "members": members,
-                        "member_count": len(members),
-                        "quiz_count": quiz_count,
-                    }
-                )
+            students_data = self.get_students_data(class_obj, material, loader)
+            groups_data = self.get_groups_data(material, loader)
 
             # Calculate statistics
             total_students = len(students_data)
@@ -104,6 +117,12 @@ class TeacherSessionMaterialDetailView(APIView):
                 else 0
             )
 
+            content = self.get_material_content(material)
+            content_counts = Material.objects.filter(pk=material.pk).aggregate(
+                quizzes=Count("quizzes", distinct=True),
+                assignments=Count("assignments", distinct=True),
+            )
+
             response_data = {
                 "material": {
                     "id": material.id,
@@ -117,30 +136,11 @@ class TeacherSessionMaterialDetailView(APIView):
                         "slug": material.subject.slug,
                     },
                     "class": {
-                        "id": subject_class.class_id.id,
-                        "name": subject_class.class_id.name,
+                        "id": class_obj.id,
+                        "name": class_obj.name,
                     },
                 },
-                "content": {
-                    "pdf_files": [
-                        {
-                            "id": pdf.id,
-                            "file": pdf.file.url,
-                            "name": pdf.file.name.split("/")[-1],
-                            "uploaded_at": pdf.uploaded_at,
-                        }
-                        for pdf in material.pdf_files.all()
-                    ],
-                    "youtube_videos": [
-                        {
-                            "id": video.id,
-                            "url": video.url,
-                        }
-                        for video in material.youtube_videos.all()
-                    ],
-                    # "google_form_embed_arcs_awal": material.google_form_embed_arcs_awal,
-                    # "google_form_embed_arcs_akhir": material.google_form_embed_arcs_akhir,
-                },
+                "content": content,
                 "students": students_data,
                 "groups": groups_data,
                 "quizzes": [],  # Add quiz data if needed
@@ -150,11 +150,11 @@ class TeacherSessionMaterialDetailView(APIView):
                     "attendance_rate": round(attendance_rate, 1),
                     "average_progress": round(average_progress),
                     "content_stats": {
-                        "pdf_files": material.pdf_files.count(),
-                        "videos": material.youtube_videos.count(),
-                        "quizzes": quizzes.count(),
-                        "assignments": assignments.count(),
-                        "groups": groups.count(),
+                        "pdf_files": len(content["pdf_files"]),
+                        "videos": len(content["youtube_videos"]),
+                        "quizzes": content_counts["quizzes"],
+                        "assignments": content_counts["assignments"],
+                        "groups": len(groups_data),
                     },
                 },
             }
@@ -193,31 +193,20 @@ class TeacherSessionMaterialDetailView(APIView):
             # "google_form_embed_arcs_akhir": material.google_form_embed_arcs_akhir,
         }
 
-    def get_students_data(self, class_obj, material):
+    def get_students_data(self, class_obj, material, loader=None):
+        loader = loader or SessionMaterialBulkLoader(material)
         class_students = (
             ClassStudent.objects.filter(class_id=class_obj)
-            .select_related("student")
+            .select_related("student__studentmotivationprofile")
             .order_by("student__first_name", "student__last_name")
         )
+        attendance = loader.attendance_by_student()
+        progress = loader.progress_by_student()
+
         students_dict = {}
         for cs in class_students:
             student = cs.student
 
-            # Ambil status kehadiran terbaru dari StudentAttendance
-            attendance = StudentAttendance.objects.filter(
-                material=material, student=student
-            ).first()
-            attendance_status = attendance.status if attendance else "absent"
-
-            # Ambil progress (jika ada)
-            try:
-                progress = StudentMaterialProgress.objects.get(
-                    student=student, material=material
-                )
-                completion_percentage = progress.completion_percentage
-            except StudentMaterialProgress.DoesNotExist:
-                completion_percentage = 0.0
-
             # Ambil motivation profile (jika ada)
             motivation_level = None
             if hasattr(student, "studentmotivationprofile"):
@@ -230,8 +219,8 @@ class TeacherSessionMaterialDetailView(APIView):
                 "first_name": student.first_name,
                 "last_name": student.last_name,
                 "email": student.email,
-                "attendance_status": attendance_status,
-                "completion_percentage": completion_percentage,
+                "attendance_status": attendance.get(student.id, "absent"),
+                "completion_percentage": progress.get(student.id, 0.0),
                 "motivation_level": motivation_level,
                 "is_online": student.is_online,
             }
@@ -239,11 +228,13 @@ class TeacherSessionMaterialDetailView(APIView):
         # Kembalikan hanya satu entri per siswa
         return list(students_dict.values())
 
-    def get_groups_data(self, material):
+    def get_groups_data(self, material, loader=None):
         """Get groups data with members"""
+        loader = loader or SessionMaterialBulkLoader(material)
         groups = Group.objects.filter(material=material).prefetch_related(
             "groupmember_set__student"
         )
+        quiz_counts = loader.quiz_count_by_group()
 
         groups_data = []
         for group in groups:
@@ -259,9 +250,6 @@ class TeacherSessionMaterialDetailView(APIView):
                     }
                 )
 
-            # Get group quiz count
-            quiz_count = GroupQuiz.objects.filter(group=group).count()
-
             groups_data.append(
                 {
                     "id": group.id,
@@ -269,40 +257,32 @@ class TeacherSessionMaterialDetailView(APIView):
                     "code": group.code,
                     "members": members,
                     "member_count": len(members),
-                    "quiz_count": quiz_count,
+                    "quiz_count": quiz_counts.get(group.id, 0),
                 }
             )
 
         return groups_data
 
-    def get_quizzes_data(self, material):
+    def get_quizzes_data(self, material, loader=None):
         """Get quizzes data"""
-        quizzes = Quiz.objects.filter(material=material).prefetch_related(
-            "questions", "groupquiz_set"
+        loader = loader or SessionMaterialBulkLoader(material)
+        quizzes = Quiz.objects.filter(material=material).annotate(
+            question_count=Count("questions")
         )
+        assigned_groups = loader.assigned_groups_by_quiz()
+        completed_submissions = loader.completed_submissions_by_quiz()
 
         quizzes_data = []
         for quiz in quizzes:
-            # Get assigned groups
-            assigned_groups = GroupQuiz.objects.filter(quiz=quiz).count()
-
-            # Get completion stats
-            total_submissions = (
-                GroupQuizSubmission.objects.filter(group_quiz__quiz=quiz)
-                .values("group_quiz")
-                .distinct()
-                .count()
-            )
-
             quizzes_data.append(
                 {
                     "id": quiz.id,
                     "title": quiz.title,
                     "content": quiz.content,
                     "created_at": quiz.created_at,
-                    "question_count": quiz.questions.count(),
-                    "assigned_groups": assigned_groups,
-                    "completed_submissions": total_submissions,
+                    "question_count": quiz.question_count,
+                    "assigned_groups": assigned_groups.get(quiz.id, 0),
+                    "completed_submissions": completed_submissions.get(quiz.id, 0),
                     "is_group_quiz": quiz.is_group_quiz,
                 }
             )
@@ -311,18 +291,18 @@ class TeacherSessionMaterialDetailView(APIView):
 
     def get_assignments_data(self, material):
         """Get assignments data"""
-        assignments = Assignment.objects.filter(material=material).prefetch_related(
-            "questions", "assignmentsubmission_set"
+        assignments = Assignment.objects.filter(material=material).annotate(
+            question_count=Count("questions", distinct=True),
+            total_submissions=Count("assignmentsubmission", distinct=True),
+            graded_submissions=Count(
+                "assignmentsubmission",
+                filter=Q(assignmentsubmission__grade__isnull=False),
+                distinct=True,
+            ),
         )
 
         assignments_data = []
         for assignment in assignments:
-            # Get submission stats
-            total_submissions = assignment.assignmentsubmission_set.count()
-            graded_submissions = assignment.assignmentsubmission_set.filter(
-                grade__isnull=False
-            ).count()
-
             assignments_data.append(
                 {
                     "id": assignment.id,
@@ -330,9 +310,9 @@ class TeacherSessionMaterialDetailView(APIView):
                     "description": assignment.description,
                     "due_date": assignment.due_date,
                     "created_at": assignment.created_at,
-                    "question_count": assignment.questions.count(),
-                    "total_submissions": total_submissions,
-                    "graded_submissions": graded_submissions,
+                    "question_count": assignment.question_count,
+                    "total_submissions": assignment.total_submissions,
+                    "graded_submissions": assignment.graded_submissions,
                 }
             )
 
@@ -3,6 +3,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.http import HttpResponse
 from rest_framework.permissions import IsAuthenticated
+from pramlearnapp.decorators import read_replica
 from pramlearnapp.permissions import IsTeacherUser
 from pramlearnapp.services.arcs_clustering_pdf_service import ARCSClusteringPDFService
 from pramlearnapp.services.arcs_clustering_visualization_service import (
@@ -27,6 +28,7 @@ class TeacherSessionsARCSAnalysisExportView(APIView):
 
     permission_classes = [IsAuthenticated, IsTeacherUser]
 
+    @read_replica
     def get(self, request):
         """
         Export ARCS clustering analysis sebagai file PDF
@@ -194,6 +196,7 @@ class TeacherSessionsARCSAnalysisStatisticsView(APIView):
 
     permission_classes = [IsAuthenticated, IsTeacherUser]
 
+    @read_replica
     def get(self, request):
         """
         Mendapatkan statistik clustering ARCS untuk dashboard
@@ -4,9 +4,10 @@ from rest_framework.decorators import action
 from django.db.models import ProtectedError
 from pramlearnapp.models import Subject, SubjectClass
 from pramlearnapp.serializers import SubjectSerializer, SubjectDetailSerializer
+from pramlearnapp.mixins import ProjectedListMixin
 
 
-class SubjectViewSet(viewsets.ModelViewSet):
+class SubjectViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     queryset = Subject.objects.all()
     serializer_class = SubjectSerializer
 
@@ -11,6 +11,8 @@ from pramlearnapp.models import (
 )
 from pramlearnapp.permissions import IsTeacherUser
 from rest_framework.permissions import IsAuthenticated
+from pramlearnapp.decorators import cache_response
+from pramlearnapp.utils.cache import teacher_scope_tags
 
 
 class TeacherSubjectsView(APIView):
@@ -19,6 +21,7 @@ class TeacherSubjectsView(APIView):
     """
     permission_classes = [IsAuthenticated, IsTeacherUser]
 
+    @cache_response(tags=lambda request: teacher_scope_tags(request.user.pk))
     def get(self, request):
         teacher = request.user
         search = request.query_params.get('search', '')
@@ -1,9 +1,11 @@
 import React, { createContext, useContext, useEffect, useState } from "react";
 import { WS_URL } from "../api";
+import { AuthContext } from "./AuthContext";
 
 const OnlineStatusContext = createContext();
 
 export const OnlineStatusProvider = ({ children }) => {
+  const { token } = useContext(AuthContext);
   const [userStatuses, setUserStatuses] = useState({});
   const [socket, setSocket] = useState(null);
   const [isConnected, setIsConnected] = useState(false);
@@ -12,6 +14,9 @@ export const OnlineStatusProvider = ({ children }) => {
   const maxReconnectAttempts = 5;
 
   useEffect(() => {
+    // Server hanya menerima socket presence yang membawa token
+    if (!token) return;
+
     let ws = null;
     let reconnectTimeout = null;
 
@@ -30,7 +35,7 @@ export const OnlineStatusProvider = ({ children }) => {
             connectionAttempts + 1
           })`
         );
-        ws = new WebSocket(`${WS_URL}/user-status/`);
+        ws = new WebSocket(`${WS_URL}/user-status/?token=${token}`);
 
         ws.onopen = () => {
           console.log("✅ WebSocket connected successfully!");
@@ -44,6 +49,21 @@ export const OnlineStatusProvider = ({ children }) => {
           try {
             const data = JSON.parse(event.data);
 
+            // Snapshot user online di kelas/kelompok, dikirim sekali saat join
+            if (data.type === "presence_snapshot") {
+              setUserStatuses((prev) => {
+                const next = { ...prev };
+                data.users.forEach((u) => {
+                  next[u.user_id] = {
+                    is_online: u.is_online,
+                    last_activity: u.last_activity,
+                  };
+                });
+                return next;
+              });
+              setForceUpdate((prev) => prev + 1);
+            }
+
             if (data.type === "user_status_update") {
               setUserStatuses((prev) => ({
                 ...prev,
@@ -122,7 +142,7 @@ export const OnlineStatusProvider = ({ children }) => {
         ws.close(1000, "Component unmounting");
       if (window.userStatusSocket) window.userStatusSocket = null;
     };
-  }, [connectionAttempts, maxReconnectAttempts]);
+  }, [connectionAttempts, maxReconnectAttempts, token]);
 
   const isUserOnline = (userData) => {
     // Check real-time status first
@@ -1,4 +1,4 @@
-import React, { useState, useContext, useCallback, useEffect } from "react";
+import React, { useState, useCallback, useEffect, useRef } from "react";
 import {
   Table,
   Select,
@@ -18,8 +18,8 @@ import {
   MailOutlined,
   LoadingOutlined,
   TeamOutlined,
+  CheckCircleOutlined,
 } from "@ant-design/icons";
-import { AuthContext } from "../../../context/AuthContext";
 import { useOnlineStatus } from "../../../context/OnlineStatusContext";
 import useAttendanceManagement from "../hooks/useAttendanceManagement";
 import useAttendanceWebSocket from "../hooks/useAttendanceWebSocket";
@@ -29,9 +29,11 @@ import api from "../../../api";
 
 const { Option } = Select;
 
+// Jeda sebelum perubahan roll call dikirim bersama dalam satu request
+const ATTENDANCE_FLUSH_DELAY = 800;
+
 const StudentsTab = ({ studentDetails, classId, loading, materialId }) => {
   const [isMobile, setIsMobile] = useState(window.innerWidth <= 768);
-  const { user } = useContext(AuthContext);
   const { isUserOnline } = useOnlineStatus();
   const [updating, setUpdating] = useState({});
   const antIcon = <LoadingOutlined style={{ fontSize: 24 }} spin />;
@@ -39,7 +41,7 @@ const StudentsTab = ({ studentDetails, classId, loading, materialId }) => {
   const {
     attendanceRecords,
     loading: attendanceLoading,
-    updateAttendanceStatus,
+    bulkUpdateAttendance,
     bulkCreateAttendance,
     getStudentAttendanceStatus,
     refetchAttendance,
@@ -50,16 +52,17 @@ const StudentsTab = ({ studentDetails, classId, loading, materialId }) => {
     (data) => {
       refetchAttendance();
       message.info(
-        `Kehadiran ${data.student_id} diupdate oleh ${data.updated_by}`
+        `Kehadiran ${data.changes.length} siswa diupdate oleh ${data.updated_by}`
       );
     },
     [refetchAttendance]
   );
 
-  const { sendAttendanceUpdate } = useAttendanceWebSocket(
-    materialId,
-    handleAttendanceUpdate
-  );
+  useAttendanceWebSocket(materialId, handleAttendanceUpdate);
+
+  // Perubahan roll call yang belum dikirim: { studentId: status }
+  const pendingChanges = useRef({});
+  const flushTimer = useRef(null);
 
   useEffect(() => {
     const handleResize = () => {
@@ -134,26 +137,71 @@ const StudentsTab = ({ studentDetails, classId, loading, materialId }) => {
     return { color: "default", text: "Belum Dianalisis", icon: "❓" };
   };
 
-  const handleAttendanceChange = async (studentId, newStatus) => {
-    setUpdating((prev) => ({ ...prev, [studentId]: true }));
+  const flushAttendanceChanges = async () => {
+    const pending = pendingChanges.current;
+    pendingChanges.current = {};
+    flushTimer.current = null;
 
-    try {
-      const result = await updateAttendanceStatus(studentId, newStatus);
+    const studentIds = Object.keys(pending);
+    if (studentIds.length === 0) return;
 
-      // Send WebSocket update
-      sendAttendanceUpdate(
-        studentId,
-        newStatus,
-        user.username,
-        new Date().toISOString()
+    try {
+      await bulkUpdateAttendance(
+        studentIds.map((id) => ({ student_id: Number(id), status: pending[id] }))
+      );
+      message.success(
+        studentIds.length > 1
+          ? `Kehadiran ${studentIds.length} siswa berhasil diupdate`
+          : "Kehadiran berhasil diupdate"
       );
-
-      message.success("Kehadiran berhasil diupdate");
     } catch (error) {
-      message.error("Gagal mengupdate kehadiran");
+      message.error(
+        error?.response?.data?.error || "Gagal mengupdate kehadiran"
+      );
       console.error("Error updating attendance:", error);
     } finally {
-      setUpdating((prev) => ({ ...prev, [studentId]: false }));
+      setUpdating((prev) => {
+        const next = { ...prev };
+        studentIds.forEach((id) => delete next[id]);
+        return next;
+      });
+    }
+  };
+
+  // Kirim perubahan yang masih tertunda saat tab ditutup
+  useEffect(() => {
+    return () => {
+      clearTimeout(flushTimer.current);
+      flushAttendanceChanges();
+    };
+  }, []);
+
+  const handleAttendanceChange = (studentId, newStatus) => {
+    setUpdating((prev) => ({ ...prev, [studentId]: true }));
+    pendingChanges.current[studentId] = newStatus;
+
+    // Perubahan beruntun saat roll call dikirim dalam satu request bulk-update
+    clearTimeout(flushTimer.current);
+    flushTimer.current = setTimeout(
+      flushAttendanceChanges,
+      ATTENDANCE_FLUSH_DELAY
+    );
+  };
+
+  const handleMarkAllPresent = async () => {
+    try {
+      await bulkUpdateAttendance(
+        studentDetails.map((student) => ({
+          student_id: student.id,
+          status: "present",
+        }))
+      );
+      message.success("Semua siswa ditandai hadir");
+    } catch (error) {
+      message.error(
+        error?.response?.data?.error || "Gagal mengupdate kehadiran"
+      );
+      console.error("Error marking all students present:", error);
     }
   };
 
@@ -408,6 +456,17 @@ const StudentsTab = ({ studentDetails, classId, loading, materialId }) => {
               >
                 Inisialisasi Kehadiran
               </Button>
+              <Button
+                icon={<CheckCircleOutlined />}
+                onClick={handleMarkAllPresent}
+                loading={attendanceLoading}
+                style={{
+                  minWidth: isMobile ? 180 : 140,
+                  width: isMobile ? "100%" : undefined,
+                }}
+              >
+                Tandai Semua Hadir
+              </Button>
             </div>
           </Col>
         </Row>
@@ -56,6 +56,42 @@ const useAttendanceManagement = (materialId) => {
     }
   };
 
+  // Update many statuses in one request (one broadcast from the server)
+  const bulkUpdateAttendance = async (changes) => {
+    try {
+      api.defaults.headers.common["Authorization"] = `Bearer ${token}`;
+      const response = await api.post(
+        `materials/${materialId}/attendance/bulk-update/`,
+        { changes }
+      );
+
+      // Update local state; student tanpa record diambil ulang dari server
+      const updated = Object.fromEntries(
+        response.data.changes.map((change) => [change.student_id, change.status])
+      );
+      const hasNewRecords = changes.some(
+        (change) =>
+          !attendanceRecords.some((record) => record.student === change.student_id)
+      );
+      if (hasNewRecords) {
+        await fetchAttendance();
+      } else {
+        setAttendanceRecords((prev) =>
+          prev.map((record) =>
+            record.student in updated
+              ? { ...record, status: updated[record.student] }
+              : record
+          )
+        );
+      }
+
+      return response.data;
+    } catch (err) {
+      console.error("Error bulk updating attendance:", err);
+      throw err;
+    }
+  };
+
   // Bulk create attendance records
   const bulkCreateAttendance = async () => {
     try {
@@ -88,6 +124,7 @@ const useAttendanceManagement = (materialId) => {
     loading,
     error,
     updateAttendanceStatus,
+    bulkUpdateAttendance,
     bulkCreateAttendance,
     getStudentAttendanceStatus,
     refetchAttendance: fetchAttendance,
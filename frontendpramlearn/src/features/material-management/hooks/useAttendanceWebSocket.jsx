@@ -1,14 +1,16 @@
-import { useEffect, useRef } from "react";
+import { useContext, useEffect, useRef } from "react";
 import { WS_URL } from "../../../api";
+import { AuthContext } from "../../../context/AuthContext";
 
 const useAttendanceWebSocket = (materialId, onAttendanceUpdate) => {
   const ws = useRef(null);
+  const { token } = useContext(AuthContext);
 
   useEffect(() => {
-    if (!materialId) return;
+    if (!materialId || !token) return;
 
     // Create WebSocket connection
-    const wsUrl = `${WS_URL}/attendance/${materialId}/`;
+    const wsUrl = `${WS_URL}/attendance/${materialId}/?token=${token}`;
     ws.current = new WebSocket(wsUrl);
 
     ws.current.onopen = () => {
@@ -19,7 +21,8 @@ const useAttendanceWebSocket = (materialId, onAttendanceUpdate) => {
 
     ws.current.onmessage = (event) => {
       const data = JSON.parse(event.data);
-      if (data.type === "attendance_update") {
+      // Perubahan dari server: satu pesan untuk semua student yang berubah
+      if (data.type === "attendance_batch") {
         onAttendanceUpdate(data);
       }
     };
@@ -39,23 +42,7 @@ const useAttendanceWebSocket = (materialId, onAttendanceUpdate) => {
         ws.current.close();
       }
     };
-  }, [materialId, onAttendanceUpdate]);
-
-  const sendAttendanceUpdate = (studentId, status, updatedBy, updatedAt) => {
-    if (ws.current && ws.current.readyState === WebSocket.OPEN) {
-      ws.current.send(
-        JSON.stringify({
-          type: "attendance_update",
-          student_id: studentId,
-          status: status,
-          updated_by: updatedBy,
-          updated_at: updatedAt,
-        })
-      );
-    }
-  };
-
-  return { sendAttendanceUpdate };
+  }, [materialId, onAttendanceUpdate, token]);
 };
 
 export default useAttendanceWebSocket;
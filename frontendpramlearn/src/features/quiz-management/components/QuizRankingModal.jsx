@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useRef } from "react";
+import React, { useState, useEffect, useRef, useContext } from "react";
 import {
   Modal,
   Table,
@@ -21,8 +21,10 @@ import {
 import api from "../../../api";
 import dayjs from "dayjs";
 import { WS_URL } from "../../../api";
+import { AuthContext } from "../../../context/AuthContext";
 
 const QuizRankingModal = ({ open, onClose, quiz, materialId }) => {
+  const { token } = useContext(AuthContext);
   const [rankings, setRankings] = useState([]);
   const [loading, setLoading] = useState(false);
   const [initialLoading, setInitialLoading] = useState(false); // Loading awal
@@ -35,7 +37,7 @@ const QuizRankingModal = ({ open, onClose, quiz, materialId }) => {
 
   // WebSocket connection
   useEffect(() => {
-    if (open && quiz?.id && materialId) {
+    if (open && quiz?.id && materialId && token) {
       setInitialLoading(true);
       setError(null);
       connectWebSocket();
@@ -46,13 +48,13 @@ const QuizRankingModal = ({ open, onClose, quiz, materialId }) => {
         }
       };
     }
-  }, [open, quiz?.id, materialId]);
+  }, [open, quiz?.id, materialId, token]);
 
   const connectWebSocket = () => {
     try {
       setWsConnecting(true);
-      const wsUrl = `${WS_URL}/quiz-ranking/${quiz.id}/${materialId}/`;
-      console.log("🔗 Connecting to WebSocket:", wsUrl);
+      const wsUrl = `${WS_URL}/quiz-ranking/${quiz.id}/${materialId}/?token=${token}`;
+      console.log("🔗 Connecting to WebSocket:", wsUrl.split("?")[0]);
 
       wsRef.current = new WebSocket(wsUrl);
 
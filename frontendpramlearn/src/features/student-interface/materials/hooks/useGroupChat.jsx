@@ -20,6 +20,9 @@ const useGroupChat = (materialSlug) => {
   const mountedRef = useRef(true);
   const typingTimeoutRef = useRef(null);
   const pendingMessagesRef = useRef(new Set());
+  // Pesan yang belum di-ack server: client_id -> teks. Dikirim ulang dengan
+  // client_id yang sama saat socket tersambung kembali
+  const unackedMessagesRef = useRef(new Map());
   const reconnectTimeoutRef = useRef(null);
   const reconnectAttemptsRef = useRef(0);
   const maxReconnectAttempts = 3; // Kurangi dari 5 ke 3
@@ -79,13 +82,26 @@ const useGroupChat = (materialSlug) => {
       const wsUrl = `${WS_URL}/group-chat/${materialSlug}/?token=${token}`;
       console.log("🔗 Connecting to group chat WebSocket:", wsUrl);
 
-      wsRef.current = new WebSocket(wsUrl);
+      const socket = new WebSocket(wsUrl);
+      wsRef.current = socket;
 
       wsRef.current.onopen = () => {
         if (mountedRef.current) {
           console.log("✅ Group chat WebSocket connected");
           setWsConnected(true);
           reconnectAttemptsRef.current = 0;
+
+          // Server mengabaikan client_id yang sudah tersimpan, jadi pesan
+          // yang ack-nya hilang bersama koneksi lama aman dikirim ulang
+          unackedMessagesRef.current.forEach((text, clientId) => {
+            socket.send(
+              JSON.stringify({
+                type: "chat_message",
+                message: text,
+                client_id: clientId,
+              })
+            );
+          });
         }
       };
 
@@ -170,6 +186,21 @@ const useGroupChat = (materialSlug) => {
               }
               break;
 
+            case "chat_ack":
+              // Pesan sendiri yang dikirim lewat socket sudah tersimpan
+              unackedMessagesRef.current.delete(data.client_id);
+              setMessages((prev) => {
+                const exists = prev.some((msg) => msg.id === data.message.id);
+                if (exists) return prev;
+                return [...prev, { ...data.message, is_current_user: true }];
+              });
+              break;
+
+            case "chat_error":
+              unackedMessagesRef.current.delete(data.client_id);
+              message.error(data.error || "Gagal mengirim pesan");
+              break;
+
             case "typing_indicator":
               if (data.is_typing) {
                 setTypingUsers((prev) => new Set([...prev, data.user_id]));
@@ -191,6 +222,11 @@ const useGroupChat = (materialSlug) => {
       };
 
       wsRef.current.onclose = (event) => {
+        // Lepas socket yang sudah tertutup agar reconnect bisa membuat
+        // socket baru (socket pengganti dari forceReconnect tidak disentuh)
+        if (wsRef.current === socket) {
+          wsRef.current = null;
+        }
         if (mountedRef.current) {
           console.log(
             "🔌 Group chat WebSocket disconnected:",
@@ -254,14 +290,36 @@ const useGroupChat = (materialSlug) => {
     async (messageText) => {
       if (!messageText.trim() || !materialSlug) return;
 
+      const text = messageText.trim();
+      const clientId = `${user?.id}-${Date.now()}-${Math.random()
+        .toString(36)
+        .slice(2, 10)}`;
+      unackedMessagesRef.current.set(clientId, text);
+
+      // Kirim lewat WebSocket jika terhubung; server membalas chat_ack
+      if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
+        wsRef.current.send(
+          JSON.stringify({
+            type: "chat_message",
+            message: text,
+            client_id: clientId,
+          })
+        );
+        return;
+      }
+
       try {
         api.defaults.headers.common["Authorization"] = `Bearer ${token}`;
 
+        // client_id yang sama dengan pesan socket: server tidak menyimpan
+        // pesan dua kali jika socket sempat mengirimnya
         const response = await api.post(`student/group-chat/${materialSlug}/`, {
-          message: messageText.trim(),
+          message: text,
+          client_id: clientId,
         });
 
         const newMessage = response.data;
+        unackedMessagesRef.current.delete(clientId);
         pendingMessagesRef.current.add(newMessage.id);
 
         setMessages((prev) => {
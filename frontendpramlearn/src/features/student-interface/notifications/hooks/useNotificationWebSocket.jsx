@@ -10,11 +10,23 @@ const useNotificationWebSocket = (onNotificationReceived) => {
   const [reconnectAttempts, setReconnectAttempts] = useState(0);
   const maxReconnectAttempts = 5;
 
+  // Cursor: id notifikasi terakhir yang diterima, untuk catch-up saat reconnect
+  const cursorKey = user ? `notification_cursor_${user.id}` : null;
+  const getCursor = () =>
+    parseInt(localStorage.getItem(cursorKey) || "0", 10) || 0;
+  const saveCursor = (id) => {
+    if (cursorKey && id > getCursor()) {
+      localStorage.setItem(cursorKey, String(id));
+    }
+  };
+
   const connect = () => {
     if (!user || !token) return;
 
     try {
-      const wsUrl = `${WS_URL}/notifications/${user.id}/?token=${token}`;
+      const wsUrl = `${WS_URL}/notifications/${
+        user.id
+      }/?token=${token}&after=${getCursor()}`;
       wsRef.current = new WebSocket(wsUrl);
 
       wsRef.current.onopen = () => {
@@ -28,6 +40,8 @@ const useNotificationWebSocket = (onNotificationReceived) => {
           const data = JSON.parse(event.data);
 
           if (data.type === "notification") {
+            saveCursor(data.notification.id);
+
             // Add to notifications list
             if (onNotificationReceived) {
               onNotificationReceived(data.notification);
@@ -35,6 +49,20 @@ const useNotificationWebSocket = (onNotificationReceived) => {
 
             // Show browser notification
             showBrowserNotification(data.notification);
+          } else if (data.type === "notification_batch") {
+            // Notifikasi yang terlewat selama offline
+            data.notifications.forEach((item) => {
+              if (onNotificationReceived) {
+                onNotificationReceived(item);
+              }
+            });
+            saveCursor(data.cursor);
+
+            if (data.has_more) {
+              wsRef.current.send(
+                JSON.stringify({ type: "catch_up", after: data.cursor })
+              );
+            }
           }
         } catch (error) {
           console.error("Error parsing notification message:", error);
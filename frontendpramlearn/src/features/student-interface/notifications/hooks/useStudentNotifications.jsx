@@ -148,10 +148,18 @@ const useStudentNotifications = () => {
 
   // Add new notification (from WebSocket)
   const addNotification = (newNotification) => {
-    setNotifications((prev) => [newNotification, ...prev]);
-    setUnreadCount((prev) => prev + 1);
+    // Notifikasi bisa datang dari channel kelas dan catch-up sekaligus
+    setNotifications((prev) =>
+      prev.some((notif) => notif.id === newNotification.id)
+        ? prev
+        : [newNotification, ...prev]
+    );
   };
 
+  useEffect(() => {
+    setUnreadCount(notifications.filter((notif) => !notif.is_read).length);
+  }, [notifications]);
+
   useEffect(() => {
     if (user && token) {
       fetchNotifications();
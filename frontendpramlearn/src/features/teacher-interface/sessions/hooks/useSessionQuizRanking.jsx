@@ -45,8 +45,8 @@ const useSessionQuizRanking = (materialSlug, quizId) => {
 
       setMaterialId(matId);
 
-      const wsUrl = `${WS_URL}/quiz-ranking/${quizId}/${matId}/`;
-      console.log("🔗 Connecting to WebSocket:", wsUrl);
+      const wsUrl = `${WS_URL}/quiz-ranking/${quizId}/${matId}/?token=${token}`;
+      console.log("🔗 Connecting to WebSocket:", wsUrl.split("?")[0]);
 
       wsRef.current = new WebSocket(wsUrl);
 